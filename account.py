@@ -1,6 +1,8 @@
 from enum import Enum
 from typing import Any
 
+from models import Category
+
 
 class HoldingsType(Enum):
     CASH = ("cash", True)
@@ -37,3 +39,11 @@ class Account:
             "value": self.value,
             "growth": self.growth_rate,
         }
+
+    def to_category(self) -> Category:
+        return Category(
+            name=self.name,
+            value=float(self.value),
+            growth=float(self.growth_rate),
+            is_liquid=self.is_liquid,
+        )
@@ -0,0 +1,160 @@
+"""Historical backtests: replay a plan through every rolling window of past returns."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+import market_history
+from instrumentation import timed
+from monte_carlo import _successful_paths
+from projection import (
+    BreakdownInput,
+    _breakdown_arrays,
+    _row_totals,
+    iter_projection,
+    working_years,
+)
+from withdrawals import WithdrawalStrategy, build_policy
+
+DEFAULT_ALLOCATION: Mapping[str, float] = {"equity": 0.6, "gilts": 0.4}
+
+
+@dataclass
+class BacktestResult:
+    """Total net worth for every historical start year."""
+    # First calendar year of each window
+    start_years: np.ndarray
+    # Total net worth per window, ``(windows, years_to_project + 1)``
+    totals: np.ndarray
+    # Windows that never ran out of money in retirement
+    success: np.ndarray
+    # Windows that ran past the end of the record and continued from its start
+    wrapped: np.ndarray
+    # Window indices from worst to best outcome
+    ranking: np.ndarray
+    # Share of planned expenses spent each retired year, with a withdrawal strategy
+    spending: np.ndarray | None = None
+
+    @property
+    def success_rate(self) -> float:
+        return float(self.success.mean())
+
+    @property
+    def worst(self) -> int:
+        return int(self.ranking[0])
+
+    @property
+    def median(self) -> int:
+        return int(self.ranking[len(self.ranking) // 2])
+
+    @property
+    def best(self) -> int:
+        return int(self.ranking[-1])
+
+
+def _allocation_matrix(
+    names: list[str],
+    allocation: Mapping[str, float],
+    category_allocations: Mapping[str, Mapping[str, float]] | None,
+) -> np.ndarray:
+    """Weights of each asset class in each category, ``(asset classes, categories)``."""
+    weights = np.zeros((len(market_history.ASSET_CLASSES), len(names)))
+    for j, name in enumerate(names):
+        mix = (category_allocations or {}).get(name, allocation)
+        unknown = set(mix) - set(market_history.ASSET_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown asset classes for '{name}': {sorted(unknown)}")
+        total = sum(mix.values())
+        if total <= 0:
+            raise ValueError(f"Allocation for '{name}' must have a positive total")
+        for i, asset in enumerate(market_history.ASSET_CLASSES):
+            weights[i, j] = mix.get(asset, 0.0) / total
+    return weights
+
+
+def _ranking(totals: np.ndarray) -> np.ndarray:
+    """Order windows by how long the money lasted, then by final net worth."""
+    solvent_years = (totals > 0).sum(axis=1)
+    return np.lexsort((totals[:, -1], solvent_years))
+
+
+@timed()
+def run_backtest(
+    net_worth_breakdown: BreakdownInput,
+    annual_income: float,
+    annual_expenses: float,
+    years_to_project: int,
+    retirement_age: int,
+    current_age: int,
+    allocation: Mapping[str, float] = DEFAULT_ALLOCATION,
+    category_allocations: Mapping[str, Mapping[str, float]] | None = None,
+    wrap: bool = True,
+    withdrawal: WithdrawalStrategy | None = None,
+) -> BacktestResult:
+    """Run the plan once for every start year in the bundled market history.
+
+    Each category earns the year's return on its asset mix instead of its
+    assumed growth rate, ``allocation`` for every category unless
+    ``category_allocations`` names one, and expenses rise with that year's
+    inflation. Every window is a path of a single vectorized run, read
+    through a sliding-window view of the record so no window is copied.
+    With ``wrap`` a window that runs past the last year continues from the
+    first, so every year in the record is a start year; otherwise only
+    windows that fit are run. ``withdrawal`` sets retirement spending in
+    place of the planned expenses, and what it spent is kept in ``spending``.
+    """
+    names, values, _, is_liquid = _breakdown_arrays(net_worth_breakdown)
+    weights = _allocation_matrix(names, allocation, category_allocations)
+    years_to_project = max(years_to_project, 0)
+    n_years = len(market_history.YEARS)
+    window = max(years_to_project, 1)
+
+    if wrap:
+        history = market_history.RETURNS[np.arange(n_years + window - 1) % n_years]
+    elif window <= n_years:
+        history = market_history.RETURNS
+    else:
+        raise ValueError(
+            f"A {window}-year plan is longer than the {n_years}-year record; use wrap=True"
+        )
+    # (windows, series, years), each window a view into ``history``
+    windows = sliding_window_view(history, window, axis=0)
+    asset_returns = windows[:, : len(market_history.ASSET_CLASSES)]
+    inflation = windows[:, len(market_history.ASSET_CLASSES)]
+    n_windows = len(windows)
+
+    def growth_for_year(year: int) -> np.ndarray:
+        return asset_returns[:, :, year] @ weights
+
+    def inflation_for_year(year: int) -> np.ndarray:
+        return inflation[:, year]
+
+    working = int(working_years(current_age, retirement_age, years_to_project))
+    ones = np.ones(len(names))
+    totals = np.empty((n_windows, years_to_project + 1))
+    policy = build_policy(withdrawal, n_windows)
+    states = iter_projection(
+        np.broadcast_to(values, (n_windows, len(names))),
+        growth_for_year,
+        is_liquid,
+        annual_income,
+        annual_expenses,
+        inflation_for_year,
+        years_to_project,
+        working,
+        withdrawal_policy=policy,
+    )
+    for year, state in enumerate(states):
+        totals[:, year] = _row_totals(state, ones)
+
+    starts = np.arange(n_windows)
+    return BacktestResult(
+        start_years=market_history.YEARS[starts],
+        totals=totals,
+        success=_successful_paths(totals, working),
+        wrapped=starts + window > n_years,
+        ranking=_ranking(totals),
+        spending=policy.spending_ratios() if policy is not None else None,
+    )
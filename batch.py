@@ -0,0 +1,403 @@
+"""Headless batch projections for many households, streamed from CSV or JSONL.
+
+Each input record is one household:
+
+    {"id": "h1", "current_age": 40, "retirement_age": 65, "life_expectancy": 90,
+     "user_annual_income": 60000, "user_annual_expenses": 30000, "inflation_rate": 0.02,
+     "accounts": [{"name": "ISA", "type": "S_AND_S", "value": 50000, "growth": 0.05}]}
+
+``partner_annual_income``, ``partner_annual_expenses`` and the partner ages
+are optional; every other field is required and ages must be whole numbers.
+In CSV the same fields are columns and ``accounts`` holds the
+JSON list. Account ``type`` is a ``HoldingsType`` name or label and decides
+liquidity.
+
+Records are read, validated with the rules in ``validation.py``, projected in
+chunks (each chunk one vectorized engine pass) on a process pool and written
+out in input order as each chunk finishes. Only a bounded number of chunks is
+held at once, so memory stays flat however large the input is.
+
+    uv run financial-planner-batch households.jsonl results.jsonl --workers 8
+"""
+
+import argparse
+import csv
+import functools
+import json
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TextIO
+
+import numpy as np
+
+from account import Account, HoldingsType
+from export import ProjectionExporter, export_format
+from models import NetWorthBreakdown
+from projection import _pack_breakdowns, _row_totals, iter_projection, working_years
+from validation import AGE_FIELDS, FINANCIAL_FIELDS, validate_households
+
+RESULT_FIELDS = (
+    "id",
+    "valid",
+    "error",
+    "retirement_net_worth",
+    "final_net_worth",
+    "runs_out",
+)
+
+DEFAULT_CHUNK_SIZE = 2_000
+
+# Every household needs these; partner fields are optional
+REQUIRED_FIELDS = (
+    "current_age",
+    "retirement_age",
+    "life_expectancy",
+    "user_annual_income",
+    "user_annual_expenses",
+    "inflation_rate",
+)
+
+_HOLDINGS_BY_NAME = {holdings_type.name: holdings_type for holdings_type in HoldingsType}
+_HOLDINGS_BY_LABEL = {holdings_type.label: holdings_type for holdings_type in HoldingsType}
+
+
+def read_households(stream: TextIO, input_format: str) -> Iterator[dict[str, Any] | str]:
+    """Yield household records one at a time.
+
+    CSV rows are yielded as dicts. JSONL lines are yielded unparsed, so the
+    parsing happens in the worker processes rather than the reading one.
+    """
+    if input_format == "csv":
+        for row in csv.DictReader(stream):
+            yield {key: value for key, value in row.items() if value not in (None, "")}
+        return
+
+    for line in stream:
+        if line.strip():
+            yield line
+
+
+def _parse_account(account: dict[str, Any]) -> Account:
+    """Build an ``Account`` from a record, matching the type by name or label."""
+    if not isinstance(account, dict):
+        raise TypeError(f"account must be an object, not {type(account).__name__}")
+    holdings = str(account.get("type", "OTHER"))
+    holdings_type = _HOLDINGS_BY_NAME.get(holdings.upper()) or _HOLDINGS_BY_LABEL.get(holdings.lower())
+    if holdings_type is None:
+        raise ValueError(f"Unknown account type '{holdings}'")
+    parsed = Account(str(account.get("name", "")), holdings_type, float(account.get("growth", 0.0)))
+    parsed.set_value(float(account.get("value", 0.0)))
+    return parsed
+
+
+def _whole_number(field: str, value: Any) -> int:
+    """An age as an int, rejecting fractions rather than truncating them."""
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"{field} must be a whole number, not {value!r}")
+    return int(number)
+
+
+@dataclass
+class _Household:
+    """A validated household ready for projection."""
+    current_age: int
+    retirement_age: int
+    life_expectancy: int
+    annual_income: float
+    annual_expenses: float
+    inflation_rate: float
+    accounts: list[Account]
+
+
+def _parse_household(
+    record: dict[str, Any] | str,
+) -> tuple[dict[str, Any], dict[str, Any] | None, list[Account]]:
+    """Output row for a record or JSONL line, plus its inputs and accounts if it could be read."""
+    result: dict[str, Any] = dict.fromkeys(RESULT_FIELDS)
+    result["valid"] = False
+    if isinstance(record, str):
+        try:
+            record = json.loads(record)
+        except json.JSONDecodeError as e:
+            result["error"] = f"Invalid JSON: {e}"
+            return result, None, []
+    if not isinstance(record, dict):
+        result["error"] = f"Invalid record: expected an object, not {type(record).__name__}"
+        return result, None, []
+    result["id"] = record.get("id")
+    missing = [field for field in REQUIRED_FIELDS if record.get(field) is None]
+    if missing:
+        result["error"] = f"Missing fields: {', '.join(missing)}"
+        return result, None, []
+
+    try:
+        inputs: dict[str, Any] = {
+            field: _whole_number(field, record[field])
+            for field in AGE_FIELDS
+            if record.get(field) is not None
+        }
+        inputs.update(
+            {
+                field: float(record[field]) if record.get(field) is not None else 0.0
+                for field in FINANCIAL_FIELDS
+            }
+        )
+        inputs["has_partner"] = "partner_current_age" in inputs
+        accounts = record.get("accounts", [])
+        if isinstance(accounts, str):
+            accounts = json.loads(accounts)
+        if not isinstance(accounts, list):
+            raise TypeError(f"accounts must be a list, not {type(accounts).__name__}")
+        accounts = [_parse_account(account) for account in accounts]
+    except (KeyError, TypeError, ValueError) as e:
+        result["error"] = f"Invalid record: {e}"
+        return result, None, []
+    return result, inputs, accounts
+
+
+def _validate_households(
+    records: list[dict[str, Any] | str],
+) -> tuple[list[dict[str, Any]], list[_Household]]:
+    """Output rows for a chunk of records, plus the households that passed validation.
+
+    Records are parsed one at a time, but the rules in ``validation.py`` run
+    once over the whole chunk, and an invalid row reports every issue.
+    """
+    results, parsed = [], []
+    for record in records:
+        result, inputs, accounts = _parse_household(record)
+        results.append(result)
+        if inputs is not None:
+            parsed.append((result, inputs, accounts))
+
+    messages: dict[int, list[str]] = {}
+    for issue in validate_households(
+        [inputs for _, inputs, _ in parsed], [accounts for _, _, accounts in parsed]
+    ):
+        messages.setdefault(issue.row, []).append(issue.message)
+
+    households = []
+    for row, (result, inputs, accounts) in enumerate(parsed):
+        if row in messages:
+            result["error"] = "; ".join(messages[row])
+            continue
+        result["valid"] = True
+        households.append(
+            _Household(
+                current_age=inputs["current_age"],
+                retirement_age=inputs["retirement_age"],
+                life_expectancy=inputs["life_expectancy"],
+                annual_income=inputs["user_annual_income"] + inputs["partner_annual_income"],
+                annual_expenses=inputs["user_annual_expenses"] + inputs["partner_annual_expenses"],
+                inflation_rate=inputs["inflation_rate"],
+                accounts=accounts,
+            )
+        )
+    return results, households
+
+
+def _project_households(households: list[_Household]) -> dict[str, np.ndarray]:
+    """Project households together in one engine pass, one path per household.
+
+    Households hold different accounts, so their breakdowns are packed as in
+    ``calculate_projections``. Every path runs to the longest horizon and is
+    read at its own, which is unaffected because paths never interact.
+    Matches ``evaluate_grid``.
+    """
+    _, values, growth, is_liquid = _pack_breakdowns(
+        [
+            NetWorthBreakdown.from_categories(account.to_category() for account in household.accounts)
+            for household in households
+        ]
+    )
+    n = len(households)
+
+    current_age = np.array([household.current_age for household in households])
+    retirement_age = np.array([household.retirement_age for household in households])
+    horizon = np.maximum(
+        np.array([household.life_expectancy for household in households]) - current_age, 0
+    )
+    years_to_project = int(horizon.max(initial=0))
+    working = working_years(current_age, retirement_age, horizon)
+
+    totals = np.empty((n, years_to_project + 1))
+    states = iter_projection(
+        values,
+        growth,
+        is_liquid,
+        np.array([household.annual_income for household in households]),
+        np.array([household.annual_expenses for household in households]),
+        np.array([household.inflation_rate for household in households]),
+        years_to_project,
+        working,
+    )
+    ones = np.ones(values.shape[1])
+    for year, state in enumerate(states):
+        totals[:, year] = _row_totals(state, ones)
+
+    rows = np.arange(n)
+    years = np.arange(years_to_project + 1)
+    counted = (years > working[:, None]) & (years <= horizon[:, None])
+    return {
+        "retirement_net_worth": totals[rows, working],
+        "final_net_worth": totals[rows, horizon],
+        "runs_out": ((totals <= 0) & counted).any(axis=1),
+        "current_age": current_age,
+        "horizon": horizon,
+        "totals": totals,
+    }
+
+
+@dataclass
+class ChunkTotals:
+    """Yearly total net worth of a chunk's valid households, for export."""
+    household_ids: list[str]
+    current_ages: np.ndarray
+    horizons: np.ndarray
+    totals: np.ndarray
+
+
+def project_chunk(
+    records: list[dict[str, Any] | str], with_totals: bool = False
+) -> tuple[list[dict[str, Any]], ChunkTotals | None]:
+    """Validate and project a chunk of households; runs in a worker process.
+
+    Returns the output rows and, with ``with_totals``, the yearly totals.
+    """
+    results, households = _validate_households(records)
+    if not households:
+        return results, None
+
+    projected = _project_households(households)
+    valid = [result for result in results if result["valid"]]
+    for i, result in enumerate(valid):
+        result.update(
+            retirement_net_worth=float(projected["retirement_net_worth"][i]),
+            final_net_worth=float(projected["final_net_worth"][i]),
+            runs_out=bool(projected["runs_out"][i]),
+        )
+    totals = None
+    if with_totals:
+        totals = ChunkTotals(
+            household_ids=[str(result["id"]) for result in valid],
+            current_ages=projected["current_age"],
+            horizons=projected["horizon"],
+            totals=projected["totals"],
+        )
+    return results, totals
+
+
+def _chunks(records: Iterable[dict[str, Any] | str], size: int) -> Iterator[list[dict[str, Any] | str]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(
+    records: Iterable[dict[str, Any] | str],
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    with_totals: bool = False,
+) -> Iterator[tuple[list[dict[str, Any]], ChunkTotals | None]]:
+    """Yield projected chunks, as returned by ``project_chunk``, in input order.
+
+    With ``workers > 1`` chunks run on a process pool with at most two per
+    worker queued or running, so only that many chunks are ever in memory.
+    """
+    chunks = _chunks(records, chunk_size)
+    project = functools.partial(project_chunk, with_totals=with_totals)
+    if workers <= 1:
+        yield from map(project, chunks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight: deque[Future[tuple[list[dict[str, Any]], ChunkTotals | None]]] = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(project, chunk))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+class _ResultWriter:
+    """Write output rows as CSV or JSONL, flushing after every chunk."""
+
+    def __init__(self, stream: TextIO, output_format: str) -> None:
+        self.stream = stream
+        self.csv = csv.DictWriter(stream, RESULT_FIELDS) if output_format == "csv" else None
+        if self.csv:
+            self.csv.writeheader()
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        if self.csv:
+            self.csv.writerows(rows)
+        else:
+            self.stream.writelines(json.dumps(row) + "\n" for row in rows)
+        self.stream.flush()
+
+
+def _format(path: str, requested: str | None) -> str:
+    if requested:
+        return requested
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Project households from CSV or JSONL without the UI.")
+    parser.add_argument("input", help="households file, or - for stdin")
+    parser.add_argument("output", help="results file, or - for stdout")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"), help="default: from the file extension")
+    parser.add_argument("--output-format", choices=("csv", "jsonl"), help="default: from the file extension")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="households per chunk")
+    parser.add_argument(
+        "--export",
+        help="also write yearly total net worth per household to this Parquet (or .arrow) file",
+    )
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, newline="")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    exporter = ProjectionExporter(args.export, export_format(args.export)) if args.export else None
+    start = time.perf_counter()
+    households = invalid = 0
+    try:
+        writer = _ResultWriter(sink, _format(args.output, args.output_format))
+        records = read_households(source, _format(args.input, args.input_format))
+        for rows, totals in run_batch(records, args.workers, args.chunk_size, exporter is not None):
+            writer.write(rows)
+            if exporter is not None and totals is not None:
+                exporter.write_totals(totals.household_ids, totals.current_ages, totals.horizons, totals.totals)
+            households += len(rows)
+            invalid += sum(not row["valid"] for row in rows)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+        if exporter is not None:
+            exporter.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Projected {households} households ({invalid} invalid) in {elapsed:.1f}s "
+        f"({households / elapsed if elapsed else 0:.0f}/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
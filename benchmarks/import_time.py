@@ -0,0 +1,84 @@
+"""Measure app cold-start import time with ``python -X importtime``.
+
+Each run imports the module in a fresh interpreter so nothing is cached in
+``sys.modules``. Prints the median time and the slowest imports, and with
+``--json`` appends a record to a file so startup can be tracked over time.
+
+    uv run python benchmarks/import_time.py
+    uv run python benchmarks/import_time.py --json benchmarks/import_time.jsonl
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Libraries the login page and cold start should not load. plotly.graph_objects
+# is left out because streamlit imports it itself.
+HEAVY_MODULES = ("pandas", "plotly.express", "supabase")
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds for every module loaded by importing ``module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(module: str, runs: int) -> dict:
+    """Median start-up cost of importing ``module`` over ``runs`` fresh interpreters."""
+    samples = [import_times(module) for _ in range(runs)]
+    totals = [sample[module] for sample in samples]
+    last = samples[-1]
+    slowest = sorted(
+        (name for name in last if "." not in name and name != module),
+        key=last.get,
+        reverse=True,
+    )[:10]
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "module": module,
+        "runs": runs,
+        "median_ms": statistics.median(totals) / 1000,
+        "min_ms": min(totals) / 1000,
+        "heavy_modules_loaded": [name for name in HEAVY_MODULES if name in last],
+        "slowest_ms": {name: last[name] / 1000 for name in slowest},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="financial_planner", help="module to import")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to sample")
+    parser.add_argument("--json", type=Path, help="append the result as a JSON line to this file")
+    args = parser.parse_args()
+
+    record = measure(args.module, args.runs)
+    print(f"import {record['module']}: median {record['median_ms']:.1f} ms, min {record['min_ms']:.1f} ms over {record['runs']} runs")
+    print(f"heavy modules loaded: {', '.join(record['heavy_modules_loaded']) or 'none'}")
+    for name, ms in record["slowest_ms"].items():
+        print(f"  {name:<30} {ms:8.1f} ms")
+
+    if args.json:
+        with args.json.open("a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Load-test the HTTP service and report throughput and tail latency.
+
+Each client holds one keep-alive connection and sends requests back to back:
+
+    uv run python benchmarks/load_test.py --spawn --workers 4 --requests 5000 --concurrency 64
+    uv run python benchmarks/load_test.py --port 8000 --endpoint monte-carlo --requests 200
+
+``--distinct`` sets the share of requests with a distinct body; the rest
+repeat earlier ones, which exercises in-flight coalescing. ``--spawn`` starts
+a service on a free port for the run.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENDPOINT_OPTIONS: dict[str, dict[str, Any]] = {
+    "projection": {},
+    "monte-carlo": {"n_paths": 1_000},
+    "goal-seek": {},
+}
+
+
+def make_body(rng: random.Random, endpoint: str) -> bytes:
+    """A random but valid single-person plan."""
+    current_age = rng.randint(25, 55)
+    retirement_age = current_age + rng.randint(5, 35)
+    n_accounts = rng.randint(1, 6)
+    return json.dumps(
+        {
+            "inputs": {
+                "user": {
+                    "current_age": current_age,
+                    "retirement_age": retirement_age,
+                    "life_expectancy": retirement_age + rng.randint(10, 30),
+                    "annual_income": rng.randrange(30_000, 150_000, 1_000),
+                    "annual_expenses": rng.randrange(15_000, 60_000, 1_000),
+                },
+                "partner": None,
+                "inflation_rate": 0.02,
+            },
+            "net_worth_breakdown": {
+                f"Account {i}": {
+                    "value": rng.randrange(0, 200_000, 1_000),
+                    "growth": round(rng.uniform(0.0, 0.07), 3),
+                    "is_liquid": i % 3 != 0,
+                }
+                for i in range(n_accounts)
+            },
+            "options": ENDPOINT_OPTIONS[endpoint],
+        }
+    ).encode()
+
+
+def _request(method: str, path: str, host: str, body: bytes = b"") -> bytes:
+    return (
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _get(host: str, port: int, path: str) -> Any:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(_request("GET", path, host))
+    _, body = await _read_response(reader)
+    writer.close()
+    return json.loads(body)
+
+
+async def run_load(
+    host: str, port: int, endpoint: str, bodies: list[bytes], concurrency: int
+) -> tuple[list[float], int, float]:
+    """Send every body once; return per-request latencies, error count and elapsed seconds."""
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def client() -> None:
+        nonlocal errors, next_index
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while next_index < len(bodies):
+                body = bodies[next_index]
+                next_index += 1
+                start = time.perf_counter()
+                writer.write(_request("POST", f"/{endpoint}", host, body))
+                status, _ = await _read_response(reader)
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(min(concurrency, len(bodies)))))
+    return latencies, errors, time.perf_counter() - start
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+async def _wait_for_service(host: str, port: int, process: subprocess.Popen[bytes]) -> None:
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Service exited during startup")
+        try:
+            await _get(host, port, "/health")
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Service did not start within 30s")
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    distinct = [make_body(rng, args.endpoint) for _ in range(max(1, round(args.requests * args.distinct)))]
+    bodies = [distinct[i % len(distinct)] for i in range(args.requests)]
+    rng.shuffle(bodies)
+
+    process = None
+    port = args.port
+    if args.spawn:
+        port = _free_port()
+        process = subprocess.Popen(
+            [
+                sys.executable, str(ROOT / "service.py"),
+                "--host", args.host, "--port", str(port), "--workers", str(args.workers),
+                "--batch-window-ms", str(args.batch_window_ms),
+            ]
+        )
+    try:
+        if process is not None:
+            await _wait_for_service(args.host, port, process)
+        latencies, errors, elapsed = await run_load(args.host, port, args.endpoint, bodies, args.concurrency)
+        stats = await _get(args.host, port, "/stats")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    ordered = sorted(latencies)
+    return {
+        "endpoint": args.endpoint,
+        "requests": len(latencies),
+        "distinct_bodies": len(distinct),
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": _percentile(ordered, 0.5) * 1000,
+        "p95_ms": _percentile(ordered, 0.95) * 1000,
+        "p99_ms": _percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "service": {key: value for key, value in stats.items() if key != "spans"},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000, help="port of a running service")
+    parser.add_argument("--endpoint", choices=tuple(ENDPOINT_OPTIONS), default="projection")
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=64, help="simultaneous connections")
+    parser.add_argument("--distinct", type=float, default=1.0, help="share of requests with a distinct body")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="start a service for the run")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for --spawn")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0, help="batch window for --spawn")
+    parser.add_argument("--output", type=Path, help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print(
+        f"{report['requests']} requests to /{report['endpoint']} "
+        f"({report['distinct_bodies']} distinct, concurrency {report['concurrency']}) "
+        f"in {report['elapsed_s']:.2f}s: {report['throughput_rps']:.0f} req/s, {report['errors']} errors"
+    )
+    print(
+        f"latency ms: p50 {report['p50_ms']:.1f}  p95 {report['p95_ms']:.1f}  "
+        f"p99 {report['p99_ms']:.1f}  max {report['max_ms']:.1f}"
+    )
+    print("service: " + ", ".join(f"{key}={value}" for key, value in report["service"].items()))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Benchmark the projection engine, storage layer and Results page render.
+
+Writes machine-readable JSON so runs can be compared between releases:
+
+    uv run python benchmarks/run_benchmarks.py --output bench.json
+    uv run python benchmarks/run_benchmarks.py --compare bench.json
+
+``--compare`` exits non-zero when any benchmark's median is slower than the
+baseline by more than ``--threshold``.
+"""
+
+import argparse
+import copy
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from database import DatabaseManager  # noqa: E402
+from models import combine_net_worth_breakdowns  # noqa: E402
+from projection import calculate_projection  # noqa: E402
+from projection_cache import get_projection_cache  # noqa: E402
+from storage import ScenarioBackend, SQLiteBackend  # noqa: E402
+
+HORIZONS = (10, 40, 80)
+ACCOUNT_COUNTS = (1, 10, 50)
+
+
+class FakeBackend(ScenarioBackend):
+    """In-memory backend, so storage benchmarks measure our code rather than the network."""
+
+    def __init__(self) -> None:
+        self.rows: dict[tuple[str, str], dict[str, Any]] = {}
+        self.version = 0
+
+    def is_connected(self) -> bool:
+        return True
+
+    def upsert(self, rows: list[dict[str, Any]]) -> int:
+        for row in rows:
+            self.version += 1
+            self.rows[(row["user_id"], row["scenario_name"])] = {**row, "updated_at": self.version}
+        return len(rows)
+
+    def load(self, user_id: str, scenario_names: list[str]) -> dict[str, dict[str, Any]]:
+        return {
+            name: json.loads(self.rows[(user_id, name)]["scenario_data"])
+            for name in scenario_names
+            if (user_id, name) in self.rows
+        }
+
+    def list_scenarios(self, user_id: str) -> list[dict[str, Any]]:
+        scenarios = [
+            {"scenario_name": name, "created_at": row["updated_at"], "updated_at": row["updated_at"]}
+            for (owner, name), row in self.rows.items()
+            if owner == user_id
+        ]
+        return sorted(scenarios, key=lambda scenario: scenario["updated_at"], reverse=True)
+
+    def delete(self, user_id: str, scenario_names: list[str]) -> int:
+        removed = [self.rows.pop((user_id, name), None) for name in scenario_names]
+        return sum(row is not None for row in removed)
+
+
+def make_breakdown(n_accounts: int) -> dict[str, dict[str, Any]]:
+    """Breakdown with a mix of liquid and illiquid accounts."""
+    return {
+        f"Account {i}": {
+            "value": 10_000.0 * (i + 1),
+            "growth": 0.02 + 0.005 * (i % 8),
+            "is_liquid": i % 4 != 0,
+        }
+        for i in range(n_accounts)
+    }
+
+
+def make_inputs(n_accounts: int) -> dict[str, Any]:
+    """Session-state style inputs with the accounts split between user and partner."""
+    breakdown = make_breakdown(n_accounts)
+    names = list(breakdown)
+    return {
+        "user_annual_income": 60_000,
+        "partner_annual_income": 40_000,
+        "user_annual_expenses": 25_000,
+        "partner_annual_expenses": 20_000,
+        "inflation_rate": 0.02,
+        "has_partner": True,
+        "user_net_worth_breakdown": {name: breakdown[name] for name in names[::2]},
+        "partner_net_worth_breakdown": {name: breakdown[name] for name in names[1::2]},
+    }
+
+
+def time_call(func: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Per-call timings in milliseconds, auto-scaling the loop count like ``timeit``."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    samples = [total / number * 1000 for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "loops": number,
+        "repeat": repeat,
+    }
+
+
+def loop_projection(
+    net_worth_breakdown: dict[str, dict[str, Any]],
+    annual_income: float,
+    annual_expenses: float,
+    inflation_rate: float,
+    years_to_project: int,
+    retirement_age: int,
+    current_age: int,
+) -> tuple[list[float], dict[str, list[float]]]:
+    """The year-by-year dict loop ``calculate_projection`` replaced, kept as a yardstick."""
+    breakdown = copy.deepcopy(net_worth_breakdown)
+    projection = []
+    category_projections: dict[str, list[float]] = {category: [] for category in breakdown}
+
+    for year in range(years_to_project):
+        projection.append(sum(data["value"] for data in breakdown.values()))
+        for category, data in breakdown.items():
+            category_projections[category].append(data["value"])
+
+        for data in breakdown.values():
+            data["value"] *= 1 + data["growth"]
+
+        liquid = [data for data in breakdown.values() if data.get("is_liquid", True)]
+        illiquid = [data for data in breakdown.values() if not data.get("is_liquid", True)]
+        total_liquid = sum(data["value"] for data in liquid)
+        if current_age + year < retirement_age:
+            net_change = annual_income - annual_expenses
+            if net_change > 0:
+                if total_liquid > 0:
+                    for data in liquid:
+                        data["value"] += data["value"] / total_liquid * net_change
+                elif liquid:
+                    liquid[0]["value"] += net_change
+            elif net_change < 0 and total_liquid > 0:
+                for data in liquid:
+                    data["value"] += data["value"] / total_liquid * net_change
+                    data["value"] = max(data["value"], 0)
+        elif total_liquid >= annual_expenses:
+            for data in liquid:
+                data["value"] -= data["value"] / total_liquid * annual_expenses
+        else:
+            remaining = annual_expenses - total_liquid
+            for data in liquid:
+                data["value"] = 0
+            for data in sorted(illiquid, key=lambda data: data["value"]):
+                if remaining <= 0:
+                    break
+                sold = min(data["value"], remaining)
+                data["value"] -= sold
+                remaining -= sold
+
+        annual_expenses *= 1 + inflation_rate
+
+    return projection, category_projections
+
+
+def projection_benchmarks() -> Iterator[tuple[str, dict[str, Any], Callable[[], Any]]]:
+    """``calculate_projection`` next to the original loop on the same plans."""
+    engines = {"calculate_projection": calculate_projection, "calculate_projection.loop": loop_projection}
+    for years in HORIZONS:
+        for n_accounts in ACCOUNT_COUNTS:
+            breakdown = make_breakdown(n_accounts)
+            for name, engine in engines.items():
+                yield (
+                    name,
+                    {"years": years, "accounts": n_accounts},
+                    lambda engine=engine, breakdown=breakdown, years=years: engine(
+                        breakdown, 100_000, 45_000, 0.02, years, 30 + years // 2, 30
+                    ),
+                )
+
+
+def combine_benchmarks() -> Iterator[tuple[str, dict[str, Any], Callable[[], Any]]]:
+    for n_accounts in ACCOUNT_COUNTS:
+        inputs = make_inputs(n_accounts)
+        yield (
+            "combine_net_worth_breakdowns",
+            {"accounts": n_accounts},
+            lambda inputs=inputs: combine_net_worth_breakdowns(inputs),
+        )
+
+
+def storage_benchmarks(directory: Path) -> Iterator[tuple[str, dict[str, Any], Callable[[], Any]]]:
+    scenario = {"user_inputs": make_inputs(10), "age_inputs": {"current_age": 30}}
+    names = [f"Scenario {i}" for i in range(20)]
+    backends = {
+        "fake": FakeBackend(),
+        "sqlite": SQLiteBackend(str(directory / "bench.db")),
+    }
+    for backend_name, backend in backends.items():
+        db = DatabaseManager(backend)
+        db.save_many("bench", dict.fromkeys(names, scenario))
+        params = {"backend": backend_name}
+        yield "db.save_user_scenario", params, lambda db=db: db.save_user_scenario("bench", names[0], scenario)
+        yield "db.load_user_scenario", params, lambda db=db: db.load_user_scenario("bench", names[0])
+        yield "db.save_many", {**params, "scenarios": len(names)}, lambda db=db: db.save_many("bench", dict.fromkeys(names, scenario))
+        yield "db.load_many", {**params, "scenarios": len(names)}, lambda db=db: db.load_many("bench", names)
+        yield "db.list_user_scenarios.cold", params, lambda db=db: (
+            db.scenario_list_cache.invalidate("bench"),
+            db.list_user_scenarios("bench"),
+        )
+        yield "db.list_user_scenarios.cached", params, lambda db=db: db.list_user_scenarios("bench")
+
+
+def _results_app() -> None:
+    """Script for AppTest; runs in a fresh namespace so it sets up its own imports."""
+    import json
+    import os
+    import sys
+
+    import streamlit as st
+
+    sys.path.insert(0, os.environ["BENCH_ROOT"])
+    from state import init_state
+
+    init_state()
+    st.session_state.user_inputs.update(json.loads(os.environ["BENCH_INPUTS"]))
+    from results import show_results_page
+
+    show_results_page()
+
+
+RENDER_BENCHMARKS = ("show_results_page.cold", "show_results_page.cached")
+
+
+def render_benchmarks(
+    selected: Callable[[str], bool],
+) -> Iterator[tuple[str, dict[str, Any], Callable[[], Any]]]:
+    """Page render timings; the AppTest setup only runs if one of them is ``selected``."""
+    if not any(map(selected, RENDER_BENCHMARKS)):
+        return
+
+    import os
+
+    from streamlit.testing.v1 import AppTest
+
+    os.environ["BENCH_ROOT"] = str(ROOT)
+    for n_accounts in (2, 20):
+        os.environ["BENCH_INPUTS"] = json.dumps(make_inputs(n_accounts))
+        app = AppTest.from_function(_results_app, default_timeout=120)
+        app.run()
+        if app.exception:
+            raise RuntimeError(f"Results page raised: {app.exception[0].value}")
+
+        def cold(app: AppTest = app) -> None:
+            get_projection_cache().clear()
+            app.run()
+
+        cold_name, cached_name = RENDER_BENCHMARKS
+        yield cold_name, {"accounts": n_accounts}, cold
+        yield cached_name, {"accounts": n_accounts}, app.run
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(only: str | None, repeat: int, render_repeat: int) -> dict[str, Any]:
+    def selected(name: str) -> bool:
+        return not only or only in name
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        suites = [
+            (projection_benchmarks(), repeat),
+            (combine_benchmarks(), repeat),
+            (storage_benchmarks(Path(directory)), repeat),
+            (render_benchmarks(selected), render_repeat),
+        ]
+        for suite, suite_repeat in suites:
+            for name, params, func in suite:
+                if not selected(name):
+                    continue
+                timing = time_call(func, suite_repeat)
+                results.append({"name": name, "params": params, **timing})
+                label = ", ".join(f"{key}={value}" for key, value in params.items())
+                print(f"{name:<32} {label:<28} {timing['median_ms']:10.3f} ms")
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def _key(result: dict[str, Any]) -> str:
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Benchmarks whose median got slower than ``threshold`` times the baseline."""
+    previous = {_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get(_key(result))
+        if before and result["median_ms"] > before["median_ms"] * threshold:
+            regressions.append(
+                f"{result['name']} {result['params']}: "
+                f"{before['median_ms']:.3f} ms -> {result['median_ms']:.3f} ms"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="write results JSON to this file")
+    parser.add_argument("--compare", type=Path, help="baseline results JSON to check against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="allowed slowdown ratio")
+    parser.add_argument("--only", help="run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per benchmark")
+    parser.add_argument("--render-repeat", type=int, default=3, help="timing repeats per page render")
+    args = parser.parse_args()
+
+    report = run(args.only, args.repeat, args.render_repeat)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,131 +1,333 @@
-"""Database interface for Supabase integration."""
+"""Database interface for saved scenarios, backed by Supabase or SQLite."""
 
-import json
-import os
+import atexit
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 import streamlit as st
 from dotenv import load_dotenv
-from supabase import Client, create_client
+
+from instrumentation import timed
+from storage import ScenarioBackend, create_backend, scenario_row
 
 # Load environment variables
 load_dotenv()
 
 
-class SupabaseClient:
-    """Supabase client wrapper for the financial planner app."""
-
-    def __init__(self):
-        self._client: Client | None = None
-        self._initialize_client()
-
-    def _initialize_client(self) -> None:
-        """Initialize Supabase client with environment variables."""
-        url = os.getenv("SUPABASE_URL")
-        key = os.getenv("SUPABASE_KEY")
-
-        if not url or not key:
-            st.error("⚠️ Supabase configuration missing. Please set SUPABASE_URL and SUPABASE_KEY in your .env file.")
-            return
+class ScenarioListCache:
+    """Per-user cache of scenario metadata that expires after a time-to-live."""
+
+    def __init__(self, ttl_seconds: float = 60.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> list[dict[str, Any]] | None:
+        """Return the cached scenario list, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and self._clock() - entry[0] < self.ttl_seconds:
+                self.hits += 1
+                return [dict(scenario) for scenario in entry[1]]
+            self._entries.pop(user_id, None)
+            self.misses += 1
+            return None
 
-        try:
-            self._client = create_client(url, key)
-        except Exception as e:
-            st.error(f"Failed to initialize Supabase client: {str(e)}")
+    def set(self, user_id: str, scenarios: list[dict[str, Any]]) -> None:
+        """Cache a freshly fetched scenario list."""
+        with self._lock:
+            self._entries[user_id] = (self._clock(), [dict(scenario) for scenario in scenarios])
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop the cached list for a user after their scenarios change."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and hit rate; each hit is a database round trip saved."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "cached_users": len(self._entries),
+            }
 
-    @property
-    def client(self) -> Client | None:
-        """Get the Supabase client."""
-        return self._client
 
-    def is_connected(self) -> bool:
-        """Check if the client is properly connected."""
-        return self._client is not None
+@dataclass
+class SaveOutcome:
+    """Result of a background scenario save, reported to the UI on a later rerun."""
+    user_id: str
+    scenario_name: str
+    succeeded: bool
+    error: str | None = None
+
+
+class ScenarioWriter:
+    """Background thread that writes scenario saves off the Streamlit script thread.
+
+    Saves are queued per ``(user_id, scenario_name)`` with a due time; a newer
+    save of the same scenario replaces the queued one and restarts its delay,
+    so rapid edits coalesce into one write. Everything due is written in a
+    single batch. Outcomes are kept until the UI collects them.
+    """
+
+    def __init__(self, write: Callable[[list[dict[str, Any]]], None]) -> None:
+        self._write = write
+        self._pending: dict[tuple[str, str], tuple[float, dict[str, Any]]] = {}
+        self._outcomes: dict[str, list[SaveOutcome]] = {}
+        self._in_flight = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, user_id: str, scenario_name: str, scenario_data: dict[str, Any], delay: float = 0.0) -> None:
+        """Queue a save to run after ``delay`` seconds, replacing any queued save of the same scenario."""
+        # Serialise now so later edits to session state can't leak into this save
+        row = scenario_row(user_id, scenario_name, scenario_data)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Scenario writer is closed")
+            self._pending[(user_id, scenario_name)] = (time.monotonic() + delay, row)
+            self._ensure_started()
+            self._condition.notify()
+
+    def pop_outcomes(self, user_id: str) -> list[SaveOutcome]:
+        """Return and forget the finished saves for a user."""
+        with self._condition:
+            return self._outcomes.pop(user_id, [])
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Write everything queued now and wait for it; False if ``timeout`` ran out."""
+        with self._condition:
+            self._pending = {key: (0.0, row) for key, (_, row) in self._pending.items()}
+            self._condition.notify()
+            return self._condition.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Flush queued saves and stop the thread."""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="scenario-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close, 5.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                batch = self._next_batch()
+                if batch is None:
+                    return
+                self._in_flight += 1
+
+            try:
+                self._write([row for _, row in batch])
+                outcomes = [SaveOutcome(user_id, name, True) for (user_id, name), _ in batch]
+            except Exception as e:
+                outcomes = [SaveOutcome(user_id, name, False, str(e)) for (user_id, name), _ in batch]
+
+            with self._condition:
+                for outcome in outcomes:
+                    self._outcomes.setdefault(outcome.user_id, []).append(outcome)
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _next_batch(self) -> list[tuple[tuple[str, str], dict[str, Any]]] | None:
+        """Wait until saves are due and take them off the queue; None once closed and empty."""
+        while True:
+            if self._closed and not self._pending:
+                return None
+            now = time.monotonic()
+            due = [key for key, (due_at, _) in self._pending.items() if due_at <= now or self._closed]
+            if due:
+                return [(key, self._pending.pop(key)[1]) for key in due]
+            next_due = min((due_at for due_at, _ in self._pending.values()), default=None)
+            self._condition.wait(None if next_due is None else next_due - now)
 
 
 class DatabaseManager:
     """Database operations manager for the financial planner."""
 
-    def __init__(self):
-        self.supabase = SupabaseClient()
-
+    # Quiet period after the last edit before dirty session state is autosaved
+    AUTOSAVE_DEBOUNCE_SECONDS = 5.0
+
+    def __init__(self, backend: ScenarioBackend | None = None):
+        self.backend = backend or create_backend()
+        self.scenario_list_cache = ScenarioListCache()
+        self.writer = ScenarioWriter(self._write_rows)
+        self._reported_connection_error = False
+
+    def _is_connected(self) -> bool:
+        """Whether the backend is usable, showing why not the first time it isn't."""
+        if self.backend.is_connected():
+            return True
+        error = self.backend.connection_error
+        if error and not self._reported_connection_error:
+            self._reported_connection_error = True
+            st.error(f"⚠️ {error}")
+        return False
+
+    @timed()
     def save_user_scenario(self, user_id: str, scenario_name: str, scenario_data: dict[str, Any]) -> bool:
         """Save a financial scenario for a user."""
-        if not self.supabase.is_connected():
+        if not self._is_connected():
             return False
 
         try:
-            # Prepare data for insertion
-            data = {
-                "user_id": user_id,
-                "scenario_name": scenario_name,
-                "scenario_data": json.dumps(scenario_data),
-                "updated_at": "now()"
-            }
-
-            # Check if scenario already exists
-            existing = self.supabase.client.table("user_scenarios").select("id").eq("user_id", user_id).eq("scenario_name", scenario_name).execute()
-
-            if existing.data:
-                # Update existing scenario
-                result = self.supabase.client.table("user_scenarios").update(data).eq("user_id", user_id).eq("scenario_name", scenario_name).execute()
-            else:
-                # Insert new scenario
-                result = self.supabase.client.table("user_scenarios").insert(data).execute()
-
-            return len(result.data) > 0
+            # Insert or update in one round trip on the (user_id, scenario_name) constraint
+            return self.backend.upsert([scenario_row(user_id, scenario_name, scenario_data)]) > 0
 
         except Exception as e:
             st.error(f"Failed to save scenario: {str(e)}")
             return False
 
+        finally:
+            self.scenario_list_cache.invalidate(user_id)
+
+    @timed()
     def load_user_scenario(self, user_id: str, scenario_name: str) -> dict[str, Any] | None:
         """Load a specific scenario for a user."""
-        if not self.supabase.is_connected():
+        if not self._is_connected():
             return None
 
         try:
-            result = self.supabase.client.table("user_scenarios").select("scenario_data").eq("user_id", user_id).eq("scenario_name", scenario_name).execute()
-
-            if result.data:
-                return json.loads(result.data[0]["scenario_data"])
-            return None
+            return self.backend.load(user_id, [scenario_name]).get(scenario_name)
 
         except Exception as e:
             st.error(f"Failed to load scenario: {str(e)}")
             return None
 
+    @timed()
     def list_user_scenarios(self, user_id: str) -> list[dict[str, Any]]:
-        """List all scenarios for a user."""
-        if not self.supabase.is_connected():
+        """List all scenarios for a user, served from the TTL cache when fresh."""
+        if not self._is_connected():
             return []
 
+        cached = self.scenario_list_cache.get(user_id)
+        if cached is not None:
+            return cached
+
         try:
-            result = self.supabase.client.table("user_scenarios").select("scenario_name, created_at, updated_at").eq("user_id", user_id).order("updated_at", desc=True).execute()
-            return result.data or []
+            scenarios = self.backend.list_scenarios(user_id)
+            self.scenario_list_cache.set(user_id, scenarios)
+            return scenarios
 
         except Exception as e:
             st.error(f"Failed to list scenarios: {str(e)}")
             return []
 
+    @timed()
     def delete_user_scenario(self, user_id: str, scenario_name: str) -> bool:
         """Delete a specific scenario for a user."""
-        if not self.supabase.is_connected():
+        if not self._is_connected():
             return False
 
         try:
-            result = self.supabase.client.table("user_scenarios").delete().eq("user_id", user_id).eq("scenario_name", scenario_name).execute()
-            return len(result.data) > 0
+            return self.backend.delete(user_id, [scenario_name]) > 0
 
         except Exception as e:
             st.error(f"Failed to delete scenario: {str(e)}")
             return False
 
+        finally:
+            self.scenario_list_cache.invalidate(user_id)
+
+    @timed()
+    def save_many(self, user_id: str, scenarios: dict[str, dict[str, Any]]) -> bool:
+        """Save several scenarios, keyed by name, in a single upsert."""
+        if not self._is_connected():
+            return False
+        if not scenarios:
+            return True
+
+        try:
+            rows = [scenario_row(user_id, name, data) for name, data in scenarios.items()]
+            return self.backend.upsert(rows) == len(rows)
+
+        except Exception as e:
+            st.error(f"Failed to save scenarios: {str(e)}")
+            return False
+
+        finally:
+            self.scenario_list_cache.invalidate(user_id)
+
+    @timed()
+    def load_many(self, user_id: str, scenario_names: list[str]) -> dict[str, dict[str, Any]]:
+        """Load several scenarios in a single query, keyed by name. Missing ones are left out."""
+        if not self._is_connected() or not scenario_names:
+            return {}
+
+        try:
+            return self.backend.load(user_id, scenario_names)
+
+        except Exception as e:
+            st.error(f"Failed to load scenarios: {str(e)}")
+            return {}
+
+    @timed()
+    def delete_many(self, user_id: str, scenario_names: list[str]) -> int:
+        """Delete several scenarios in a single query and return how many were removed."""
+        if not self._is_connected() or not scenario_names:
+            return 0
+
+        try:
+            return self.backend.delete(user_id, scenario_names)
+
+        except Exception as e:
+            st.error(f"Failed to delete scenarios: {str(e)}")
+            return 0
+
+        finally:
+            self.scenario_list_cache.invalidate(user_id)
+
+    @timed()
+    def save_in_background(self, user_id: str, scenario_name: str, scenario_data: dict[str, Any]) -> None:
+        """Queue a scenario save without waiting for the database."""
+        self.writer.submit(user_id, scenario_name, scenario_data)
+
+    @timed()
+    def autosave(self, user_id: str, scenario_name: str, scenario_data: dict[str, Any]) -> None:
+        """Queue a save that only runs once the scenario stops changing for the debounce interval."""
+        self.writer.submit(user_id, scenario_name, scenario_data, delay=self.AUTOSAVE_DEBOUNCE_SECONDS)
+
+    @timed()
+    def _write_rows(self, rows: list[dict[str, Any]]) -> None:
+        """Upsert prepared scenario rows, raising on failure. Runs on the writer thread."""
+        try:
+            if not self.backend.is_connected():
+                raise RuntimeError(self.backend.connection_error or "Database is not connected")
+            self.backend.upsert(rows)
+        finally:
+            for user_id in {row["user_id"] for row in rows}:
+                self.scenario_list_cache.invalidate(user_id)
+
+    @timed()
+    def scenario_cache_stats(self) -> dict[str, Any]:
+        """Hit rate of the scenario list cache, i.e. how many list queries it saved."""
+        return self.scenario_list_cache.stats()
+
 
-# Global instance
-db_manager = DatabaseManager()
+# Global instance, created on first use so importing this module stays cheap
+db_manager: DatabaseManager | None = None
+_db_manager_lock = threading.Lock()
 
 
 def get_db_manager() -> DatabaseManager:
     """Get the global database manager instance."""
-    return db_manager
+    global db_manager
+    with _db_manager_lock:
+        if db_manager is None:
+            db_manager = DatabaseManager()
+        return db_manager
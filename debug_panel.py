@@ -0,0 +1,48 @@
+"""Opt-in sidebar panel showing hot-path timings for developers."""
+
+import os
+
+import streamlit as st
+
+from instrumentation import get_instrumentation
+
+
+def timing_panel_enabled() -> bool:
+    """Whether ``DEBUG_TIMINGS`` is set to a truthy value."""
+    return os.getenv("DEBUG_TIMINGS", "").lower() in ("1", "true", "yes")
+
+
+def show_timing_panel() -> None:
+    """Show per-span counts and latencies with JSON and Prometheus exports."""
+    if not timing_panel_enabled():
+        return
+
+    instrumentation = get_instrumentation()
+    with st.sidebar.expander("⏱️ Timings"):
+        snapshot = instrumentation.snapshot()
+        if not snapshot:
+            st.caption("No spans recorded yet.")
+            return
+
+        st.dataframe(
+            [
+                {
+                    "Span": name,
+                    "Count": stats["count"],
+                    "p50 (ms)": round(stats["p50_ms"], 2),
+                    "p99 (ms)": round(stats["p99_ms"], 2),
+                    "Total (ms)": round(stats["total_ms"], 1),
+                }
+                for name, stats in snapshot.items()
+            ],
+            hide_index=True,
+        )
+        st.download_button(
+            "Download JSON", instrumentation.to_json(), "timings.json", "application/json"
+        )
+        st.download_button(
+            "Download Prometheus", instrumentation.to_prometheus(), "timings.prom", "text/plain"
+        )
+        if st.button("Reset timings"):
+            instrumentation.reset()
+            st.rerun()
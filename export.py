@@ -0,0 +1,194 @@
+"""Columnar export of projection results to Parquet or Arrow IPC."""
+
+from collections.abc import Mapping, Sequence
+from types import TracebackType
+from typing import Any, BinaryIO
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from instrumentation import timed
+from monte_carlo import MonteCarloResult
+
+# One row per household, projected year and series. ``year_offset`` counts years
+# from the start of the projection (0 is today) and ``age`` is the age reached
+# then. ``category`` is an account name, "total", or "monte_carlo_p<N>" for a
+# Monte Carlo percentile band.
+EXPORT_SCHEMA = pa.schema(
+    [
+        ("household_id", pa.string()),
+        ("year_offset", pa.int32()),
+        ("age", pa.int32()),
+        ("category", pa.string()),
+        ("value", pa.float64()),
+    ]
+)
+
+EXPORT_FORMATS = ("parquet", "arrow")
+
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+
+
+def export_format(path: str) -> str:
+    """Export format implied by a file name: Arrow IPC for .arrow/.feather, otherwise Parquet."""
+    return "arrow" if path.lower().endswith((".arrow", ".feather", ".ipc")) else "parquet"
+
+
+class ProjectionExporter:
+    """Stream projection rows to a Parquet or Arrow IPC file in row groups.
+
+    Rows are buffered as Arrow record batches and written out whenever
+    ``row_group_size`` rows have accumulated, so a long batch or Monte Carlo
+    run never holds more than one row group of output. Use as a context
+    manager, or call ``close`` to write the final partial row group.
+    """
+
+    def __init__(
+        self,
+        sink: str | BinaryIO,
+        file_format: str = "parquet",
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    ) -> None:
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {file_format}")
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._buffer: list[pa.RecordBatch] = []
+        self._buffered_rows = 0
+        if file_format == "parquet":
+            self._writer: Any = pq.ParquetWriter(sink, EXPORT_SCHEMA)
+        else:
+            self._writer = ipc.new_file(sink, EXPORT_SCHEMA)
+
+    def write_rows(
+        self,
+        household_ids: Sequence[str] | np.ndarray,
+        year_offsets: np.ndarray,
+        ages: np.ndarray,
+        categories: Sequence[str] | np.ndarray,
+        values: np.ndarray,
+    ) -> None:
+        """Append equally long columns of rows."""
+        batch = pa.RecordBatch.from_arrays(
+            [
+                pa.array(household_ids, pa.string()),
+                pa.array(year_offsets, pa.int32()),
+                pa.array(ages, pa.int32()),
+                pa.array(categories, pa.string()),
+                pa.array(values, pa.float64()),
+            ],
+            schema=EXPORT_SCHEMA,
+        )
+        self._buffer.append(batch)
+        self._buffered_rows += batch.num_rows
+        if self._buffered_rows >= self.row_group_size:
+            self.flush()
+
+    def write_series(
+        self,
+        household_id: str,
+        current_age: int,
+        series: Mapping[str, Sequence[float] | np.ndarray],
+    ) -> None:
+        """Append named yearly series for one household, e.g. total and per-category values."""
+        for category, values in series.items():
+            column = np.asarray(values, dtype=float)
+            offsets = np.arange(len(column))
+            self.write_rows(
+                [household_id] * len(column),
+                offsets,
+                offsets + current_age,
+                [category] * len(column),
+                column,
+            )
+
+    def write_projection(
+        self,
+        household_id: str,
+        current_age: int,
+        projection: Sequence[float],
+        category_projections: Mapping[str, Sequence[float]],
+    ) -> None:
+        """Append a deterministic projection: the total and every category."""
+        self.write_series(household_id, current_age, {"total": projection, **category_projections})
+
+    def write_monte_carlo(self, household_id: str, current_age: int, result: MonteCarloResult) -> None:
+        """Append the Monte Carlo percentile bands of total net worth."""
+        self.write_series(
+            household_id,
+            current_age,
+            {f"monte_carlo_p{percentile}": band for percentile, band in result.percentiles.items()},
+        )
+
+    def write_totals(
+        self,
+        household_ids: Sequence[str],
+        current_ages: np.ndarray,
+        horizons: np.ndarray,
+        totals: np.ndarray,
+    ) -> None:
+        """Append total net worth for many households at once.
+
+        ``totals`` is a ``(households, years)`` matrix; each household's row is
+        cut off after its own horizon.
+        """
+        years = np.arange(totals.shape[1])
+        keep = years <= np.asarray(horizons)[:, None]
+        rows, columns = np.nonzero(keep)
+        self.write_rows(
+            np.asarray(household_ids, dtype=object)[rows],
+            columns,
+            np.asarray(current_ages)[rows] + columns,
+            np.full(len(rows), "total", dtype=object),
+            totals[keep],
+        )
+
+    def flush(self) -> None:
+        """Write buffered rows as one row group."""
+        if not self._buffer:
+            return
+        table = pa.Table.from_batches(self._buffer, EXPORT_SCHEMA)
+        if isinstance(self._writer, pq.ParquetWriter):
+            self._writer.write_table(table, row_group_size=max(table.num_rows, 1))
+        else:
+            self._writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+        self.rows_written += table.num_rows
+        self._buffer = []
+        self._buffered_rows = 0
+
+    def close(self) -> None:
+        """Write any remaining rows and finish the file."""
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self) -> "ProjectionExporter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+@timed()
+def export_results(
+    household_id: str,
+    current_age: int,
+    projection: Sequence[float],
+    category_projections: Mapping[str, Sequence[float]],
+    monte_carlo: MonteCarloResult | None = None,
+    file_format: str = "parquet",
+) -> bytes:
+    """One household's projection, and Monte Carlo bands if given, as file bytes."""
+    sink = pa.BufferOutputStream()
+    with ProjectionExporter(sink, file_format) as exporter:
+        exporter.write_projection(household_id, current_age, projection, category_projections)
+        if monte_carlo is not None:
+            exporter.write_monte_carlo(household_id, current_age, monte_carlo)
+    data: bytes = sink.getvalue().to_pybytes()
+    return data
@@ -1,9 +1,8 @@
 import streamlit as st
 
 from auth import require_auth, show_user_info
-from inputs_page import show_input_page
-from results import show_results_page
-from scenario_manager import show_scenario_selector
+from debug_panel import show_timing_panel
+from scenario_manager import autosave_session_state, show_save_status, show_scenario_selector
 from state import init_state
 
 
@@ -22,6 +21,9 @@ def main() -> None:
     # Show user info in sidebar
     show_user_info()
 
+    # Report background saves that finished since the last run
+    show_save_status()
+
     # Show scenario quick loader
     show_scenario_selector()
 
@@ -29,15 +31,24 @@ def main() -> None:
     st.sidebar.title("Navigation")
     page = st.sidebar.radio("Go to", ["Input", "Results", "Scenarios"])
 
-    # Show the selected page
+    # Show the selected page, importing it only when needed so the login page
+    # and cold start don't load pandas and plotly
     if page == "Input":
+        from inputs_page import show_input_page
         show_input_page()
     elif page == "Results":
+        from results import show_results_page
         show_results_page()
     elif page == "Scenarios":
         from scenario_manager import show_scenario_manager
         show_scenario_manager()
 
+    # Queue a debounced autosave if this run changed the inputs
+    autosave_session_state()
+
+    # Developer timings, shown when DEBUG_TIMINGS is set
+    show_timing_panel()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,195 @@
+"""Goal-seek solvers for retirement age, savings and spending."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from monte_carlo import run_monte_carlo
+from projection import BreakdownInput
+from scenario_grid import evaluate_grid
+
+# Largest annual saving or spending the solvers will consider
+MAX_ANNUAL_AMOUNT = 10_000_000
+
+
+@dataclass(frozen=True)
+class GoalTarget:
+    """What a plan has to achieve.
+
+    With ``success_probability`` unset the deterministic projection must never
+    run out of money. Otherwise that share of Monte Carlo paths must not run
+    out; a fixed seed keeps every evaluation on the same random paths.
+    """
+    success_probability: float | None = None
+    volatility: float = 0.1
+    n_paths: int = 10_000
+    seed: int = 0
+
+
+@dataclass
+class GoalSeekResult:
+    """Solved value of one plan parameter, or None if no value in range meets the target."""
+    parameter: str
+    value: float | None
+    evaluations: int
+
+
+class GoalSeeker:
+    """Solve for plan parameters that just meet a target.
+
+    Every evaluation of the projection engine is memoized by its parameters,
+    and solves share the cache, so each solve takes a bracketing pass plus a
+    bisection: tens of engine calls rather than one per candidate.
+    """
+
+    def __init__(
+        self,
+        net_worth_breakdown: BreakdownInput,
+        annual_income: float,
+        annual_expenses: float,
+        inflation_rate: float,
+        retirement_age: int,
+        current_age: int,
+        life_expectancy: int,
+        target: GoalTarget | None = None,
+    ) -> None:
+        self.net_worth_breakdown = net_worth_breakdown
+        self.plan = {
+            "annual_income": float(annual_income),
+            "annual_expenses": float(annual_expenses),
+            "retirement_age": int(retirement_age),
+        }
+        self.inflation_rate = inflation_rate
+        self.current_age = current_age
+        self.life_expectancy = life_expectancy
+        self.target = target or GoalTarget()
+        self._evaluations: dict[tuple[float, float, int], bool] = {}
+
+    @property
+    def evaluations(self) -> int:
+        """Number of distinct plans run through the engine so far."""
+        return len(self._evaluations)
+
+    def meets_target(
+        self,
+        annual_income: float | None = None,
+        annual_expenses: float | None = None,
+        retirement_age: int | None = None,
+    ) -> bool:
+        """Whether the plan, with any overrides applied, meets the target."""
+        key = (
+            self.plan["annual_income"] if annual_income is None else float(annual_income),
+            self.plan["annual_expenses"] if annual_expenses is None else float(annual_expenses),
+            int(self.plan["retirement_age"] if retirement_age is None else retirement_age),
+        )
+        if key not in self._evaluations:
+            self._evaluations[key] = self._evaluate(*key)
+        return self._evaluations[key]
+
+    def _evaluate(self, annual_income: float, annual_expenses: float, retirement_age: int) -> bool:
+        if self.target.success_probability is None:
+            grid = evaluate_grid(
+                self.net_worth_breakdown,
+                annual_income,
+                annual_expenses,
+                self.inflation_rate,
+                retirement_age,
+                self.current_age,
+                self.life_expectancy,
+                {},
+            )
+            return not bool(grid["runs_out"].iloc[0])
+
+        result = run_monte_carlo(
+            self.net_worth_breakdown,
+            annual_income,
+            annual_expenses,
+            self.inflation_rate,
+            self.life_expectancy - self.current_age,
+            retirement_age,
+            self.current_age,
+            volatility=self.target.volatility,
+            n_paths=self.target.n_paths,
+            seed=self.target.seed,
+        )
+        return result.success_probability >= self.target.success_probability
+
+    def earliest_retirement_age(self) -> GoalSeekResult:
+        """Earliest retirement age, before life expectancy, that meets the target."""
+        age = _first_passing_integer(
+            self.current_age + 1,
+            self.life_expectancy - 1,
+            lambda age: self.meets_target(retirement_age=age),
+        )
+        return GoalSeekResult("retirement_age", age, self.evaluations)
+
+    def minimum_annual_savings(self, tolerance: float = 100.0) -> GoalSeekResult:
+        """Smallest annual saving (income above current expenses) that meets the target."""
+        expenses = self.plan["annual_expenses"]
+        savings = _smallest_passing_amount(
+            max(self.plan["annual_income"] - expenses, tolerance),
+            lambda saving: self.meets_target(annual_income=expenses + saving),
+            tolerance,
+        )
+        return GoalSeekResult("annual_savings", savings, self.evaluations)
+
+    def maximum_annual_expenses(self, tolerance: float = 100.0) -> GoalSeekResult:
+        """Largest annual spending that still meets the target."""
+        expenses = _largest_passing_amount(
+            max(self.plan["annual_expenses"], tolerance),
+            lambda expenses: self.meets_target(annual_expenses=expenses),
+            tolerance,
+        )
+        return GoalSeekResult("annual_expenses", expenses, self.evaluations)
+
+
+def _first_passing_integer(low: int, high: int, passes: Callable[[int], bool]) -> int | None:
+    """Smallest integer in ``[low, high]`` that passes, assuming passing is monotone."""
+    if low > high or not passes(high):
+        return None
+    while low < high:
+        middle = (low + high) // 2
+        if passes(middle):
+            high = middle
+        else:
+            low = middle + 1
+    return high
+
+
+def _smallest_passing_amount(
+    guess: float, passes: Callable[[float], bool], tolerance: float
+) -> float | None:
+    """Smallest non-negative amount that passes, to within ``tolerance``, rounding up."""
+    if passes(0.0):
+        return 0.0
+    low, high = 0.0, guess
+    while not passes(high):
+        if high >= MAX_ANNUAL_AMOUNT:
+            return None
+        low, high = high, min(high * 2, MAX_ANNUAL_AMOUNT)
+    while high - low > tolerance:
+        middle = (low + high) / 2
+        if passes(middle):
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+def _largest_passing_amount(
+    guess: float, passes: Callable[[float], bool], tolerance: float
+) -> float | None:
+    """Largest non-negative amount that passes, to within ``tolerance``, rounding down."""
+    if not passes(0.0):
+        return None
+    low, high = 0.0, guess
+    while passes(high):
+        if high >= MAX_ANNUAL_AMOUNT:
+            return high
+        low, high = high, min(high * 2, MAX_ANNUAL_AMOUNT)
+    while high - low > tolerance:
+        middle = (low + high) / 2
+        if passes(middle):
+            low = middle
+        else:
+            high = middle
+    return low
@@ -0,0 +1,114 @@
+"""Incremental re-projection that reuses the unchanged start of the timeline."""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from instrumentation import timed
+from projection import (
+    BreakdownInput,
+    _breakdown_arrays,
+    _single_path_series,
+    _single_path_states,
+    working_years,
+)
+
+
+@dataclass
+class _Checkpoints:
+    """Per-year state of the last run and the inputs that fix it."""
+    base: tuple[Any, ...]
+    names: list[str]
+    working: int
+    states: list[list[float]]
+    expenses: np.ndarray
+
+
+class IncrementalProjector:
+    """Deterministic projections that restart from the first year whose inputs changed.
+
+    The state at the start of every year and that year's inflated expenses
+    are checkpointed. When only the retirement age or the horizon moves, the
+    years before the first affected one are identical, so the run resumes
+    from that checkpoint. Any change to balances, growth rates, liquidity,
+    income, expenses, inflation or current age triggers a full run. Results
+    match ``calculate_projection`` exactly and the breakdown is not modified.
+    """
+
+    def __init__(self) -> None:
+        self._checkpoints: _Checkpoints | None = None
+        self.years_reused = 0
+        self.years_computed = 0
+
+    @timed()
+    def project(
+        self,
+        net_worth_breakdown: BreakdownInput,
+        annual_income: float,
+        annual_expenses: float,
+        inflation_rate: float,
+        years_to_project: int,
+        retirement_age: int,
+        current_age: int,
+    ) -> tuple[list[float], dict[str, list[float]]]:
+        """Project like ``calculate_projection``, reusing checkpoints where possible."""
+        names, values, growth, is_liquid = _breakdown_arrays(net_worth_breakdown)
+        years_to_project = max(years_to_project, 0)
+        working = int(working_years(current_age, retirement_age, years_to_project))
+        base = (
+            tuple(names),
+            values.tobytes(),
+            growth.tobytes(),
+            is_liquid.tobytes(),
+            float(annual_income),
+            float(annual_expenses),
+            float(inflation_rate),
+            current_age,
+        )
+
+        restart = self._restart_year(base, working)
+        # A restart past year 0 always has checkpoints to resume from
+        checkpoints = self._checkpoints
+        if restart == 0 or checkpoints is None:
+            restart = 0
+            expenses = np.empty(years_to_project + 1)
+            expenses[0] = annual_expenses
+            states = [values.tolist()]
+        else:
+            restart = min(restart, years_to_project)
+            expenses = np.empty(years_to_project + 1)
+            reused = min(len(checkpoints.expenses), years_to_project + 1)
+            expenses[:reused] = checkpoints.expenses[:reused]
+            states = checkpoints.states[:restart + 1]
+        # Same repeated multiplication as the engine, so resumed runs match full ones
+        for year in range(restart, years_to_project):
+            expenses[year + 1] = expenses[year] * (1 + inflation_rate)
+
+        new_states = _single_path_states(
+            np.asarray(states[restart]),
+            growth,
+            is_liquid,
+            annual_income,
+            expenses[restart],
+            inflation_rate,
+            years_to_project,
+            working,
+            start_year=restart,
+        )
+        states.extend(new_states[1:])
+        self.years_reused += restart
+        self.years_computed += years_to_project - restart
+
+        self._checkpoints = _Checkpoints(base, names, working, states, expenses)
+        return _single_path_series(names, states[:-1])
+
+    def _restart_year(self, base: tuple[Any, ...], working: int) -> int:
+        """First year whose state can differ from the checkpointed run."""
+        checkpoints = self._checkpoints
+        if checkpoints is None or checkpoints.base != base:
+            return 0
+        last_year = len(checkpoints.states) - 1
+        if working != checkpoints.working:
+            return min(working, checkpoints.working, last_year)
+        return last_year
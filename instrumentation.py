@@ -0,0 +1,148 @@
+"""Lightweight span timers for the app's hot paths."""
+
+import functools
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Recent samples kept per span for percentiles; counts and totals cover every call
+SAMPLE_WINDOW = 1024
+
+PROMETHEUS_METRIC = "financial_planner_span_seconds"
+
+
+class _SpanStats:
+    """Call count, total time and a window of recent durations for one span."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: deque[float] = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class Instrumentation:
+    """Thread-safe registry of named timing spans."""
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self._spans: dict[str, _SpanStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add one timed call to a span."""
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = _SpanStats()
+            stats.add(seconds)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block, including when it raises."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name: str | None = None) -> Callable[[F], F]:
+        """Decorator timing every call, named ``module.qualname`` unless given."""
+        def decorate(func: F) -> F:
+            span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(span_name, time.perf_counter() - start)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorate
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Count, total, p50, p99 and max per span, in milliseconds, slowest total first."""
+        with self._lock:
+            spans = {
+                name: (stats.count, stats.total, stats.max, sorted(stats.samples))
+                for name, stats in self._spans.items()
+            }
+        summary = {
+            name: {
+                "count": count,
+                "total_ms": total * 1000,
+                "p50_ms": _percentile(samples, 0.5) * 1000,
+                "p99_ms": _percentile(samples, 0.99) * 1000,
+                "max_ms": longest * 1000,
+            }
+            for name, (count, total, longest, samples) in spans.items()
+        }
+        return dict(sorted(summary.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+
+    def reset(self) -> None:
+        """Forget every recorded span."""
+        with self._lock:
+            self._spans.clear()
+
+    def to_json(self) -> str:
+        """The snapshot as JSON."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """The snapshot in Prometheus text exposition format, as a summary in seconds."""
+        lines = [
+            f"# HELP {PROMETHEUS_METRIC} Time spent in instrumented spans.",
+            f"# TYPE {PROMETHEUS_METRIC} summary",
+        ]
+        for name, stats in self.snapshot().items():
+            label = _escape_label(name)
+            lines += [
+                f'{PROMETHEUS_METRIC}{{span="{label}",quantile="0.5"}} {stats["p50_ms"] / 1000:.9f}',
+                f'{PROMETHEUS_METRIC}{{span="{label}",quantile="0.99"}} {stats["p99_ms"] / 1000:.9f}',
+                f'{PROMETHEUS_METRIC}_sum{{span="{label}"}} {stats["total_ms"] / 1000:.9f}',
+                f'{PROMETHEUS_METRIC}_count{{span="{label}"}} {stats["count"]}',
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Global instance
+instrumentation = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Get the global instrumentation instance."""
+    return instrumentation
+
+
+def timed(name: str | None = None) -> Callable[[F], F]:
+    """Time every call of the decorated function on the global instance."""
+    return instrumentation.timed(name)
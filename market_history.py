@@ -0,0 +1,99 @@
+"""Bundled annual UK market history for backtesting.
+
+Calendar-year total returns on UK equities (all-share, dividends reinvested),
+long-dated gilts and cash (Treasury bills / Bank Rate), with UK consumer price
+inflation, all nominal.
+
+These figures are APPROXIMATE: compiled from published long-run series and
+rounded to the nearest percent (cash and inflation to a tenth), they are good
+enough to show sequence-of-returns risk but should not be quoted as an
+authoritative record.
+"""
+
+import numpy as np
+
+ASSET_CLASSES = ("equity", "gilts", "cash")
+SERIES = (*ASSET_CLASSES, "inflation")
+
+# year, equity %, gilts %, cash %, inflation %
+_TABLE = (
+    (1950, 6, 1, 0.5, 3.1),
+    (1951, 10, -4, 0.6, 9.1),
+    (1952, -5, 1, 2.2, 9.2),
+    (1953, 20, 6, 2.3, 3.1),
+    (1954, 44, 7, 1.8, 1.8),
+    (1955, 9, -7, 3.7, 4.5),
+    (1956, -7, -2, 5.0, 4.9),
+    (1957, -2, -2, 4.9, 3.7),
+    (1958, 46, 9, 4.8, 3.0),
+    (1959, 53, 3, 3.4, 0.6),
+    (1960, 1, -4, 4.9, 1.0),
+    (1961, 2, -5, 5.1, 3.4),
+    (1962, 2, 19, 4.2, 4.3),
+    (1963, 16, 3, 3.7, 2.0),
+    (1964, -8, -1, 4.6, 3.3),
+    (1965, 10, 4, 5.9, 4.8),
+    (1966, -8, 2, 6.1, 3.9),
+    (1967, 34, -2, 5.8, 2.5),
+    (1968, 51, -4, 7.1, 4.7),
+    (1969, -12, -4, 7.6, 5.4),
+    (1970, -3, 6, 7.0, 6.4),
+    (1971, 45, 25, 5.6, 9.4),
+    (1972, 14, -5, 5.5, 7.1),
+    (1973, -28, -9, 9.3, 9.2),
+    (1974, -52, -16, 11.4, 16.0),
+    (1975, 151, 37, 10.2, 24.2),
+    (1976, -1, 14, 11.1, 16.5),
+    (1977, 48, 48, 7.7, 15.8),
+    (1978, 9, -2, 8.5, 8.3),
+    (1979, 11, 4, 13.0, 13.4),
+    (1980, 35, 21, 15.1, 18.0),
+    (1981, 13, 2, 13.0, 11.9),
+    (1982, 29, 52, 11.4, 8.6),
+    (1983, 29, 16, 9.6, 4.6),
+    (1984, 32, 7, 9.3, 5.0),
+    (1985, 20, 11, 11.6, 6.1),
+    (1986, 27, 11, 10.4, 3.4),
+    (1987, 8, 16, 9.3, 4.2),
+    (1988, 11, 9, 9.8, 4.9),
+    (1989, 36, 6, 13.3, 7.8),
+    (1990, -10, 5, 14.6, 9.5),
+    (1991, 21, 19, 11.5, 5.9),
+    (1992, 20, 18, 9.6, 3.7),
+    (1993, 28, 29, 5.9, 1.6),
+    (1994, -6, -12, 5.5, 2.4),
+    (1995, 24, 19, 6.7, 3.5),
+    (1996, 16, 8, 6.0, 2.4),
+    (1997, 24, 20, 6.8, 3.1),
+    (1998, 14, 25, 7.3, 3.4),
+    (1999, 24, -4, 5.4, 1.5),
+    (2000, -6, 9, 6.1, 3.0),
+    (2001, -13, 1, 5.0, 1.8),
+    (2002, -23, 10, 4.0, 1.7),
+    (2003, 21, 2, 3.7, 2.9),
+    (2004, 13, 7, 4.4, 3.0),
+    (2005, 22, 8, 4.7, 2.8),
+    (2006, 17, 0, 4.7, 3.2),
+    (2007, 5, 5, 5.7, 4.3),
+    (2008, -30, 13, 4.7, 4.0),
+    (2009, 30, -1, 0.6, -0.5),
+    (2010, 15, 8, 0.5, 4.6),
+    (2011, -4, 21, 0.5, 5.2),
+    (2012, 12, 3, 0.5, 3.2),
+    (2013, 21, -6, 0.5, 3.0),
+    (2014, 1, 19, 0.5, 2.4),
+    (2015, 1, 1, 0.5, 1.0),
+    (2016, 17, 11, 0.4, 1.8),
+    (2017, 13, 2, 0.3, 3.6),
+    (2018, -10, 0, 0.6, 3.3),
+    (2019, 19, 7, 0.8, 2.6),
+    (2020, -10, 8, 0.2, 1.5),
+    (2021, 18, -7, 0.1, 4.1),
+    (2022, 0, -25, 1.5, 11.6),
+    (2023, 8, 3, 4.7, 8.0),
+)
+
+YEARS = np.array([row[0] for row in _TABLE])
+# One row per year, one column per entry of SERIES, as fractions
+RETURNS = np.array([row[1:] for row in _TABLE], dtype=float) / 100
+RETURNS.flags.writeable = False
@@ -1,4 +1,8 @@
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
 
 
 @dataclass
@@ -10,6 +14,17 @@ class PersonalInfo:
     annual_income: float
     annual_expenses: float
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PersonalInfo":
+        """Build from a JSON-style dict, converting each field to its type."""
+        return cls(
+            current_age=int(data["current_age"]),
+            retirement_age=int(data["retirement_age"]),
+            life_expectancy=int(data["life_expectancy"]),
+            annual_income=float(data["annual_income"]),
+            annual_expenses=float(data["annual_expenses"]),
+        )
+
 
 @dataclass
 class FinancialInputs:
@@ -19,6 +34,21 @@ class FinancialInputs:
     inflation_rate: float
     has_partner: bool = False
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "FinancialInputs":
+        """Build from a JSON-style dict with ``user`` and optional ``partner`` dicts.
+
+        Raises ``KeyError``, ``TypeError`` or ``ValueError`` for missing or
+        malformed fields.
+        """
+        has_partner = bool(data.get("has_partner", data.get("partner") is not None))
+        return cls(
+            user=PersonalInfo.from_dict(data["user"]),
+            partner=PersonalInfo.from_dict(data["partner"]) if has_partner else None,
+            inflation_rate=float(data["inflation_rate"]),
+            has_partner=has_partner,
+        )
+
     @property
     def total_annual_income(self) -> float:
         """Calculate total annual income."""
@@ -36,6 +66,125 @@ class FinancialInputs:
         return total
 
 
+@dataclass(frozen=True, slots=True)
+class Category:
+    """A single net worth category as the projection engine reads it."""
+    name: str
+    value: float
+    growth: float
+    is_liquid: bool
+
+
+@dataclass(frozen=True, slots=True)
+class NetWorthBreakdown:
+    """Immutable, array-backed net worth breakdown.
+
+    Values, growth rates and liquidity flags are held in read-only arrays that
+    the projection engine uses as they are, so one breakdown can be shared
+    between threads or sent to worker processes without defensive copies.
+    """
+    names: tuple[str, ...]
+    values: np.ndarray
+    growth: np.ndarray
+    is_liquid: np.ndarray
+
+    def __post_init__(self) -> None:
+        for field, dtype in (("values", float), ("growth", float), ("is_liquid", bool)):
+            array = np.array(getattr(self, field), dtype=dtype)
+            array.flags.writeable = False
+            object.__setattr__(self, field, array)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Rebuild through __init__ so unpickled arrays are read-only too
+        return (type(self), (self.names, self.values, self.growth, self.is_liquid))
+
+    @classmethod
+    def from_categories(cls, categories: Iterable[Category]) -> "NetWorthBreakdown":
+        """Build a breakdown from categories, keeping their order."""
+        categories = list(categories)
+        return cls(
+            names=tuple(category.name for category in categories),
+            values=np.array([category.value for category in categories], dtype=float),
+            growth=np.array([category.growth for category in categories], dtype=float),
+            is_liquid=np.array([category.is_liquid for category in categories], dtype=bool),
+        )
+
+    @classmethod
+    def from_dict(cls, breakdown: dict[str, dict[str, Any]]) -> "NetWorthBreakdown":
+        """Build a breakdown from the ``{name: {"value", "growth", "is_liquid"}}`` dicts kept in session state."""
+        return cls.from_categories(
+            Category(
+                name=name,
+                value=float(data["value"]),
+                growth=float(data["growth"]),
+                is_liquid=bool(data.get("is_liquid", True)),
+            )
+            for name, data in breakdown.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[Category]:
+        for name, value, growth, is_liquid in zip(
+            self.names,
+            self.values.tolist(),
+            self.growth.tolist(),
+            self.is_liquid.tolist(),
+            strict=True,
+        ):
+            yield Category(name=name, value=value, growth=growth, is_liquid=is_liquid)
+
+    @property
+    def total_value(self) -> float:
+        """Total value across all categories."""
+        return float(self.values.sum())
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        """Convert back to the session state dict format."""
+        return {
+            category.name: {
+                "value": category.value,
+                "growth": category.growth,
+                "is_liquid": category.is_liquid,
+            }
+            for category in self
+        }
+
+
+def combine_net_worth_breakdowns(inputs: dict[str, Any]) -> NetWorthBreakdown:
+    """Combine user and partner net worth breakdowns."""
+    combined_categories = []
+    # User categories first, then partner-only ones, so the order is stable between runs
+    for category in dict.fromkeys(
+        [*inputs["user_net_worth_breakdown"], *inputs["partner_net_worth_breakdown"]]
+    ):
+        combined_value = (
+            inputs["user_net_worth_breakdown"].get(category, {"value": 0})["value"]
+            + inputs["partner_net_worth_breakdown"].get(category, {"value": 0})["value"]
+        )
+        combined_growth = max(
+            inputs["user_net_worth_breakdown"].get(category, {"growth": 0})["growth"],
+            inputs["partner_net_worth_breakdown"].get(category, {"growth": 0})[
+                "growth"
+            ],
+        )
+        # Determine liquidity (if either user or partner has liquid version, it's liquid)
+        user_liquid = inputs["user_net_worth_breakdown"].get(category, {}).get("is_liquid", False)
+        partner_liquid = inputs["partner_net_worth_breakdown"].get(category, {}).get("is_liquid", False)
+        is_liquid = user_liquid or partner_liquid
+
+        combined_categories.append(
+            Category(
+                name=category,
+                value=float(combined_value),
+                growth=float(combined_growth),
+                is_liquid=is_liquid,
+            )
+        )
+    return NetWorthBreakdown.from_categories(combined_categories)
+
+
 @dataclass
 class ProjectionResults:
     """Results from financial projection calculations."""
@@ -0,0 +1,261 @@
+"""Monte Carlo projections with stochastic annual returns."""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from projection import (
+    BreakdownInput,
+    _breakdown_arrays,
+    _income_arguments,
+    _row_totals,
+    iter_projection,
+    per_step_rate,
+    working_steps,
+)
+from uk_tax import TaxCashFlows, TaxProfile, tax_cash_flows
+from withdrawals import WithdrawalPolicy, WithdrawalStrategy, build_policy
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Paths are always split into shards of this size, whatever the worker count,
+# so a seed maps to the same random streams on one core or many.
+SHARD_SIZE = 50_000
+
+# Quantiles each shard reports so percentiles can be merged across shards
+QUANTILE_GRID = (np.arange(1000) + 0.5) / 10
+
+
+@dataclass
+class MonteCarloResult:
+    """Percentile bands and success rate from a Monte Carlo projection."""
+    percentiles: dict[int, np.ndarray]
+    success_probability: float
+    n_paths: int
+
+    @property
+    def median(self) -> np.ndarray:
+        """Median total net worth for each projected year."""
+        return self.percentiles[50]
+
+
+def _volatility_array(
+    names: list[str], volatility: float | dict[str, float]
+) -> np.ndarray:
+    """Per-category return volatility from a single figure or a mapping by category."""
+    if isinstance(volatility, dict):
+        return np.array([float(volatility.get(name, 0.0)) for name in names], dtype=float)
+    return np.full(len(names), float(volatility))
+
+
+def simulate_totals(
+    values: np.ndarray,
+    growth: np.ndarray,
+    volatility: np.ndarray,
+    is_liquid: np.ndarray,
+    annual_income: float,
+    annual_expenses: float,
+    inflation_rate: float,
+    years_to_project: int,
+    working: int,
+    n_paths: int,
+    rng: np.random.Generator,
+    steps_per_year: int = 1,
+    tax_flows: TaxCashFlows | None = None,
+    withdrawal: WithdrawalPolicy | None = None,
+) -> np.ndarray:
+    """Simulate total net worth as a ``(paths, years_to_project + 1)`` matrix.
+
+    Each year every path draws one normally distributed return per category,
+    centred on the category's growth rate. Returns are floored at -100%.
+    With ``steps_per_year > 1`` the engine steps at that resolution (``working``
+    is then a number of steps), spreading each year's return evenly over its
+    steps; totals are still recorded at the start of each year. ``tax_flows``
+    replaces the gross ``annual_income`` with after-tax cash flows per step,
+    and a ``withdrawal`` policy built for ``n_paths`` sets retirement spending.
+    """
+    n_categories = len(values)
+    step_returns = np.empty((n_paths, n_categories))
+
+    def draw_returns(step: int) -> np.ndarray:
+        nonlocal step_returns
+        if step % steps_per_year == 0:
+            returns = rng.normal(growth, volatility, size=(n_paths, n_categories))
+            step_returns = per_step_rate(np.maximum(returns, -1.0), steps_per_year)
+        return step_returns
+
+    ones = np.ones(n_categories)
+    totals = np.empty((n_paths, years_to_project + 1))
+    states = iter_projection(
+        np.broadcast_to(values, (n_paths, n_categories)),
+        draw_returns,
+        is_liquid,
+        annual_expenses=annual_expenses / steps_per_year,
+        inflation_rate=per_step_rate(inflation_rate, steps_per_year),
+        years_to_project=years_to_project * steps_per_year,
+        working_years=working,
+        withdrawal_policy=withdrawal,
+        **_income_arguments(annual_income, tax_flows, steps_per_year),
+    )
+    for step, state in enumerate(states):
+        if step % steps_per_year == 0:
+            totals[:, step // steps_per_year] = _row_totals(state, ones)
+    return totals
+
+
+@dataclass
+class _ShardSummary:
+    """What a shard sends back instead of its full paths x years matrix."""
+    n_paths: int
+    successes: int
+    quantiles: np.ndarray | None
+    percentiles: np.ndarray
+
+
+def _run_shard(
+    simulation: dict[str, Any],
+    n_paths: int,
+    seed: np.random.SeedSequence,
+    percentiles: tuple[int, ...],
+    merged: bool,
+    withdrawal: WithdrawalStrategy | None = None,
+) -> _ShardSummary:
+    """Simulate one shard of paths and summarise it.
+
+    The quantile grid is only needed when the shard will be merged with others.
+    """
+    totals = simulate_totals(
+        **simulation,
+        n_paths=n_paths,
+        rng=np.random.default_rng(seed),
+        withdrawal=build_policy(withdrawal, n_paths, simulation["steps_per_year"]),
+    )
+    retirement_year = simulation["working"] // simulation["steps_per_year"]
+    return _ShardSummary(
+        n_paths=n_paths,
+        successes=int(_successful_paths(totals, retirement_year).sum()),
+        quantiles=np.percentile(totals, QUANTILE_GRID, axis=0) if merged else None,
+        percentiles=np.percentile(totals, percentiles, axis=0),
+    )
+
+
+def _merge_percentiles(
+    shards: list[_ShardSummary], percentiles: tuple[int, ...]
+) -> np.ndarray:
+    """Combine per-shard quantile grids into overall percentiles.
+
+    Every grid point stands for an equal slice of its shard's paths, so the
+    grids are pooled as a weighted sample and read off per year.
+    """
+    if len(shards) == 1:
+        return shards[0].percentiles
+
+    pooled = np.concatenate([shard.quantiles for shard in shards])
+    weights = np.concatenate(
+        [np.full(len(QUANTILE_GRID), shard.n_paths / len(QUANTILE_GRID)) for shard in shards]
+    )
+    order = np.argsort(pooled, axis=0, kind="stable")
+    sorted_values = np.take_along_axis(pooled, order, axis=0)
+    sorted_weights = weights[order]
+    positions = (np.cumsum(sorted_weights, axis=0) - sorted_weights / 2) / weights.sum()
+
+    targets = np.asarray(percentiles, dtype=float) / 100
+    return np.array(
+        [
+            np.interp(targets, positions[:, year], sorted_values[:, year])
+            for year in range(pooled.shape[1])
+        ]
+    ).T
+
+
+def _successful_paths(totals: np.ndarray, retirement_year: int) -> np.ndarray:
+    """Paths that never ran out of money once retired.
+
+    Assets only reach zero in retirement when a year's expenses could not be
+    met in full, so any zero total after the first retirement year is a failure.
+    """
+    return (totals[:, retirement_year + 1:] > 0).all(axis=1)
+
+
+def run_monte_carlo(
+    net_worth_breakdown: BreakdownInput,
+    annual_income: float,
+    annual_expenses: float,
+    inflation_rate: float,
+    years_to_project: int,
+    retirement_age: int,
+    current_age: int,
+    volatility: float | dict[str, float] = 0.1,
+    n_paths: int = 10_000,
+    seed: int | None = None,
+    percentiles: tuple[int, ...] = DEFAULT_PERCENTILES,
+    workers: int = 1,
+    steps_per_year: int = 1,
+    retirement_step: int = 0,
+    tax: TaxProfile | None = None,
+    withdrawal: WithdrawalStrategy | None = None,
+) -> MonteCarloResult:
+    """Run a Monte Carlo projection of total net worth.
+
+    ``volatility`` is the annual standard deviation of returns, either one
+    figure for every category or a mapping from category name to volatility.
+    Paths are simulated in shards of ``SHARD_SIZE``, each with its own stream
+    spawned from ``seed``; with ``workers > 1`` the shards run on a process
+    pool. A given seed gives the same result for any worker count.
+    ``steps_per_year=12`` simulates monthly cash flows, with
+    ``retirement_step`` moving retirement that many months into its year.
+    With ``tax`` every path runs on the same after-tax cash flows, computed
+    once up front, and ``withdrawal`` sets every path's retirement spending.
+    The breakdown is not modified.
+    """
+    names, values, growth, is_liquid = _breakdown_arrays(net_worth_breakdown)
+    years_to_project = max(years_to_project, 0)
+    simulation = {
+        "values": values,
+        "growth": growth,
+        "volatility": _volatility_array(names, volatility),
+        "is_liquid": is_liquid,
+        "annual_income": annual_income,
+        "annual_expenses": annual_expenses,
+        "inflation_rate": inflation_rate,
+        "years_to_project": years_to_project,
+        "working": int(
+            working_steps(
+                current_age, retirement_age, years_to_project, steps_per_year, retirement_step
+            )
+        ),
+        "steps_per_year": steps_per_year,
+        "tax_flows": (
+            tax_cash_flows(tax, names, inflation_rate, years_to_project * steps_per_year, steps_per_year)
+            if tax
+            else None
+        ),
+    }
+
+    shard_sizes = [SHARD_SIZE] * (n_paths // SHARD_SIZE)
+    if n_paths % SHARD_SIZE:
+        shard_sizes.append(n_paths % SHARD_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(shard_sizes))
+    shard_args = (
+        [simulation] * len(shard_sizes),
+        shard_sizes,
+        seeds,
+        [percentiles] * len(shard_sizes),
+        [len(shard_sizes) > 1] * len(shard_sizes),
+        [withdrawal] * len(shard_sizes),
+    )
+
+    if workers > 1 and len(shard_sizes) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shard_sizes))) as pool:
+            shards = list(pool.map(_run_shard, *shard_args))
+    else:
+        shards = list(map(_run_shard, *shard_args))
+
+    bands = _merge_percentiles(shards, percentiles)
+    return MonteCarloResult(
+        percentiles=dict(zip(percentiles, bands, strict=True)),
+        success_probability=sum(shard.successes for shard in shards) / n_paths,
+        n_paths=n_paths,
+    )
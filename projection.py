@@ -1,94 +1,520 @@
+import operator
+from collections.abc import Callable, Iterator, Sequence
 from typing import Any
 
+import numpy as np
 
+from instrumentation import timed
+from models import NetWorthBreakdown
+from uk_tax import TaxCashFlows, TaxProfile, tax_cash_flows
+from withdrawals import WithdrawalPolicy, WithdrawalStrategy, build_policy
+
+# Engine entry points take the immutable breakdown or the session state dicts
+BreakdownInput = NetWorthBreakdown | dict[str, dict[str, Any]]
+
+
+def _breakdown_arrays(
+    net_worth_breakdown: BreakdownInput,
+) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray]:
+    """Split a net worth breakdown into category names and value/growth/liquidity arrays.
+
+    A ``NetWorthBreakdown`` hands over its read-only arrays without copying.
+    """
+    if isinstance(net_worth_breakdown, NetWorthBreakdown):
+        return (
+            list(net_worth_breakdown.names),
+            net_worth_breakdown.values,
+            net_worth_breakdown.growth,
+            net_worth_breakdown.is_liquid,
+        )
+    categories = list(net_worth_breakdown.values())
+    names = list(net_worth_breakdown.keys())
+    values = np.array([float(data["value"]) for data in categories], dtype=float)
+    growth = np.array([float(data["growth"]) for data in categories], dtype=float)
+    is_liquid = np.array([bool(data.get("is_liquid", True)) for data in categories], dtype=bool)
+    return names, values, growth, is_liquid
+
+
+def _pack_breakdowns(
+    breakdowns: Sequence[BreakdownInput],
+) -> tuple[list[list[str]], np.ndarray, np.ndarray, np.ndarray]:
+    """Lay independent breakdowns out as the rows of ``(plans, categories)`` arrays.
+
+    Rows are padded to the longest breakdown with empty illiquid categories.
+    An empty illiquid category never changes a projection: it doesn't grow,
+    takes no savings and sells for nothing. Returns each plan's category names
+    and the padded value, growth and liquidity arrays.
+    """
+    unpacked = [_breakdown_arrays(breakdown) for breakdown in breakdowns]
+    width = max((len(names) for names, *_ in unpacked), default=0)
+    values = np.zeros((len(unpacked), width))
+    growth = np.zeros((len(unpacked), width))
+    is_liquid = np.zeros((len(unpacked), width), dtype=bool)
+    for row, (names, row_values, row_growth, row_liquid) in enumerate(unpacked):
+        values[row, :len(names)] = row_values
+        growth[row, :len(names)] = row_growth
+        is_liquid[row, :len(names)] = row_liquid
+    return [names for names, *_ in unpacked], values, growth, is_liquid
+
+
+def _row_totals(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted sum of each path's categories.
+
+    NumPy reduces a short trailing axis slowly, so weights shared by every path
+    go through a matrix-vector product instead of ``sum(axis=1)``.
+    """
+    if weights.ndim == 1:
+        return values @ weights
+    return np.einsum("ij,ij->i", values, weights)
+
+
+def _income_arguments(
+    annual_income: Any, tax_flows: TaxCashFlows | None, steps_per_year: int = 1
+) -> dict[str, Any]:
+    """Income arguments for ``iter_projection``: gross income per step, or after-tax cash flows."""
+    if tax_flows is None:
+        return {"annual_income": np.asarray(annual_income, dtype=float) / steps_per_year}
+    return {
+        "annual_income": tax_flows.income_at,
+        "retirement_income": tax_flows.retirement_income_at,
+        "contributions": tax_flows.contributions,
+    }
+
+
+def working_years(current_age: Any, retirement_age: Any, years_to_project: int) -> Any:
+    """Number of projected years that fall in the working phase.
+
+    A year is a working year while the age at its start is below the
+    retirement age, so a 30-year-old retiring at 65 works 35 projected years.
+    """
+    years = np.asarray(retirement_age) - np.asarray(current_age)
+    return np.clip(years, 0, years_to_project)
+
+
+def per_step_rate(annual_rate: Any, steps_per_year: int) -> Any:
+    """Rate per step that compounds to ``annual_rate`` over a year."""
+    if steps_per_year == 1:
+        return np.asarray(annual_rate, dtype=float)
+    return (1 + np.asarray(annual_rate, dtype=float)) ** (1 / steps_per_year) - 1
+
+
+def working_steps(
+    current_age: Any,
+    retirement_age: Any,
+    years_to_project: int,
+    steps_per_year: int,
+    retirement_step: int = 0,
+) -> Any:
+    """Number of working-phase steps at a given resolution.
+
+    ``retirement_step`` moves retirement that many steps into the year it
+    starts, e.g. ``steps_per_year=12, retirement_step=6`` retires mid-year.
+    """
+    steps = working_years(current_age, retirement_age, years_to_project) * steps_per_year
+    return np.clip(steps + retirement_step, 0, years_to_project * steps_per_year)
+
+
+def iter_projection(
+    values: np.ndarray,
+    growth: np.ndarray | Callable[[int], np.ndarray],
+    is_liquid: np.ndarray,
+    annual_income: Any,
+    annual_expenses: Any,
+    inflation_rate: Any,
+    years_to_project: int,
+    working_years: Any,
+    start_year: int = 0,
+    retirement_income: Any = None,
+    contributions: np.ndarray | None = None,
+    withdrawal_policy: WithdrawalPolicy | None = None,
+) -> Iterator[np.ndarray]:
+    """Yield category values at the start of every projected year.
+
+    ``values``, ``growth`` and ``is_liquid`` are ``(paths, categories)`` arrays
+    (1-D inputs are treated as a single path and the others broadcast against
+    ``values``). Income, expenses, inflation and working years are scalars or
+    per-path arrays. ``growth`` may also be a callable returning the growth
+    rates for a given year, which is how stochastic returns are fed in, and
+    ``inflation_rate`` a callable returning each year's per-path inflation,
+    which is how historical inflation is fed in.
+    ``years_to_project + 1`` arrays are yielded, the last one holding the
+    values after the final year. Yielded arrays are never modified.
+
+    ``annual_income`` and ``retirement_income`` may likewise be callables of
+    the year, which is how after-tax cash flows from ``uk_tax`` are fed in.
+    ``retirement_income`` is paid in retirement and reduces what is drawn
+    from assets; any excess over expenses is spent. ``contributions`` are
+    paid into each category every working year on top of income, e.g.
+    pension contributions made by salary sacrifice.
+
+    ``withdrawal_policy`` decides each retirement year's spending on every
+    path from its portfolio after growth, in place of the planned expenses
+    (see ``withdrawals``).
+
+    With ``start_year`` the run resumes from a checkpoint: ``values`` and
+    ``annual_expenses`` are then the values at the start of that year, and only
+    the states from ``start_year`` onwards are yielded.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    n_paths, n_categories = values.shape
+    growth_for_year = growth if callable(growth) else None
+    if growth_for_year is None:
+        growth = np.broadcast_to(np.asarray(growth, dtype=float), values.shape)
+    liquid_weights = np.asarray(is_liquid, dtype=float)
+    if liquid_weights.ndim > 1:
+        liquid_weights = np.broadcast_to(liquid_weights, values.shape)
+    is_liquid = np.broadcast_to(np.asarray(is_liquid, dtype=bool), values.shape)
+    income_for_year = annual_income if callable(annual_income) else None
+    if income_for_year is None:
+        income = np.broadcast_to(np.asarray(annual_income, dtype=float), (n_paths,))
+    retirement_income_for_year = retirement_income if callable(retirement_income) else None
+    if retirement_income is not None and retirement_income_for_year is None:
+        retirement_income = np.broadcast_to(np.asarray(retirement_income, dtype=float), (n_paths,))
+    expenses = np.broadcast_to(np.asarray(annual_expenses, dtype=float), (n_paths,))
+    inflation_for_year = inflation_rate if callable(inflation_rate) else None
+    if inflation_for_year is None:
+        inflation = np.broadcast_to(np.asarray(inflation_rate, dtype=float), (n_paths,))
+    working = np.broadcast_to(np.asarray(working_years), (n_paths,))
+
+    rows = np.arange(n_paths)
+    has_liquid = is_liquid.any(axis=1)
+    first_liquid = is_liquid.argmax(axis=1) if n_categories else np.zeros(n_paths, dtype=int)
+    # Liquid categories sort after every illiquid one when selling assets
+    sale_order_key = np.where(is_liquid, np.inf, 0.0)
+
+    for year in range(start_year, years_to_project):
+        yield values
+
+        if growth_for_year is not None:
+            growth = growth_for_year(year)
+        values = values * (1 + growth)
+        total_liquid = _row_totals(values, liquid_weights)
+        has_total = total_liquid > 0
+        inverse_total = np.divide(
+            1.0, total_liquid, out=np.zeros_like(total_liquid), where=has_total
+        )
+        # Each liquid category's share of the liquid total (zero for illiquid ones)
+        share = values * liquid_weights * inverse_total[:, None]
+
+        is_working = year < working
+        all_working = bool(is_working.all())
+        any_working = all_working or bool(is_working.any())
+        if any_working:
+            # Working years: distribute savings or deficit across liquid assets
+            if income_for_year is not None:
+                income = np.broadcast_to(np.asarray(income_for_year(year), dtype=float), (n_paths,))
+            net_change = income - expenses
+            working_values = values + share * net_change[:, None]
+            deficit = (net_change < 0) & has_total
+            if deficit.any():
+                working_values = np.where(
+                    deficit[:, None] & is_liquid, np.maximum(working_values, 0.0), working_values
+                )
+            # No liquid value to distribute over: savings go to the first liquid category
+            seed = (net_change > 0) & ~has_total & has_liquid
+            if seed.any():
+                working_values[rows[seed], first_liquid[seed]] += net_change[seed]
+            if contributions is not None:
+                working_values = working_values + contributions
+
+        if not all_working:
+            # Retirement: draw expenses from liquid assets, then sell illiquid ones
+            withdrawal = expenses
+            if withdrawal_policy is not None:
+                portfolio = _row_totals(values, np.ones(n_categories))
+                withdrawal = withdrawal_policy(year, portfolio, expenses, ~is_working)
+            if retirement_income_for_year is not None:
+                retirement_income = np.asarray(retirement_income_for_year(year), dtype=float)
+            if retirement_income is not None:
+                withdrawal = np.maximum(withdrawal - retirement_income, 0.0)
+            retired_values = values - share * withdrawal[:, None]
+
+            # Paths whose liquid assets fall short sell illiquid ones, smallest first
+            shortfall = np.flatnonzero((total_liquid < withdrawal) & ~is_working)
+            if shortfall.size:
+                remaining = withdrawal[shortfall] - total_liquid[shortfall]
+                illiquid_values = np.where(is_liquid[shortfall], 0.0, values[shortfall])
+                order = np.argsort(
+                    illiquid_values + sale_order_key[shortfall], axis=1, kind="stable"
+                )
+                sorted_values = np.take_along_axis(illiquid_values, order, axis=1)
+                sold_before = np.cumsum(sorted_values, axis=1) - sorted_values
+                sold = np.clip(remaining[:, None] - sold_before, 0.0, sorted_values)
+                np.put_along_axis(illiquid_values, order, sorted_values - sold, axis=1)
+                retired_values[shortfall] = illiquid_values
+
+        if all_working:
+            values = working_values
+        elif not any_working:
+            values = retired_values
+        else:
+            values = np.where(is_working[:, None], working_values, retired_values)
+
+        # Apply inflation to expenses
+        if inflation_for_year is not None:
+            inflation = inflation_for_year(year)
+        expenses = expenses * (1 + inflation)
+
+    yield values
+
+
+# Breakdowns up to this many categories run ``_iter_single_path`` instead of the
+# engine: on a single path NumPy's fixed per-call cost outweighs the vectorized
+# arithmetic until around 150 categories.
+SCALAR_CATEGORY_LIMIT = 128
+
+
+def _iter_single_path(
+    values: Sequence[float],
+    growth: Sequence[float],
+    is_liquid: Sequence[bool],
+    annual_income: float,
+    annual_expenses: float,
+    inflation_rate: float,
+    years_to_project: int,
+    working_years: int,
+    start_year: int = 0,
+) -> Iterator[list[float]]:
+    """``iter_projection`` for one deterministic path, on plain Python floats.
+
+    Yields the same states as the engine, up to float rounding, as lists.
+    Yielded lists are never modified.
+    """
+    values = [float(value) for value in values]
+    factors = [1 + float(rate) for rate in growth]
+    liquid = [i for i, flag in enumerate(is_liquid) if flag]
+    illiquid = [i for i, flag in enumerate(is_liquid) if not flag]
+    income = float(annual_income)
+    expenses = float(annual_expenses)
+    inflation = float(inflation_rate)
+
+    for year in range(start_year, years_to_project):
+        yield values
+
+        values = list(map(operator.mul, values, factors))
+        total_liquid = sum([values[i] for i in liquid])
+        inverse_total = 1.0 / total_liquid if total_liquid > 0 else 0.0
+
+        if year < working_years:
+            # Working years: distribute savings or deficit across liquid assets
+            net_change = income - expenses
+            if total_liquid > 0:
+                for i in liquid:
+                    values[i] += values[i] * inverse_total * net_change
+                    if net_change < 0:
+                        values[i] = max(values[i], 0.0)
+            elif net_change > 0 and liquid:
+                values[liquid[0]] += net_change
+        elif total_liquid >= expenses:
+            # Retirement: draw expenses from liquid assets...
+            for i in liquid:
+                values[i] -= values[i] * inverse_total * expenses
+        else:
+            # ...and once they run out, sell illiquid ones, smallest first
+            remaining = expenses - total_liquid
+            for i in liquid:
+                values[i] = 0.0
+            for i in sorted(illiquid, key=values.__getitem__):
+                sold = min(max(remaining, 0.0), values[i])
+                values[i] -= sold
+                remaining -= sold
+
+        # Apply inflation to expenses
+        expenses *= 1 + inflation
+
+    yield values
+
+
+def _single_path_states(
+    values: np.ndarray,
+    growth: np.ndarray,
+    is_liquid: np.ndarray,
+    annual_income: float,
+    annual_expenses: float,
+    inflation_rate: float,
+    years_to_project: int,
+    working_years: int,
+    start_year: int = 0,
+) -> list[list[float]]:
+    """States of one deterministic path from ``start_year``, as lists.
+
+    Small breakdowns take the plain Python loop; wider ones the engine.
+    """
+    arguments = (
+        annual_income,
+        annual_expenses,
+        inflation_rate,
+        years_to_project,
+        working_years,
+        start_year,
+    )
+    if len(values) <= SCALAR_CATEGORY_LIMIT:
+        return list(_iter_single_path(values.tolist(), growth.tolist(), is_liquid.tolist(), *arguments))
+    return [state[0].tolist() for state in iter_projection(values, growth, is_liquid, *arguments)]
+
+
+def _single_path_series(
+    names: Sequence[str], states: Sequence[Sequence[float]]
+) -> tuple[list[float], dict[str, list[float]]]:
+    """Total and per-category series from one path's yearly states."""
+    projection = [sum(state) for state in states]
+    category_projections = {name: [state[i] for state in states] for i, name in enumerate(names)}
+    return projection, category_projections
+
+
+@timed()
 def calculate_projection(
-    net_worth_breakdown: dict[str, dict[str, Any]],
+    net_worth_breakdown: BreakdownInput,
     annual_income: float,
     annual_expenses: float,
     inflation_rate: float,
     years_to_project: int,
     retirement_age: int,
-    current_age: int
+    current_age: int,
+    tax: TaxProfile | None = None,
+    withdrawal: WithdrawalStrategy | None = None,
 ) -> tuple[list[float], dict[str, list[float]]]:
-    projection = []
-    category_projections = {category: [] for category in net_worth_breakdown.keys()}
-
-    for year in range(years_to_project):
-        current_net_worth = sum(category["value"] for category in net_worth_breakdown.values())
-        projection.append(current_net_worth)
-
-        for category, data in net_worth_breakdown.items():
-            category_projections[category].append(data["value"])
-
-        # Apply growth to all assets
-        for category, data in net_worth_breakdown.items():
-            data["value"] *= (1 + data["growth"])
-
-        # Apply income and expenses
-        if current_age + year < retirement_age:
-            # Working years: add income, subtract expenses
-            net_change = annual_income - annual_expenses
-            # Distribute net change across liquid assets only
-            liquid_assets = {k: v for k, v in net_worth_breakdown.items() if v.get("is_liquid", True)}
-            total_liquid = sum(v["value"] for v in liquid_assets.values())
-            
-            if net_change > 0:
-                # Savings: distribute across liquid assets
-                if total_liquid > 0:
-                    for data in liquid_assets.values():
-                        data["value"] += (data["value"] / total_liquid) * net_change
-                else:
-                    # No liquid assets, create a default cash account
-                    if liquid_assets:
-                        # Add to first liquid asset category
-                        list(liquid_assets.values())[0]["value"] += net_change
-            elif net_change < 0 and total_liquid > 0:
-                # Deficit: reduce liquid assets proportionally
-                for data in liquid_assets.values():
-                    data["value"] += (data["value"] / total_liquid) * net_change
-                    # Ensure we don't go negative
-                    if data["value"] < 0:
-                        data["value"] = 0
-        else:
-            # Retirement: subtract expenses from assets
-            liquid_assets = {k: v for k, v in net_worth_breakdown.items() if v.get("is_liquid", True)}
-            illiquid_assets = {k: v for k, v in net_worth_breakdown.items() if not v.get("is_liquid", True)}
-            total_liquid = sum(v["value"] for v in liquid_assets.values())
-
-            if total_liquid >= annual_expenses:
-                # Enough liquid assets: reduce them proportionally
-                for data in liquid_assets.values():
-                    data["value"] -= (data["value"] / total_liquid) * annual_expenses
-            else:
-                # Not enough liquid assets
-                remaining_expenses = annual_expenses - total_liquid
-                
-                # First, use up all liquid assets
-                for data in liquid_assets.values():
-                    data["value"] = 0
-                
-                # Then, sell illiquid assets if needed
-                if remaining_expenses > 0 and illiquid_assets:
-                    # Sort illiquid assets by value (sell smallest first)
-                    sorted_illiquid = sorted(illiquid_assets.items(), key=lambda x: x[1]["value"])
-                    
-                    for category, data in sorted_illiquid:
-                        if remaining_expenses <= 0:
-                            break
-                        
-                        if data["value"] >= remaining_expenses:
-                            # Convert part of this illiquid asset to liquid
-                            # In reality, this might represent downsizing or partial sale
-                            data["value"] -= remaining_expenses
-                            remaining_expenses = 0
-                        else:
-                            # Sell entire illiquid asset
-                            remaining_expenses -= data["value"]
-                            data["value"] = 0
+    """Project year by year, returning ``years_to_project`` values per series.
 
-        # Apply inflation to expenses
-        annual_expenses *= (1 + inflation_rate)
+    With ``tax`` the engine runs on the earners' take-home pay, state pension
+    and pension contributions instead of the gross ``annual_income``.
+    ``withdrawal`` sets retirement spending in place of the planned expenses.
+    Without either, breakdowns of up to ``SCALAR_CATEGORY_LIMIT`` categories
+    skip NumPy and run a plain Python loop, which is faster for one plan.
+    """
+    names, values, growth, is_liquid = _breakdown_arrays(net_worth_breakdown)
+    years_to_project = max(years_to_project, 0)
+    if tax is None and withdrawal is None:
+        # ``working_years`` for a single plan, without NumPy's per-call overhead
+        working = min(max(retirement_age - current_age, 0), years_to_project)
+        states = _single_path_states(
+            values,
+            growth,
+            is_liquid,
+            annual_income,
+            annual_expenses,
+            inflation_rate,
+            years_to_project,
+            working,
+        )
+        return _single_path_series(names, states[:-1])
+    tax_flows = tax_cash_flows(tax, names, inflation_rate, years_to_project) if tax else None
+    states = [
+        state[0]
+        for state in iter_projection(
+            values,
+            growth,
+            is_liquid,
+            annual_expenses=annual_expenses,
+            inflation_rate=inflation_rate,
+            years_to_project=years_to_project,
+            working_years=working_years(current_age, retirement_age, years_to_project),
+            withdrawal_policy=build_policy(withdrawal, 1),
+            **_income_arguments(annual_income, tax_flows),
+        )
+    ]
+    history = np.array(states[:-1]).reshape(years_to_project, len(names))
+    projection = history.sum(axis=1).tolist()
+    category_projections = {name: history[:, i].tolist() for i, name in enumerate(names)}
+    return projection, category_projections
+
+
+@timed()
+def calculate_projections(
+    net_worth_breakdowns: Sequence[BreakdownInput],
+    annual_income: Any,
+    annual_expenses: Any,
+    inflation_rate: Any,
+    years_to_project: Any,
+    retirement_age: Any,
+    current_age: Any,
+) -> list[tuple[list[float], dict[str, list[float]]]]:
+    """Run many independent projections in one vectorized engine pass.
+
+    Every argument after the breakdowns is a scalar or one value per plan.
+    Each plan is one path of the engine, run to the longest horizon and read
+    back at its own, which is unaffected because paths never interact. The
+    results match ``calculate_projection`` for each plan up to float rounding.
+    """
+    names, values, growth, is_liquid = _pack_breakdowns(net_worth_breakdowns)
+    n_plans = len(names)
+    horizons = np.maximum(np.broadcast_to(np.asarray(years_to_project, dtype=int), (n_plans,)), 0)
+    longest = int(horizons.max(initial=0))
+    states = np.array(
+        list(
+            iter_projection(
+                values,
+                growth,
+                is_liquid,
+                annual_income,
+                annual_expenses,
+                inflation_rate,
+                longest,
+                working_years(current_age, retirement_age, horizons),
+            )
+        )
+    ).reshape(longest + 1, n_plans, values.shape[1])
+
+    results = []
+    for plan, plan_names in enumerate(names):
+        history = states[:horizons[plan], plan, :len(plan_names)]
+        results.append(
+            (
+                history.sum(axis=1).tolist(),
+                {name: history[:, i].tolist() for i, name in enumerate(plan_names)},
+            )
+        )
+    return results
 
-        current_age += 1
 
+@timed()
+def calculate_monthly_projection(
+    net_worth_breakdown: BreakdownInput,
+    annual_income: float,
+    annual_expenses: float,
+    inflation_rate: float,
+    years_to_project: int,
+    retirement_age: int,
+    current_age: int,
+    retirement_month: int = 0,
+    tax: TaxProfile | None = None,
+    withdrawal: WithdrawalStrategy | None = None,
+) -> tuple[list[float], dict[str, list[float]]]:
+    """Project month by month, returning ``years_to_project * 12`` values per series.
+
+    Growth and inflation are converted to their monthly equivalents, income
+    and expenses are paid in twelfths, and ``retirement_month`` lets
+    retirement start part-way through the year. Use ``monthly_to_yearly`` to
+    get series matching ``calculate_projection``'s layout. ``tax`` and
+    ``withdrawal`` work as in ``calculate_projection``.
+    """
+    names, values, growth, is_liquid = _breakdown_arrays(net_worth_breakdown)
+    months = max(years_to_project, 0) * 12
+    tax_flows = tax_cash_flows(tax, names, inflation_rate, months, 12) if tax else None
+    states = [
+        state[0]
+        for state in iter_projection(
+            values,
+            per_step_rate(growth, 12),
+            is_liquid,
+            annual_expenses=annual_expenses / 12,
+            inflation_rate=per_step_rate(inflation_rate, 12),
+            years_to_project=months,
+            working_years=working_steps(current_age, retirement_age, years_to_project, 12, retirement_month),
+            withdrawal_policy=build_policy(withdrawal, 1, 12),
+            **_income_arguments(annual_income, tax_flows, 12),
+        )
+    ]
+    history = np.array(states[:-1]).reshape(months, len(names))
+    projection = history.sum(axis=1).tolist()
+    category_projections = {name: history[:, i].tolist() for i, name in enumerate(names)}
     return projection, category_projections
+
+
+def monthly_to_yearly(
+    projection: list[float], category_projections: dict[str, list[float]]
+) -> tuple[list[float], dict[str, list[float]]]:
+    """Keep the value at the start of each year from monthly series."""
+    return projection[::12], {
+        category: values[::12] for category, values in category_projections.items()
+    }
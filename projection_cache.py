@@ -0,0 +1,128 @@
+"""Memoized projection results keyed by a canonical hash of their inputs."""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from enum import Enum
+from typing import Any, TypeVar
+
+import numpy as np
+
+from models import NetWorthBreakdown
+
+T = TypeVar("T")
+
+
+def _normalize(value: Any) -> Any:
+    """Convert inputs to plain JSON values that compare equal when the inputs do."""
+    if isinstance(value, NetWorthBreakdown):
+        return _normalize(value.to_dict())
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return _normalize(value.tolist())
+    if isinstance(value, Enum):
+        return _normalize(value.value)
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        # 50000 and 50000.0 come from different widgets but mean the same thing
+        return float(value)
+    return str(value)
+
+
+def canonical_hash(*parts: Any) -> str:
+    """Stable hash of JSON-like inputs, independent of key order and int/float spelling."""
+    payload = json.dumps(_normalize(parts), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ProjectionCache:
+    """Thread-safe LRU cache of projection results with hit/miss counters."""
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: str, compute: Callable[[], T]) -> T:
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_or_compute_many(
+        self, keys: Sequence[str], compute: Callable[[list[str]], list[T]]
+    ) -> list[T]:
+        """Like ``get_or_compute`` for several keys, computing every miss in one call.
+
+        ``compute`` gets the distinct missing keys and returns their values in
+        the same order, so misses can be computed concurrently.
+        """
+        found: dict[str, T] = {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                if key in self._entries:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                else:
+                    self.misses += 1
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+
+        if missing:
+            computed = dict(zip(missing, compute(missing), strict=True))
+            found.update(computed)
+            with self._lock:
+                self._entries.update(computed)
+                for key in computed:
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return [found[key] for key in keys]
+
+    def clear(self) -> None:
+        """Drop all cached entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters, current size and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Global instance
+projection_cache = ProjectionCache()
+
+
+def get_projection_cache() -> ProjectionCache:
+    """Get the global projection cache instance."""
+    return projection_cache
@@ -1,67 +1,79 @@
+import os
+from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
-from projection import calculate_projection
+import market_history
+from backtest import BacktestResult, run_backtest
+from downsampling import lttb_indices
+from export import export_results
+from goal_seek import GoalSeeker, GoalTarget
+from incremental_projection import IncrementalProjector
+from instrumentation import timed
+from models import NetWorthBreakdown, combine_net_worth_breakdowns
+from monte_carlo import MonteCarloResult, run_monte_carlo
+from projection import calculate_monthly_projection, calculate_projection, monthly_to_yearly
+from projection_cache import canonical_hash, get_projection_cache
+from scenario_grid import evaluate_grid
+from uk_tax import Earner, TaxProfile
 from validation import display_validation_errors
+from withdrawal_comparison import compare_withdrawals
+from withdrawals import STRATEGIES, FixedReal, WithdrawalStrategy
 
+# Most points sent per chart series, and per chart across all its series;
+# longer series are downsampled with LTTB
+MAX_CHART_POINTS = 500
+MAX_CHART_TOTAL_POINTS = 8_000
 
-def _combine_net_worth_breakdowns(inputs: dict[str, Any]) -> dict[str, dict[str, Any]]:
-    """Combine user and partner net worth breakdowns."""
-    combined_net_worth_breakdown = {}
-    for category in set(inputs["user_net_worth_breakdown"].keys()) | set(
-        inputs["partner_net_worth_breakdown"].keys()
-    ):
-        combined_value = (
-            inputs["user_net_worth_breakdown"].get(category, {"value": 0})["value"]
-            + inputs["partner_net_worth_breakdown"].get(category, {"value": 0})["value"]
-        )
-        combined_growth = max(
-            inputs["user_net_worth_breakdown"].get(category, {"growth": 0})["growth"],
-            inputs["partner_net_worth_breakdown"].get(category, {"growth": 0})[
-                "growth"
-            ],
-        )
-        # Determine liquidity (if either user or partner has liquid version, it's liquid)
-        user_liquid = inputs["user_net_worth_breakdown"].get(category, {}).get("is_liquid", False)
-        partner_liquid = inputs["partner_net_worth_breakdown"].get(category, {}).get("is_liquid", False)
-        is_liquid = user_liquid or partner_liquid
-
-        combined_net_worth_breakdown[category] = {
-            "value": combined_value,
-            "growth": combined_growth,
-            "is_liquid": is_liquid,
-        }
-    return combined_net_worth_breakdown
+# Charts with more points than this are drawn with WebGL instead of SVG
+WEBGL_POINT_THRESHOLD = 2_000
 
 
+@timed()
 def _create_projection_dataframe(
     projection: list[float],
     category_projections: dict[str, list[float]],
-    age_inputs: dict[str, Any]
+    age_inputs: dict[str, Any],
+    steps_per_year: int = 1,
 ) -> pd.DataFrame:
-    """Create DataFrame for plotting from projection data."""
+    """Create DataFrame for plotting from projection data, one row per step."""
     return pd.DataFrame(
         {
-            "Year": range(age_inputs["current_age"], age_inputs["life_expectancy"] + 1),
+            "Year": age_inputs["current_age"] + np.arange(len(projection)) / steps_per_year,
             "Total Net Worth": projection,
             **{category: values for category, values in category_projections.items()},
         }
     )
 
 
-def _plot_total_net_worth(df: pd.DataFrame, age_inputs: dict[str, Any]) -> None:
-    """Plot total net worth over time."""
-    fig_total = px.line(
-        df,
-        x="Year",
-        y="Total Net Worth",
+def _scatter_type(n_points: int) -> type[go.Scatter] | type[go.Scattergl]:
+    """SVG traces for small charts, WebGL once the chart holds too many points for SVG."""
+    return go.Scattergl if n_points > WEBGL_POINT_THRESHOLD else go.Scatter
+
+
+@timed()
+def _total_net_worth_figure(df: pd.DataFrame, age_inputs: dict[str, Any]) -> go.Figure:
+    """Build the total net worth over time chart."""
+    keep = lttb_indices(df["Year"], df["Total Net Worth"], MAX_CHART_POINTS)
+    scatter = _scatter_type(len(keep))
+    fig_total = go.Figure(
+        scatter(
+            x=df["Year"].iloc[keep].round(2),
+            y=df["Total Net Worth"].iloc[keep].round().astype(int),
+            mode="lines",
+            name="Total Net Worth",
+        )
+    )
+    fig_total.update_layout(
         title="Projected Combined Net Worth Over Lifetime",
+        xaxis_title="Year",
+        yaxis_title="Net Worth (£)",
     )
-    fig_total.update_layout(yaxis_title="Net Worth (£)")
     fig_total.add_vline(
         x=age_inputs["retirement_age"],
         line_dash="dash",
@@ -69,26 +81,362 @@ def _plot_total_net_worth(df: pd.DataFrame, age_inputs: dict[str, Any]) -> None:
         annotation_text="Retirement Age",
         annotation_position="top right",
     )
-    st.plotly_chart(fig_total)
+    return fig_total
 
 
-def _plot_net_worth_breakdown(df: pd.DataFrame, category_projections: dict[str, list[float]]) -> None:
-    """Plot breakdown of net worth over time."""
+@timed()
+def _net_worth_breakdown_figure(
+    df: pd.DataFrame, category_projections: dict[str, list[float]]
+) -> go.Figure:
+    """Build the net worth breakdown over time chart.
+
+    Every category is sampled at the same points, picked by LTTB on the total,
+    so the stacked areas line up. WebGL traces can't use ``stackgroup``, so
+    above the threshold the areas are stacked here and filled to the trace below.
+    """
+    categories = list(category_projections)
+    points = max(min(MAX_CHART_POINTS, MAX_CHART_TOTAL_POINTS // max(len(categories), 1)), 3)
+    keep = lttb_indices(df["Year"], df["Total Net Worth"], points)
+    # Whole pounds and two-decimal years are plenty for a chart and keep the
+    # JSON payload small
+    years = df["Year"].iloc[keep].round(2)
+    values = df[categories].iloc[keep].round().astype(int)
+    scatter = _scatter_type(len(keep) * len(categories))
+
     fig_breakdown = go.Figure()
-    for category in category_projections.keys():
-        fig_breakdown.add_trace(
-            go.Scatter(x=df["Year"], y=df[category], name=category, stackgroup="one")
-        )
+    if scatter is go.Scatter:
+        for category in categories:
+            fig_breakdown.add_trace(
+                go.Scatter(x=years, y=values[category], name=category, stackgroup="one")
+            )
+    else:
+        stacked = values.cumsum(axis=1)
+        for i, category in enumerate(categories):
+            fig_breakdown.add_trace(
+                go.Scattergl(
+                    x=years,
+                    y=stacked[category],
+                    customdata=values[category],
+                    hovertemplate="%{customdata:,.0f}",
+                    name=category,
+                    mode="lines",
+                    fill="tozeroy" if i == 0 else "tonexty",
+                )
+            )
     fig_breakdown.update_layout(
         title="Net Worth Breakdown Over Time", yaxis_title="Net Worth (£)"
     )
-    st.plotly_chart(fig_breakdown)
+    return fig_breakdown
+
+
+@timed()
+def _monte_carlo_bands_figure(
+    result: MonteCarloResult, ages: list[int], age_inputs: dict[str, Any]
+) -> go.Figure:
+    """Build the Monte Carlo percentile bands chart of total net worth."""
+    fig_bands = go.Figure()
+    low, high = min(result.percentiles), max(result.percentiles)
+    inner = sorted(p for p in result.percentiles if p not in (low, high, 50))
+    bands = [(low, high)]
+    if len(inner) >= 2:
+        bands.append((inner[0], inner[-1]))
+
+    for lower, upper in bands:
+        fig_bands.add_trace(
+            go.Scatter(x=ages, y=result.percentiles[upper], line={"width": 0}, showlegend=False)
+        )
+        fig_bands.add_trace(
+            go.Scatter(
+                x=ages,
+                y=result.percentiles[lower],
+                line={"width": 0},
+                fill="tonexty",
+                fillcolor="rgba(31, 119, 180, 0.2)",
+                name=f"{lower}th–{upper}th percentile",
+            )
+        )
+    if 50 in result.percentiles:
+        fig_bands.add_trace(go.Scatter(x=ages, y=result.median, name="Median"))
+
+    fig_bands.update_layout(
+        title=f"Monte Carlo Net Worth Range ({result.n_paths:,} simulations)",
+        xaxis_title="Year",
+        yaxis_title="Net Worth (£)",
+    )
+    fig_bands.add_vline(
+        x=age_inputs["retirement_age"],
+        line_dash="dash",
+        line_color="red",
+        annotation_text="Retirement Age",
+        annotation_position="top right",
+    )
+    return fig_bands
+
+
+def _display_monte_carlo(
+    combined_net_worth_breakdown: NetWorthBreakdown,
+    total_annual_income: float,
+    total_annual_expenses: float,
+    inputs: dict[str, Any],
+    age_inputs: dict[str, Any],
+    inputs_key: str,
+    monthly: bool,
+    tax: TaxProfile | None,
+    withdrawal: WithdrawalStrategy | None,
+) -> MonteCarloResult:
+    """Display Monte Carlo percentile bands and the probability of not running out of money."""
+    st.header("Monte Carlo Simulation")
+    col1, col2 = st.columns(2)
+    with col1:
+        volatility = st.slider(
+            "Annual Return Volatility (%)", min_value=0.0, max_value=30.0, value=10.0, step=0.5
+        )
+    with col2:
+        n_paths = st.selectbox("Simulations", [1_000, 10_000, 100_000, 1_000_000], index=1)
+
+    def simulate() -> tuple[MonteCarloResult, go.Figure]:
+        result = run_monte_carlo(
+            combined_net_worth_breakdown,
+            total_annual_income,
+            total_annual_expenses,
+            inputs["inflation_rate"],
+            age_inputs["life_expectancy"] - age_inputs["current_age"],
+            age_inputs["retirement_age"],
+            age_inputs["current_age"],
+            volatility=volatility / 100,
+            n_paths=n_paths,
+            seed=0,
+            workers=os.cpu_count() or 1,
+            steps_per_year=12 if monthly else 1,
+            tax=tax,
+            withdrawal=withdrawal,
+        )
+        ages = list(range(age_inputs["current_age"], age_inputs["life_expectancy"] + 1))
+        return result, _monte_carlo_bands_figure(result, ages, age_inputs)
+
+    result, fig_bands = get_projection_cache().get_or_compute(
+        f"monte_carlo:{inputs_key}:{volatility}:{n_paths}:{monthly}:{canonical_hash(tax, withdrawal)}",
+        simulate,
+    )
+    st.plotly_chart(fig_bands)
+    st.metric(
+        "Probability of Not Running Out of Money", f"{result.success_probability * 100:.1f}%"
+    )
+    return result
+
+
+@timed()
+def _backtest_figure(
+    result: BacktestResult, projection: list[float], ages: list[int], age_inputs: dict[str, Any]
+) -> go.Figure:
+    """Chart the worst, median and best historical windows against the projection."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=ages, y=projection, name="Projection", line={"dash": "dash"}))
+    for label, index in (("Worst", result.worst), ("Median", result.median), ("Best", result.best)):
+        fig.add_trace(
+            go.Scatter(
+                x=ages, y=result.totals[index], name=f"{label} (from {result.start_years[index]})"
+            )
+        )
+    fig.update_layout(
+        title=f"Historical Backtest ({len(result.start_years)} start years)",
+        xaxis_title="Year",
+        yaxis_title="Net Worth (£)",
+    )
+    fig.add_vline(
+        x=age_inputs["retirement_age"],
+        line_dash="dash",
+        line_color="red",
+        annotation_text="Retirement Age",
+        annotation_position="top right",
+    )
+    return fig
+
+
+def _display_backtest(
+    combined_net_worth_breakdown: NetWorthBreakdown,
+    total_annual_income: float,
+    total_annual_expenses: float,
+    projection: list[float],
+    age_inputs: dict[str, Any],
+    inputs_key: str,
+    withdrawal: WithdrawalStrategy | None,
+) -> None:
+    """Display how the plan would have fared starting in every year of market history."""
+    st.header("Historical Backtest")
+    col1, col2 = st.columns(2)
+    with col1:
+        equity = st.slider(
+            "Equity Allocation (%)", min_value=0, max_value=100, value=60, step=5,
+            help="The rest is held in gilts",
+        )
+    with col2:
+        cash_categories = st.multiselect(
+            "Categories Held as Cash", list(combined_net_worth_breakdown.names)
+        )
+
+    def backtest() -> tuple[BacktestResult, go.Figure]:
+        result = run_backtest(
+            combined_net_worth_breakdown,
+            total_annual_income,
+            total_annual_expenses,
+            age_inputs["life_expectancy"] - age_inputs["current_age"],
+            age_inputs["retirement_age"],
+            age_inputs["current_age"],
+            allocation={"equity": equity / 100, "gilts": 1 - equity / 100},
+            category_allocations={name: {"cash": 1.0} for name in cash_categories},
+            withdrawal=withdrawal,
+        )
+        ages = list(range(age_inputs["current_age"], age_inputs["life_expectancy"] + 1))
+        return result, _backtest_figure(result, projection, ages, age_inputs)
+
+    result, fig = get_projection_cache().get_or_compute(
+        f"backtest:{inputs_key}:{equity}:{canonical_hash(cash_categories, projection, withdrawal)}", backtest
+    )
+    st.plotly_chart(fig)
+
+    col1, col2, col3, col4 = st.columns(4)
+    for column, label, index in (
+        (col1, "Worst", result.worst),
+        (col2, "Median", result.median),
+        (col3, "Best", result.best),
+    ):
+        with column:
+            st.metric(
+                f"{label} Final Net Worth (from {result.start_years[index]})",
+                f"£{result.totals[index, -1]:,.0f}",
+            )
+    with col4:
+        st.metric("Start Years Never Running Out", f"{result.success_rate * 100:.1f}%")
+    st.caption(
+        f"Replays the plan from every start year in approximate UK equity, gilt, cash and "
+        f"inflation figures for {market_history.YEARS[0]}–{market_history.YEARS[-1]}, "
+        f"in place of each category's assumed growth and the inflation rate. "
+        f"{int(result.wrapped.sum())} start years run past {market_history.YEARS[-1]} "
+        f"and continue from {market_history.YEARS[0]}. Amounts are nominal."
+    )
+
+
+def _display_withdrawal_comparison(
+    combined_net_worth_breakdown: NetWorthBreakdown,
+    total_annual_income: float,
+    total_annual_expenses: float,
+    inputs: dict[str, Any],
+    age_inputs: dict[str, Any],
+    inputs_key: str,
+) -> None:
+    """Display every withdrawal strategy's outcomes across the same paths."""
+    st.header("Withdrawal Strategies")
+    paths = st.radio(
+        "Compare Across", ["Monte Carlo (10,000 paths)", "Historical start years"], horizontal=True
+    )
+    historical = paths == "Historical start years"
+
+    outcomes = get_projection_cache().get_or_compute(
+        f"withdrawals:{inputs_key}:{historical}",
+        lambda: compare_withdrawals(
+            STRATEGIES.values(),
+            combined_net_worth_breakdown,
+            total_annual_income,
+            total_annual_expenses,
+            inputs["inflation_rate"],
+            age_inputs["life_expectancy"] - age_inputs["current_age"],
+            age_inputs["retirement_age"],
+            age_inputs["current_age"],
+            historical=historical,
+        ),
+    )
+    st.table(
+        pd.DataFrame(
+            [
+                {
+                    "Strategy": outcome.label,
+                    "Never Ran Out": f"{outcome.success_rate * 100:.1f}%",
+                    "Median Final Net Worth": f"£{outcome.median_final_net_worth:,.0f}",
+                    "Median Spending": f"{outcome.median_spending * 100:.0f}% of plan",
+                    "Leanest Year (5th Percentile)": f"{outcome.low_spending * 100:.0f}% of plan",
+                }
+                for outcome in outcomes
+            ]
+        )
+    )
+    st.caption(
+        "Spending is shown as a share of planned, inflation-adjusted expenses. "
+        "Monte Carlo paths use 10% volatility; historical start years use a 60/40 "
+        "equity/gilt mix."
+    )
+
+
+def _display_scenario_heatmap(
+    combined_net_worth_breakdown: NetWorthBreakdown,
+    total_annual_income: float,
+    total_annual_expenses: float,
+    inputs: dict[str, Any],
+    age_inputs: dict[str, Any],
+    inputs_key: str,
+) -> None:
+    """Display a heatmap of net worth at retirement across retirement ages and expenses."""
+    st.header("Retirement Age vs Expenses")
+    fig_heatmap = get_projection_cache().get_or_compute(
+        f"heatmap:{inputs_key}",
+        lambda: _scenario_heatmap_figure(
+            combined_net_worth_breakdown,
+            total_annual_income,
+            total_annual_expenses,
+            inputs,
+            age_inputs,
+        ),
+    )
+    st.plotly_chart(fig_heatmap)
+
+
+@timed()
+def _scenario_heatmap_figure(
+    combined_net_worth_breakdown: NetWorthBreakdown,
+    total_annual_income: float,
+    total_annual_expenses: float,
+    inputs: dict[str, Any],
+    age_inputs: dict[str, Any],
+) -> go.Figure:
+    """Build the heatmap of net worth at retirement from a batch scenario grid."""
+    retirement_ages = list(
+        range(
+            max(age_inputs["current_age"] + 1, age_inputs["retirement_age"] - 10),
+            min(age_inputs["life_expectancy"], age_inputs["retirement_age"] + 6),
+        )
+    )
+    expense_levels = sorted(
+        {round(total_annual_expenses * factor, -3) for factor in np.linspace(0.5, 1.5, 11)}
+    )
+
+    grid = evaluate_grid(
+        combined_net_worth_breakdown,
+        total_annual_income,
+        total_annual_expenses,
+        inputs["inflation_rate"],
+        age_inputs["retirement_age"],
+        age_inputs["current_age"],
+        age_inputs["life_expectancy"],
+        {"retirement_age": retirement_ages, "annual_expenses": expense_levels},
+    )
+    heatmap = grid["retirement_net_worth"].unstack("annual_expenses")
+
+    fig_heatmap = px.imshow(
+        heatmap,
+        labels={"x": "Annual Expenses (£)", "y": "Retirement Age", "color": "Net Worth (£)"},
+        title="Net Worth at Retirement",
+        aspect="auto",
+        origin="lower",
+    )
+    return fig_heatmap
 
 
 def _display_key_metrics(
     projection: list[float],
+    inputs: dict[str, Any],
     age_inputs: dict[str, Any],
-    total_annual_expenses: float
+    total_annual_expenses: float,
+    strategy: WithdrawalStrategy,
 ) -> None:
     """Display key retirement metrics."""
     retirement_net_worth = projection[
@@ -102,9 +450,13 @@ def _display_key_metrics(
         st.metric("Net Worth at Retirement", f"£{retirement_net_worth:,.0f}")
         st.metric("Final Net Worth", f"£{final_net_worth:,.0f}")
     with col2:
-        annual_retirement_income = retirement_net_worth * 0.04  # Using the 4% rule
+        years_to_retirement = age_inputs["retirement_age"] - age_inputs["current_age"]
+        retirement_expenses = total_annual_expenses * (1 + inputs["inflation_rate"]) ** years_to_retirement
+        annual_retirement_income = strategy.first_year_spending(
+            retirement_net_worth, retirement_expenses
+        )
         st.metric(
-            "Estimated Annual Retirement Income (4% Rule)",
+            f"Estimated Annual Retirement Income ({strategy.label})",
             f"£{annual_retirement_income:,.0f}",
         )
         years_of_expenses = final_net_worth / total_annual_expenses if total_annual_expenses > 0 else 0
@@ -114,7 +466,7 @@ def _display_key_metrics(
 def _display_current_figures(
     total_annual_income: float,
     total_annual_expenses: float,
-    combined_net_worth_breakdown: dict[str, dict[str, Any]]
+    combined_net_worth_breakdown: NetWorthBreakdown
 ) -> None:
     """Display current combined financial figures."""
     st.header("Current Combined Figures")
@@ -123,9 +475,7 @@ def _display_current_figures(
         st.metric("Total Annual Income", f"£{total_annual_income:,.0f}")
         st.metric("Total Annual Expenses", f"£{total_annual_expenses:,.0f}")
     with col2:
-        total_net_worth = sum(
-            data["value"] for data in combined_net_worth_breakdown.values()
-        )
+        total_net_worth = combined_net_worth_breakdown.total_value
         st.metric("Total Current Net Worth", f"£{total_net_worth:,.0f}")
         savings_rate = (
             (total_annual_income - total_annual_expenses) / total_annual_income * 100
@@ -134,19 +484,21 @@ def _display_current_figures(
         st.metric("Savings Rate", f"{savings_rate:.1f}%")
 
 
-def _display_net_worth_breakdown(combined_net_worth_breakdown: dict[str, dict[str, Any]]) -> None:
+def _display_net_worth_breakdown(combined_net_worth_breakdown: NetWorthBreakdown) -> None:
     """Display current net worth breakdown table."""
     st.header("Current Net Worth Breakdown")
     breakdown_df = pd.DataFrame(
         [
             {
-                "Category": category,
-                "Value": data["value"],
-                "Growth Rate": f"{data['growth']*100:.1f}%",
-                "Liquidity": "Liquid" if data.get("is_liquid", False) else "Non-liquid"
+                "Category": category.name,
+                "Value": category.value,
+                "Growth Rate": f"{category.growth*100:.1f}%",
+                "Liquidity": "Liquid" if category.is_liquid else "Non-liquid"
             }
-            for category, data in combined_net_worth_breakdown.items()
-        ]
+            for category in combined_net_worth_breakdown
+        ],
+        # Keep the columns when there are no categories yet, so sorting works
+        columns=["Category", "Value", "Growth Rate", "Liquidity"],
     )
     breakdown_df = breakdown_df.sort_values("Value", ascending=False)
     st.table(breakdown_df)
@@ -175,6 +527,188 @@ def _display_retirement_assessment(
         )
 
 
+def _display_goal_seek(
+    combined_net_worth_breakdown: NetWorthBreakdown,
+    total_annual_income: float,
+    total_annual_expenses: float,
+    inputs: dict[str, Any],
+    age_inputs: dict[str, Any],
+    inputs_key: str,
+) -> None:
+    """Display the earliest retirement age, minimum saving and maximum spending that meet a target."""
+    st.header("What Would It Take?")
+    use_monte_carlo = st.checkbox("Require 90% Monte Carlo success instead of never running out")
+    target = GoalTarget(success_probability=0.9, n_paths=2_000) if use_monte_carlo else GoalTarget()
+
+    def solve() -> tuple[float | None, float | None, float | None]:
+        seeker = GoalSeeker(
+            combined_net_worth_breakdown,
+            total_annual_income,
+            total_annual_expenses,
+            inputs["inflation_rate"],
+            age_inputs["retirement_age"],
+            age_inputs["current_age"],
+            age_inputs["life_expectancy"],
+            target,
+        )
+        return (
+            seeker.earliest_retirement_age().value,
+            seeker.minimum_annual_savings().value,
+            seeker.maximum_annual_expenses().value,
+        )
+
+    retirement_age, savings, expenses = get_projection_cache().get_or_compute(
+        f"goal_seek:{inputs_key}:{use_monte_carlo}", solve
+    )
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(
+            "Earliest Safe Retirement Age",
+            f"{retirement_age}" if retirement_age is not None else "Not reachable",
+        )
+    with col2:
+        st.metric(
+            "Minimum Annual Saving",
+            f"£{savings:,.0f}" if savings is not None else "Not reachable",
+        )
+    with col3:
+        st.metric(
+            "Maximum Sustainable Spending",
+            f"£{expenses:,.0f}" if expenses is not None else "Not reachable",
+        )
+
+
+def _display_export(
+    view: "_ProjectionView",
+    monte_carlo: MonteCarloResult,
+    age_inputs: dict[str, Any],
+    projection_key: str,
+) -> None:
+    """Offer the projection and Monte Carlo bands as a Parquet download.
+
+    The encoded file is cached under the projection's cache key, so reruns
+    don't rebuild it.
+    """
+    st.header("Export")
+    household_id = st.session_state.get("user_id") or "current"
+    data = get_projection_cache().get_or_compute(
+        f"export:{projection_key}:{household_id}:{canonical_hash(monte_carlo.percentiles)}",
+        lambda: export_results(
+            household_id,
+            age_inputs["current_age"],
+            view.projection,
+            view.category_projections,
+            monte_carlo,
+        ),
+    )
+    st.download_button(
+        "Download projections (Parquet)",
+        data,
+        file_name="projections.parquet",
+        mime="application/vnd.apache.parquet",
+    )
+    st.caption(
+        "One row per year and series: household_id, year_offset (years from today), age, "
+        "category, value."
+    )
+
+
+def _incremental_projector() -> IncrementalProjector:
+    """Per-session projector, so moving an age slider only recomputes the affected years."""
+    if "incremental_projector" not in st.session_state:
+        st.session_state.incremental_projector = IncrementalProjector()
+    return st.session_state.incremental_projector
+
+
+@dataclass
+class _ProjectionView:
+    """Deterministic projection and charts for one set of inputs."""
+    combined_net_worth_breakdown: NetWorthBreakdown
+    projection: list[float]
+    category_projections: dict[str, list[float]]
+    fig_total: go.Figure
+    fig_breakdown: go.Figure
+
+
+def _build_projection_view(
+    inputs: dict[str, Any],
+    age_inputs: dict[str, Any],
+    total_annual_income: float,
+    total_annual_expenses: float,
+    monthly: bool,
+    tax: TaxProfile | None = None,
+    withdrawal: WithdrawalStrategy | None = None,
+) -> _ProjectionView:
+    """Combine the breakdowns, run the projection and build its charts."""
+    combined_net_worth_breakdown = combine_net_worth_breakdowns(inputs)
+    years_to_project = age_inputs["life_expectancy"] - age_inputs["current_age"]
+    projection_args = (
+        combined_net_worth_breakdown,
+        total_annual_income,
+        total_annual_expenses,
+        inputs["inflation_rate"],
+        years_to_project + 1,  # include the life expectancy year itself
+        age_inputs["retirement_age"],
+        age_inputs["current_age"],
+    )
+
+    if monthly:
+        # Chart every month, but report metrics from the start of each year
+        monthly_series = calculate_monthly_projection(
+            *projection_args, tax=tax, withdrawal=withdrawal
+        )
+        projection, category_projections = monthly_to_yearly(*monthly_series)
+        df = _create_projection_dataframe(*monthly_series, age_inputs, steps_per_year=12)
+    elif tax or withdrawal:
+        projection, category_projections = calculate_projection(
+            *projection_args, tax=tax, withdrawal=withdrawal
+        )
+        df = _create_projection_dataframe(projection, category_projections, age_inputs)
+    else:
+        projection, category_projections = _incremental_projector().project(*projection_args)
+        df = _create_projection_dataframe(projection, category_projections, age_inputs)
+    return _ProjectionView(
+        combined_net_worth_breakdown=combined_net_worth_breakdown,
+        projection=projection,
+        category_projections=category_projections,
+        fig_total=_total_net_worth_figure(df, age_inputs),
+        fig_breakdown=_net_worth_breakdown_figure(df, category_projections),
+    )
+
+
+def _tax_profile_controls(inputs: dict[str, Any], age_inputs: dict[str, Any]) -> TaxProfile | None:
+    """Optional after-tax projection settings; None keeps projections on gross income."""
+    if not st.checkbox("Apply UK income tax, National Insurance and state pension", value=False):
+        return None
+
+    categories = list(
+        dict.fromkeys([*inputs["user_net_worth_breakdown"], *inputs["partner_net_worth_breakdown"]])
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        pension_category = st.selectbox("Pension Pot", ["None", *categories])
+    with col2:
+        contribution = st.number_input(
+            "Salary Sacrifice into Pension (%)", min_value=0.0, max_value=100.0, value=5.0, step=0.5
+        )
+    st.caption(
+        "2024/25 rates for England, Wales and Northern Ireland. "
+        "The scenario grid, goal seek and historical backtest still use gross income."
+    )
+
+    # Tax each salary separately, counting the same incomes as the gross total
+    earners = [Earner(inputs["user_annual_income"], age_inputs["current_age"])]
+    if inputs["partner_annual_income"]:
+        partner_age = age_inputs.get("partner_current_age", age_inputs["current_age"])
+        earners.append(Earner(inputs["partner_annual_income"], partner_age))
+    return TaxProfile(
+        earners=tuple(earners),
+        pension_contribution_rate=contribution / 100,
+        pension_category=None if pension_category == "None" else pension_category,
+    )
+
+
 def show_results_page() -> None:
     """Main function to display the results page."""
     st.title("UK Financial Planning Tool - Results")
@@ -187,32 +721,79 @@ def show_results_page() -> None:
     inputs = st.session_state.user_inputs
     age_inputs = st.session_state.age_inputs
 
-    # Combine user and partner data
-    combined_net_worth_breakdown = _combine_net_worth_breakdowns(inputs)
     total_annual_income = inputs["user_annual_income"] + inputs["partner_annual_income"]
     total_annual_expenses = (
         inputs["user_annual_expenses"] + inputs["partner_annual_expenses"]
     )
-    years_to_project = age_inputs["life_expectancy"] - age_inputs["current_age"]
 
-    # Calculate projection
-    projection, category_projections = calculate_projection(
+    monthly = st.checkbox("Model monthly cash flows", value=False)
+    tax = _tax_profile_controls(inputs, age_inputs)
+    strategy = STRATEGIES[st.selectbox("Retirement Withdrawal Strategy", list(STRATEGIES))]
+    # Spending the planned expenses is what the engine does without a strategy
+    withdrawal = None if strategy == FixedReal() else strategy
+    settings_key = canonical_hash(tax, withdrawal)
+
+    # Reruns with unchanged inputs (e.g. sidebar clicks) reuse the cached projection
+    inputs_key = canonical_hash(inputs, age_inputs)
+    projection_key = f"projection:{inputs_key}:{monthly}:{settings_key}"
+    view = get_projection_cache().get_or_compute(
+        projection_key,
+        lambda: _build_projection_view(
+            inputs, age_inputs, total_annual_income, total_annual_expenses, monthly, tax, withdrawal
+        ),
+    )
+    combined_net_worth_breakdown = view.combined_net_worth_breakdown
+    projection = view.projection
+
+    # Display all components
+    st.plotly_chart(view.fig_total)
+    st.plotly_chart(view.fig_breakdown)
+    _display_backtest(
         combined_net_worth_breakdown,
         total_annual_income,
         total_annual_expenses,
-        inputs["inflation_rate"],
-        years_to_project,
-        age_inputs["retirement_age"],
-        age_inputs["current_age"],
+        projection,
+        age_inputs,
+        inputs_key,
+        withdrawal,
     )
-
-    # Create DataFrame and display results
-    df = _create_projection_dataframe(projection, category_projections, age_inputs)
-
-    # Display all components
-    _plot_total_net_worth(df, age_inputs)
-    _plot_net_worth_breakdown(df, category_projections)
-    _display_key_metrics(projection, age_inputs, total_annual_expenses)
+    monte_carlo = _display_monte_carlo(
+        combined_net_worth_breakdown,
+        total_annual_income,
+        total_annual_expenses,
+        inputs,
+        age_inputs,
+        inputs_key,
+        monthly,
+        tax,
+        withdrawal,
+    )
+    _display_withdrawal_comparison(
+        combined_net_worth_breakdown,
+        total_annual_income,
+        total_annual_expenses,
+        inputs,
+        age_inputs,
+        inputs_key,
+    )
+    _display_scenario_heatmap(
+        combined_net_worth_breakdown,
+        total_annual_income,
+        total_annual_expenses,
+        inputs,
+        age_inputs,
+        inputs_key,
+    )
+    _display_key_metrics(projection, inputs, age_inputs, total_annual_expenses, strategy)
     _display_current_figures(total_annual_income, total_annual_expenses, combined_net_worth_breakdown)
     _display_net_worth_breakdown(combined_net_worth_breakdown)
     _display_retirement_assessment(projection, age_inputs, total_annual_expenses)
+    _display_goal_seek(
+        combined_net_worth_breakdown,
+        total_annual_income,
+        total_annual_expenses,
+        inputs,
+        age_inputs,
+        inputs_key,
+    )
+    _display_export(view, monte_carlo, age_inputs, projection_key)
@@ -0,0 +1,100 @@
+"""Project several saved scenarios side by side."""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from instrumentation import timed
+from models import combine_net_worth_breakdowns
+from monte_carlo import run_monte_carlo
+from projection import calculate_projection
+from projection_cache import canonical_hash, get_projection_cache
+
+# Monte Carlo settings for the comparison, matching the Results page defaults
+COMPARISON_VOLATILITY = 0.1
+COMPARISON_PATHS = 10_000
+
+
+@dataclass
+class ScenarioSummary:
+    """Net worth curve and key metrics for one scenario."""
+    ages: list[int]
+    projection: list[float]
+    retirement_age: int
+    net_worth_at_retirement: float
+    final_net_worth: float
+    success_probability: float
+
+
+def scenario_key(scenario_data: dict[str, Any]) -> str:
+    """Content hash of what a scenario's projection depends on.
+
+    The same hash the Results page keys its cached projections by, so the
+    save timestamp and account objects don't count.
+    """
+    return canonical_hash(scenario_data["user_inputs"], scenario_data["age_inputs"])
+
+
+def summarize_scenario(user_inputs: dict[str, Any], age_inputs: dict[str, Any]) -> ScenarioSummary:
+    """Project one scenario as the Results page does and run its Monte Carlo simulation."""
+    breakdown = combine_net_worth_breakdowns(user_inputs)
+    income = user_inputs["user_annual_income"] + user_inputs["partner_annual_income"]
+    expenses = user_inputs["user_annual_expenses"] + user_inputs["partner_annual_expenses"]
+    current_age = age_inputs["current_age"]
+    retirement_age = age_inputs["retirement_age"]
+    years_to_project = age_inputs["life_expectancy"] - current_age
+
+    projection, _ = calculate_projection(
+        breakdown,
+        income,
+        expenses,
+        user_inputs["inflation_rate"],
+        years_to_project + 1,  # include the life expectancy year itself
+        retirement_age,
+        current_age,
+    )
+    monte_carlo = run_monte_carlo(
+        breakdown,
+        income,
+        expenses,
+        user_inputs["inflation_rate"],
+        years_to_project,
+        retirement_age,
+        current_age,
+        volatility=COMPARISON_VOLATILITY,
+        n_paths=COMPARISON_PATHS,
+        seed=0,
+    )
+    return ScenarioSummary(
+        ages=list(range(current_age, current_age + len(projection))),
+        projection=projection,
+        retirement_age=retirement_age,
+        net_worth_at_retirement=projection[retirement_age - current_age],
+        final_net_worth=projection[-1],
+        success_probability=monte_carlo.success_probability,
+    )
+
+
+@timed()
+def compare_scenarios(
+    scenarios: dict[str, dict[str, Any]], workers: int = 1
+) -> dict[str, ScenarioSummary]:
+    """Summaries of saved scenarios, keyed by name.
+
+    Summaries are cached by ``scenario_key``, so scenarios already compared
+    (or identical in content to one that was) are never recomputed. The
+    rest run at once, on a process pool of up to ``workers`` processes.
+    """
+    keys = {name: f"scenario_summary:{scenario_key(data)}" for name, data in scenarios.items()}
+    data_by_key = {keys[name]: data for name, data in scenarios.items()}
+
+    def compute(missing: list[str]) -> list[ScenarioSummary]:
+        user_inputs = [data_by_key[key]["user_inputs"] for key in missing]
+        age_inputs = [data_by_key[key]["age_inputs"] for key in missing]
+        if workers > 1 and len(missing) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(missing))) as pool:
+                return list(pool.map(summarize_scenario, user_inputs, age_inputs))
+        return list(map(summarize_scenario, user_inputs, age_inputs))
+
+    summaries = get_projection_cache().get_or_compute_many(list(keys.values()), compute)
+    return dict(zip(keys, summaries, strict=True))
@@ -0,0 +1,96 @@
+"""Evaluate grids of projection parameters in a single engine pass."""
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from projection import (
+    BreakdownInput,
+    _breakdown_arrays,
+    _row_totals,
+    iter_projection,
+    working_years,
+)
+
+# Parameters that can be swept, with ``return_adjustment`` added to every growth rate
+GRID_AXES = (
+    "retirement_age",
+    "annual_income",
+    "annual_expenses",
+    "inflation_rate",
+    "return_adjustment",
+)
+
+
+def evaluate_grid(
+    net_worth_breakdown: BreakdownInput,
+    annual_income: float,
+    annual_expenses: float,
+    inflation_rate: float,
+    retirement_age: int,
+    current_age: int,
+    life_expectancy: int,
+    axes: dict[str, Sequence[float]],
+) -> pd.DataFrame:
+    """Project every combination of the given parameter axes at once.
+
+    ``axes`` maps names from ``GRID_AXES`` to the values to sweep; parameters
+    without an axis keep the value passed in. Each grid point becomes one path
+    of the vectorized engine. Returns a DataFrame indexed by the axes (a
+    ``MultiIndex`` in axis order) with the net worth at retirement, the final
+    net worth and whether the plan runs out of money. The breakdown is not
+    modified.
+    """
+    unknown = set(axes) - set(GRID_AXES)
+    if unknown:
+        raise ValueError(f"Unknown grid axes: {', '.join(sorted(unknown))}")
+
+    _, values, growth, is_liquid = _breakdown_arrays(net_worth_breakdown)
+    years_to_project = max(life_expectancy - current_age, 0)
+
+    parameters = {
+        "retirement_age": retirement_age,
+        "annual_income": annual_income,
+        "annual_expenses": annual_expenses,
+        "inflation_rate": inflation_rate,
+        "return_adjustment": 0.0,
+    }
+    mesh = np.meshgrid(*(np.asarray(points) for points in axes.values()), indexing="ij")
+    parameters.update({name: points.ravel() for name, points in zip(axes, mesh, strict=True)})
+    n_points = mesh[0].size if mesh else 1
+
+    retirement_ages = np.broadcast_to(parameters["retirement_age"], (n_points,))
+    working = working_years(current_age, retirement_ages, years_to_project)
+    adjustment = np.broadcast_to(parameters["return_adjustment"], (n_points,))
+
+    totals = np.empty((n_points, years_to_project + 1))
+    states = iter_projection(
+        np.broadcast_to(values, (n_points, len(values))),
+        growth + adjustment[:, None],
+        is_liquid,
+        parameters["annual_income"],
+        parameters["annual_expenses"],
+        parameters["inflation_rate"],
+        years_to_project,
+        working,
+    )
+    ones = np.ones(len(values))
+    for year, state in enumerate(states):
+        totals[:, year] = _row_totals(state, ones)
+
+    # Net worth at retirement is the value on the first year of the retirement phase
+    working = np.asarray(working, dtype=int)
+    after_retirement = np.arange(years_to_project + 1) > working[:, None]
+    results = pd.DataFrame(
+        {
+            "retirement_net_worth": totals[np.arange(n_points), working],
+            "final_net_worth": totals[:, -1],
+            "runs_out": ((totals <= 0) & after_retirement).any(axis=1),
+        }
+    )
+    if axes:
+        results.index = pd.MultiIndex.from_product(
+            [list(points) for points in axes.values()], names=list(axes)
+        )
+    return results
@@ -8,6 +8,9 @@ import streamlit as st
 from auth import get_current_user
 from database import get_db_manager
 
+# Scenario that dirty session state is autosaved to; reserved, so users can't save over it
+AUTOSAVE_SCENARIO_NAME = "Autosave"
+
 
 def get_session_state_data() -> dict[str, Any]:
     """Extract all relevant session state data for saving."""
@@ -69,6 +72,38 @@ def load_session_state_data(data: dict[str, Any]) -> None:
         ]
 
 
+def autosave_session_state() -> None:
+    """Queue a debounced autosave when the inputs changed during this run."""
+    user = get_current_user()
+    if not user:
+        return
+
+    from projection_cache import canonical_hash
+
+    data = get_session_state_data()
+    fingerprint = canonical_hash({key: value for key, value in data.items() if key != "saved_at"})
+    previous = st.session_state.get("autosave_fingerprint")
+    st.session_state.autosave_fingerprint = fingerprint
+    # The first run only records what was loaded; there is nothing unsaved yet
+    if previous is not None and previous != fingerprint:
+        get_db_manager().autosave(user["user_id"], AUTOSAVE_SCENARIO_NAME, data)
+
+
+def show_save_status() -> None:
+    """Report background saves that finished since the last rerun."""
+    user = get_current_user()
+    if not user:
+        return
+
+    for outcome in get_db_manager().writer.pop_outcomes(user["user_id"]):
+        if outcome.succeeded and outcome.scenario_name == AUTOSAVE_SCENARIO_NAME:
+            st.toast("Autosaved your changes", icon="💾")
+        elif outcome.succeeded:
+            st.toast(f"Scenario '{outcome.scenario_name}' saved!", icon="✅")
+        else:
+            st.error(f"Failed to save scenario '{outcome.scenario_name}': {outcome.error}")
+
+
 def show_scenario_manager() -> None:
     """Show the scenario management interface."""
     user = get_current_user()
@@ -88,14 +123,12 @@ def show_scenario_manager() -> None:
 
     with col2:
         if st.button("Save Current Scenario", type="primary"):
-            if scenario_name:
+            if scenario_name.strip().casefold() == AUTOSAVE_SCENARIO_NAME.casefold():
+                st.error(f"'{AUTOSAVE_SCENARIO_NAME}' is reserved for autosaves, please choose another name")
+            elif scenario_name:
                 scenario_data = get_session_state_data()
-                success = db.save_user_scenario(user["user_id"], scenario_name, scenario_data)
-                if success:
-                    st.success(f"✅ Scenario '{scenario_name}' saved!")
-                    st.rerun()
-                else:
-                    st.error("Failed to save scenario")
+                db.save_in_background(user["user_id"], scenario_name, scenario_data)
+                st.info(f"Saving '{scenario_name}'...")
             else:
                 st.error("Please enter a scenario name")
 
@@ -106,6 +139,12 @@ def show_scenario_manager() -> None:
 
     scenarios = db.list_user_scenarios(user["user_id"])
 
+    cache_stats = db.scenario_cache_stats()
+    st.caption(
+        f"Scenario list cache: {cache_stats['hit_rate']:.0%} hit rate "
+        f"({cache_stats['hits']} of {cache_stats['hits'] + cache_stats['misses']} lookups)"
+    )
+
     if not scenarios:
         st.info("No saved scenarios yet. Save your current inputs above to get started!")
         return
@@ -139,6 +178,65 @@ def show_scenario_manager() -> None:
                 else:
                     st.error("Failed to delete scenario")
 
+    st.markdown("---")
+    show_scenario_comparison(user["user_id"], [s["scenario_name"] for s in scenarios])
+
+
+def show_scenario_comparison(user_id: str, scenario_names: list[str]) -> None:
+    """Overlay the projections and key metrics of several saved scenarios."""
+    import os
+
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    from scenario_comparison import compare_scenarios
+    from validation import validate_households
+
+    st.subheader("📊 Compare Scenarios")
+    selected = st.multiselect("Scenarios to Compare", scenario_names, key="compare_scenarios")
+    if not selected:
+        return
+
+    # One query for every selected scenario, without touching the current inputs
+    loaded = get_db_manager().load_many(user_id, selected)
+    scenarios = {name: loaded[name] for name in selected if name in loaded}
+    for name in selected:
+        if name not in loaded:
+            st.warning(f"Could not load '{name}'")
+
+    records = [{**data.get("user_inputs", {}), **data.get("age_inputs", {})} for data in scenarios.values()]
+    names = list(scenarios)
+    for issue in validate_households(records):
+        if scenarios.pop(names[issue.row], None) is not None:
+            st.warning(f"Skipping '{names[issue.row]}': {issue.message}")
+    if not scenarios:
+        return
+
+    summaries = compare_scenarios(scenarios, workers=os.cpu_count() or 1)
+
+    fig = go.Figure()
+    for name, summary in summaries.items():
+        fig.add_trace(go.Scatter(x=summary.ages, y=summary.projection, mode="lines", name=name))
+    fig.update_layout(
+        title="Projected Net Worth by Scenario", xaxis_title="Age", yaxis_title="Net Worth (£)"
+    )
+    st.plotly_chart(fig)
+
+    st.table(
+        pd.DataFrame(
+            [
+                {
+                    "Scenario": name,
+                    "Retirement Age": summary.retirement_age,
+                    "Net Worth at Retirement": f"£{summary.net_worth_at_retirement:,.0f}",
+                    "Final Net Worth": f"£{summary.final_net_worth:,.0f}",
+                    "Probability of Not Running Out of Money": f"{summary.success_probability * 100:.1f}%",
+                }
+                for name, summary in summaries.items()
+            ]
+        )
+    )
+
 
 def show_scenario_selector() -> None:
     """Show a compact scenario selector for the sidebar."""
@@ -39,6 +39,8 @@ CREATE POLICY "Users can delete their own scenarios" ON user_scenarios
 -- Create indexes for better performance
 CREATE INDEX idx_user_scenarios_user_id ON user_scenarios(user_id);
 CREATE INDEX idx_user_scenarios_updated_at ON user_scenarios(updated_at DESC);
+-- Serves the per-user scenario list, which is ordered by most recent update
+CREATE INDEX idx_user_scenarios_user_updated ON user_scenarios(user_id, updated_at DESC);
 
 -- Create a function to automatically update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
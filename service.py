@@ -0,0 +1,512 @@
+"""Asyncio HTTP/JSON service for projections, Monte Carlo and goal seek.
+
+Every POST endpoint takes the plan as ``models.FinancialInputs`` plus a net
+worth breakdown in the session state format:
+
+    {"inputs": {"user": {"current_age": 40, "retirement_age": 65, "life_expectancy": 90,
+                         "annual_income": 60000, "annual_expenses": 30000},
+                "partner": null, "inflation_rate": 0.02},
+     "net_worth_breakdown": {"ISA": {"value": 50000, "growth": 0.05, "is_liquid": true}}}
+
+    POST /projection    yearly total and per-category net worth to life expectancy
+    POST /monte-carlo   percentile bands and success probability
+                        (options: volatility, n_paths, seed)
+    POST /goal-seek     earliest retirement age, minimum saving and maximum spending
+                        (options: success_probability, volatility, n_paths)
+    GET  /health        liveness
+    GET  /stats         request counters and span timings
+
+CPU-bound work runs on a process pool. Identical requests that arrive while
+one is already being computed share its result, and projection requests
+arriving within ``--batch-window-ms`` of each other run as one vectorized
+engine call.
+
+    uv run financial-planner-service --port 8000 --workers 4
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import sys
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from goal_seek import GoalSeeker, GoalTarget
+from instrumentation import get_instrumentation
+from models import FinancialInputs, NetWorthBreakdown
+from monte_carlo import run_monte_carlo
+from projection import calculate_projections
+from projection_cache import canonical_hash
+from validation import validate_households
+
+DEFAULT_BATCH_WINDOW_MS = 2.0
+DEFAULT_MAX_BATCH = 256
+
+# Plans with more categories than this run on their own rather than widening a batch
+MAX_BATCHED_CATEGORIES = 32
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_MONTE_CARLO_PATHS = 1_000_000
+
+STATUS_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class _HTTPError(Exception):
+    """A request failure reported to the client with its status code."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class _Plan:
+    """A validated request: the inputs, the breakdown and the endpoint options."""
+    inputs: FinancialInputs
+    breakdown: NetWorthBreakdown
+    options: dict[str, Any]
+
+    @property
+    def years_to_project(self) -> int:
+        # Include the life expectancy year itself, as the Results page does
+        return self.inputs.user.life_expectancy - self.inputs.user.current_age + 1
+
+    def projection_args(self) -> tuple[Any, ...]:
+        """Arguments shared by every engine entry point, in ``calculate_projection`` order."""
+        return (
+            self.breakdown,
+            self.inputs.total_annual_income,
+            self.inputs.total_annual_expenses,
+            self.inputs.inflation_rate,
+            self.years_to_project,
+            self.inputs.user.retirement_age,
+            self.inputs.user.current_age,
+        )
+
+    def monte_carlo_args(self) -> tuple[Any, ...]:
+        """``projection_args`` for ``run_monte_carlo``, whose bands also hold the starting value.
+
+        Projecting one year fewer gives one band point per age up to life expectancy.
+        """
+        args = self.projection_args()
+        return (*args[:4], self.years_to_project - 1, *args[5:])
+
+
+def _reject_constant(name: str) -> float:
+    raise ValueError(f"{name} is not a valid number")
+
+
+def _parse_plan(body: bytes) -> _Plan:
+    """Parse and validate a request body with the app's validation rules."""
+    try:
+        data = json.loads(body, parse_constant=_reject_constant)
+        inputs = FinancialInputs.from_dict(data["inputs"])
+        breakdown = NetWorthBreakdown.from_dict(data["net_worth_breakdown"])
+        options = data.get("options") or {}
+        if not isinstance(options, dict):
+            raise TypeError("options must be an object")
+    except KeyError as e:
+        raise _HTTPError(400, f"Missing field: {e}") from None
+    except (AttributeError, TypeError, ValueError) as e:
+        raise _HTTPError(400, f"Invalid request: {e}") from None
+
+    user, partner = inputs.user, inputs.partner
+    fields: dict[str, Any] = {
+        "current_age": user.current_age,
+        "retirement_age": user.retirement_age,
+        "life_expectancy": user.life_expectancy,
+        "user_annual_income": user.annual_income,
+        "user_annual_expenses": user.annual_expenses,
+        "inflation_rate": inputs.inflation_rate,
+        "has_partner": partner is not None,
+    }
+    if partner is not None:
+        fields.update(
+            partner_current_age=partner.current_age,
+            partner_retirement_age=partner.retirement_age,
+            partner_life_expectancy=partner.life_expectancy,
+            partner_annual_income=partner.annual_income,
+            partner_annual_expenses=partner.annual_expenses,
+        )
+    issues = validate_households([fields], [list(breakdown)])
+    if issues:
+        raise _HTTPError(400, "; ".join(issue.message for issue in issues))
+    return _Plan(inputs=inputs, breakdown=breakdown, options=options)
+
+
+def _option(options: dict[str, Any], name: str, cast: Callable[[Any], Any], default: Any) -> Any:
+    """An endpoint option converted with ``cast``; missing or null options take ``default``."""
+    value = options.get(name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise _HTTPError(400, f"Invalid option {name}: {value!r}") from None
+
+
+# Worker functions run on the process pool, so they live at module level
+
+
+def _project_batch(plans: list[tuple[Any, ...]]) -> list[tuple[list[float], dict[str, list[float]]]]:
+    """Project many plans in one engine pass."""
+    return calculate_projections(*(list(column) for column in zip(*plans, strict=True)))
+
+
+def _monte_carlo(args: tuple[Any, ...], volatility: float, n_paths: int, seed: int | None) -> dict[str, Any]:
+    result = run_monte_carlo(*args, volatility=volatility, n_paths=n_paths, seed=seed)
+    return {
+        "percentiles": {str(percentile): band.tolist() for percentile, band in result.percentiles.items()},
+        "success_probability": result.success_probability,
+        "n_paths": result.n_paths,
+    }
+
+
+def _goal_seek(plan: _Plan, target: GoalTarget) -> dict[str, Any]:
+    inputs = plan.inputs
+    seeker = GoalSeeker(
+        plan.breakdown,
+        inputs.total_annual_income,
+        inputs.total_annual_expenses,
+        inputs.inflation_rate,
+        inputs.user.retirement_age,
+        inputs.user.current_age,
+        inputs.user.life_expectancy,
+        target,
+    )
+    results = [
+        seeker.earliest_retirement_age(),
+        seeker.minimum_annual_savings(),
+        seeker.maximum_annual_expenses(),
+    ]
+    return {
+        **{result.parameter: result.value for result in results},
+        "evaluations": seeker.evaluations,
+    }
+
+
+class _ProjectionBatcher:
+    """Collect projection requests for a short window and run them as one engine call.
+
+    A batch is sent to the pool when the window closes or ``max_batch``
+    requests are waiting, whichever comes first.
+    """
+
+    def __init__(self, pool: ProcessPoolExecutor, window: float, max_batch: int) -> None:
+        self.pool = pool
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.batched_requests = 0
+        self._pending: list[tuple[tuple[Any, ...], asyncio.Future[Any]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: set[asyncio.Task[None]] = set()
+
+    def submit(self, args: tuple[Any, ...]) -> "asyncio.Future[Any]":
+        """Queue one plan's projection arguments; the future resolves to its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((args, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            # Keep a reference so the task isn't garbage collected mid-flight
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: list[tuple[tuple[Any, ...], asyncio.Future[Any]]]) -> None:
+        self.batches += 1
+        self.batched_requests += len(batch)
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.pool, _project_batch, [args for args, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+
+class PlannerService:
+    """Request handling, in-flight coalescing and the worker pool behind the HTTP server."""
+
+    def __init__(
+        self,
+        workers: int = 1,
+        batch_window_ms: float = DEFAULT_BATCH_WINDOW_MS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.batcher = _ProjectionBatcher(self.pool, batch_window_ms / 1000, max_batch)
+        self.requests = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._in_flight: dict[str, asyncio.Future[Any]] = {}
+        self._connections: dict[asyncio.StreamWriter, asyncio.Task[Any]] = {}
+        self._routes: dict[tuple[str, str], Callable[[bytes], Awaitable[Any]]] = {
+            ("POST", "/projection"): self.projection,
+            ("POST", "/monte-carlo"): self.monte_carlo,
+            ("POST", "/goal-seek"): self.goal_seek,
+            ("GET", "/health"): self.health,
+            ("GET", "/stats"): self.stats,
+        }
+
+    async def close_connections(self) -> None:
+        """Hang up on every client, including idle keep-alive ones, and wait for their handlers."""
+        connections = dict(self._connections)
+        for writer in connections:
+            writer.close()
+        await asyncio.gather(*connections.values(), return_exceptions=True)
+
+    def close(self) -> None:
+        self.pool.shutdown(cancel_futures=True)
+
+    async def _coalesced(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``compute``, or the identical computation already in flight.
+
+        The shared task is shielded so a client disconnecting doesn't cancel
+        it for everyone else waiting on the same result.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _in_pool(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+
+    async def projection(self, body: bytes) -> dict[str, Any]:
+        plan = _parse_plan(body)
+        args = plan.projection_args()
+
+        async def compute() -> tuple[list[float], dict[str, list[float]]]:
+            if len(plan.breakdown) > MAX_BATCHED_CATEGORIES:
+                return (await self._in_pool(_project_batch, [args]))[0]
+            return await self.batcher.submit(args)
+
+        total, categories = await self._coalesced(
+            canonical_hash("projection", plan.breakdown.to_dict(), *args[1:]), compute
+        )
+        user = plan.inputs.user
+        return {
+            "ages": list(range(user.current_age, user.current_age + len(total))),
+            "total": total,
+            "categories": categories,
+            "retirement_net_worth": total[user.retirement_age - user.current_age],
+            "final_net_worth": total[-1],
+        }
+
+    async def monte_carlo(self, body: bytes) -> dict[str, Any]:
+        plan = _parse_plan(body)
+        volatility = _option(plan.options, "volatility", float, 0.1)
+        n_paths = _option(plan.options, "n_paths", int, 10_000)
+        seed = _option(plan.options, "seed", int, 0)
+        if not 1 <= n_paths <= MAX_MONTE_CARLO_PATHS:
+            raise _HTTPError(400, f"n_paths must be between 1 and {MAX_MONTE_CARLO_PATHS:,}")
+        if volatility < 0:
+            raise _HTTPError(400, "volatility cannot be negative")
+
+        args = plan.monte_carlo_args()
+        key = canonical_hash("monte_carlo", plan.breakdown.to_dict(), *args[1:], volatility, n_paths, seed)
+        result = await self._coalesced(
+            key, lambda: self._in_pool(_monte_carlo, args, volatility, n_paths, seed)
+        )
+        return {"ages": list(range(plan.inputs.user.current_age, plan.inputs.user.life_expectancy + 1)), **result}
+
+    async def goal_seek(self, body: bytes) -> dict[str, Any]:
+        plan = _parse_plan(body)
+        target = GoalTarget(
+            success_probability=_option(plan.options, "success_probability", float, None),
+            volatility=_option(plan.options, "volatility", float, 0.1),
+            n_paths=_option(plan.options, "n_paths", int, 2_000),
+        )
+        if target.success_probability is not None and not 0 < target.success_probability <= 1:
+            raise _HTTPError(400, "success_probability must be between 0 and 1")
+        if not 1 <= target.n_paths <= MAX_MONTE_CARLO_PATHS:
+            raise _HTTPError(400, f"n_paths must be between 1 and {MAX_MONTE_CARLO_PATHS:,}")
+        if target.volatility < 0:
+            raise _HTTPError(400, "volatility cannot be negative")
+
+        key = canonical_hash(
+            "goal_seek",
+            plan.breakdown.to_dict(),
+            *plan.projection_args()[1:],
+            plan.inputs.user.life_expectancy,
+            target.success_probability,
+            target.volatility,
+            target.n_paths,
+        )
+        return await self._coalesced(key, lambda: self._in_pool(_goal_seek, plan, target))
+
+    async def health(self, body: bytes) -> dict[str, Any]:
+        return {"status": "ok"}
+
+    async def stats(self, body: bytes) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "batches": self.batcher.batches,
+            "batched_requests": self.batcher.batched_requests,
+            "spans": get_instrumentation().snapshot(),
+        }
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple[int, Any]:
+        """Route one request, returning its status and JSON-serializable payload."""
+        self.requests += 1
+        path = path.split("?", 1)[0]
+        handler = self._routes.get((method, path))
+        try:
+            if handler is None:
+                allowed = any(route_path == path for _, route_path in self._routes)
+                raise _HTTPError(405 if allowed else 404, f"No route for {method} {path}")
+            with get_instrumentation().span(f"service.{path.strip('/')}"):
+                return 200, await handler(body)
+        except _HTTPError as e:
+            self.errors += 1
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            self.errors += 1
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one connection until the client closes it."""
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections[writer] = task
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except _HTTPError as e:
+                    # The rest of the stream can't be trusted after a bad request
+                    self.errors += 1
+                    writer.write(_response(e.status, {"error": str(e)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, payload = await self.dispatch(method, path, body)
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, bytes, bool] | None:
+    """Method, path, body and keep-alive flag of the next request, or None at end of stream."""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, path, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise _HTTPError(400, "Malformed request line") from None
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise _HTTPError(400, "Invalid Content-Length") from None
+    if length < 0:
+        raise _HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise _HTTPError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    return method, path, body, keep_alive
+
+
+def _response(status: int, payload: Any, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    head = (
+        f"HTTP/1.1 {status} {STATUS_REASONS[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+async def serve(host: str, port: int, workers: int, batch_window_ms: float, max_batch: int) -> None:
+    """Serve until SIGINT or SIGTERM, then shut the worker pool down with the server."""
+    service = PlannerService(workers, batch_window_ms, max_batch)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signum, stop.set)
+    print(f"Serving on http://{host}:{port} with {workers} workers", file=sys.stderr, flush=True)
+    try:
+        async with server:
+            await stop.wait()
+            # The server only finishes closing once its connections have
+            await service.close_connections()
+    finally:
+        service.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve projections, Monte Carlo and goal seek over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=DEFAULT_BATCH_WINDOW_MS,
+        help="how long to collect projection requests into one engine call",
+    )
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="largest projection batch")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.batch_window_ms, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
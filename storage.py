@@ -0,0 +1,250 @@
+"""Storage backends for saved scenarios."""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from postgrest import SyncRequestBuilder
+    from supabase import Client
+
+# Matches UNIQUE(user_id, scenario_name) in schema.sql
+SCENARIO_CONFLICT_COLUMNS = "user_id,scenario_name"
+
+DEFAULT_SQLITE_PATH = "financial_planner.db"
+
+logger = logging.getLogger(__name__)
+
+
+def scenario_row(user_id: str, scenario_name: str, scenario_data: dict[str, Any]) -> dict[str, Any]:
+    """Build a user_scenarios row for writing, with the data already JSON encoded."""
+    return {
+        "user_id": user_id,
+        "scenario_name": scenario_name,
+        "scenario_data": json.dumps(scenario_data),
+        "updated_at": "now()"
+    }
+
+
+class ScenarioBackend(ABC):
+    """Where scenarios are stored. Every method is one round trip and raises on failure."""
+
+    @abstractmethod
+    def is_connected(self) -> bool:
+        """Whether the backend is configured and usable."""
+
+    @property
+    def connection_error(self) -> str | None:
+        """Why the backend isn't connected, if it failed to set up, for the UI to show."""
+        return None
+
+    @abstractmethod
+    def upsert(self, rows: list[dict[str, Any]]) -> int:
+        """Insert or replace rows built by ``scenario_row`` and return how many were written."""
+
+    @abstractmethod
+    def load(self, user_id: str, scenario_names: list[str]) -> dict[str, dict[str, Any]]:
+        """Decoded scenario data keyed by name; missing scenarios are left out."""
+
+    @abstractmethod
+    def list_scenarios(self, user_id: str) -> list[dict[str, Any]]:
+        """Name, created_at and updated_at of a user's scenarios, most recently updated first."""
+
+    @abstractmethod
+    def delete(self, user_id: str, scenario_names: list[str]) -> int:
+        """Delete scenarios by name and return how many were removed."""
+
+
+class SupabaseClient:
+    """Supabase client wrapper for the financial planner app.
+
+    Setup failures are logged and kept in ``error`` rather than shown here,
+    so the storage layer doesn't depend on Streamlit.
+    """
+
+    def __init__(self):
+        self._client: Client | None = None
+        self._initialized = False
+        self.error: str | None = None
+
+    def _initialize_client(self) -> None:
+        """Initialize Supabase client with environment variables."""
+        self._initialized = True
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_KEY")
+
+        if not url or not key:
+            self._fail("Supabase configuration missing. Please set SUPABASE_URL and SUPABASE_KEY in your .env file.")
+            return
+
+        try:
+            # Deferred so startup doesn't pay for the HTTP client stack
+            from supabase import create_client
+
+            self._client = create_client(url, key)
+        except Exception as e:
+            self._fail(f"Failed to initialize Supabase client: {str(e)}")
+
+    def _fail(self, message: str) -> None:
+        self.error = message
+        logger.error(message)
+
+    @property
+    def client(self) -> "Client | None":
+        """Get the Supabase client, creating it on first use."""
+        if not self._initialized:
+            self._initialize_client()
+        return self._client
+
+    def is_connected(self) -> bool:
+        """Check if the client is properly connected."""
+        return self.client is not None
+
+
+class SupabaseBackend(ScenarioBackend):
+    """Scenarios in the Supabase ``user_scenarios`` table."""
+
+    def __init__(self, supabase: SupabaseClient | None = None) -> None:
+        self.supabase = supabase or SupabaseClient()
+
+    def is_connected(self) -> bool:
+        return self.supabase.is_connected()
+
+    @property
+    def connection_error(self) -> str | None:
+        return self.supabase.error
+
+    def _table(self) -> "SyncRequestBuilder":
+        return self.supabase.client.table("user_scenarios")
+
+    def upsert(self, rows: list[dict[str, Any]]) -> int:
+        result = self._table().upsert(rows, on_conflict=SCENARIO_CONFLICT_COLUMNS).execute()
+        return len(result.data or [])
+
+    def load(self, user_id: str, scenario_names: list[str]) -> dict[str, dict[str, Any]]:
+        result = self._table().select("scenario_name, scenario_data").eq("user_id", user_id).in_("scenario_name", scenario_names).execute()
+        return {
+            row["scenario_name"]: json.loads(row["scenario_data"])
+            for row in result.data or []
+        }
+
+    def list_scenarios(self, user_id: str) -> list[dict[str, Any]]:
+        result = self._table().select("scenario_name, created_at, updated_at").eq("user_id", user_id).order("updated_at", desc=True).execute()
+        return result.data or []
+
+    def delete(self, user_id: str, scenario_names: list[str]) -> int:
+        result = self._table().delete().eq("user_id", user_id).in_("scenario_name", scenario_names).execute()
+        return len(result.data or [])
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_scenarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    scenario_name TEXT NOT NULL,
+    scenario_data TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    UNIQUE(user_id, scenario_name)
+);
+CREATE INDEX IF NOT EXISTS idx_user_scenarios_user_updated ON user_scenarios(user_id, updated_at DESC);
+"""
+
+SQLITE_UPSERT = """
+INSERT INTO user_scenarios (user_id, scenario_name, scenario_data)
+VALUES (?, ?, ?)
+ON CONFLICT(user_id, scenario_name) DO UPDATE SET
+    scenario_data = excluded.scenario_data,
+    updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+"""
+
+# One connection per database file per process, shared by every thread
+_connections: dict[tuple[str, int], tuple[sqlite3.Connection, threading.Lock]] = {}
+_connections_lock = threading.Lock()
+
+
+def _shared_connection(path: str) -> tuple[sqlite3.Connection, threading.Lock]:
+    """The process's connection to ``path``, opened and migrated on first use.
+
+    Keyed by process id so a forked worker opens its own connection rather
+    than sharing the parent's file handle.
+    """
+    key = (path, os.getpid())
+    with _connections_lock:
+        if key not in _connections:
+            connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SQLITE_SCHEMA)
+            _connections[key] = (connection, threading.Lock())
+        return _connections[key]
+
+
+class SQLiteBackend(ScenarioBackend):
+    """Scenarios in a local SQLite file, for self-hosted use and benchmarks.
+
+    Uses WAL mode so reads don't block on the background writer, and the same
+    ``(user_id, updated_at DESC)`` index as ``schema.sql`` for listing.
+    """
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH) -> None:
+        self.path = path
+        self._connection, self._lock = _shared_connection(path)
+
+    def is_connected(self) -> bool:
+        return True
+
+    def upsert(self, rows: list[dict[str, Any]]) -> int:
+        params = [(row["user_id"], row["scenario_name"], row["scenario_data"]) for row in rows]
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(SQLITE_UPSERT, params)
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return len(params)
+
+    def load(self, user_id: str, scenario_names: list[str]) -> dict[str, dict[str, Any]]:
+        placeholders = ", ".join("?" * len(scenario_names))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT scenario_name, scenario_data FROM user_scenarios "
+                f"WHERE user_id = ? AND scenario_name IN ({placeholders})",
+                [user_id, *scenario_names],
+            ).fetchall()
+        return {row["scenario_name"]: json.loads(row["scenario_data"]) for row in rows}
+
+    def list_scenarios(self, user_id: str) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT scenario_name, created_at, updated_at FROM user_scenarios "
+                "WHERE user_id = ? ORDER BY updated_at DESC",
+                (user_id,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete(self, user_id: str, scenario_names: list[str]) -> int:
+        placeholders = ", ".join("?" * len(scenario_names))
+        with self._lock:
+            cursor = self._connection.execute(
+                f"DELETE FROM user_scenarios WHERE user_id = ? AND scenario_name IN ({placeholders})",
+                [user_id, *scenario_names],
+            )
+        return cursor.rowcount
+
+
+def create_backend() -> ScenarioBackend:
+    """Backend named by ``STORAGE_BACKEND`` (``supabase`` by default, or ``sqlite``)."""
+    name = os.getenv("STORAGE_BACKEND", "supabase").lower()
+    if name == "sqlite":
+        return SQLiteBackend(os.getenv("SQLITE_PATH", DEFAULT_SQLITE_PATH))
+    if name == "supabase":
+        return SupabaseBackend()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {name}")
@@ -0,0 +1,84 @@
+"""Tests for headless batch projections."""
+
+import json
+
+import pytest
+
+from batch import project_chunk
+from projection import calculate_projection
+
+HOUSEHOLD = {
+    "id": "h1",
+    "current_age": 40,
+    "retirement_age": 65,
+    "life_expectancy": 90,
+    "user_annual_income": 60_000,
+    "user_annual_expenses": 30_000,
+    "inflation_rate": 0.02,
+    "accounts": [
+        {"name": "ISA", "type": "S_AND_S", "value": 50_000, "growth": 0.05},
+        {"name": "Home", "type": "property", "value": 250_000, "growth": 0.02},
+    ],
+}
+
+
+def test_projects_like_calculate_projection():
+    (row,), _ = project_chunk([json.dumps(HOUSEHOLD)])
+    totals, _ = calculate_projection(
+        {
+            "ISA": {"value": 50_000, "growth": 0.05, "is_liquid": True},
+            "Home": {"value": 250_000, "growth": 0.02, "is_liquid": False},
+        },
+        60_000,
+        30_000,
+        0.02,
+        51,
+        65,
+        40,
+    )
+    assert row["valid"]
+    assert row["retirement_net_worth"] == pytest.approx(totals[25])
+    assert row["final_net_worth"] == pytest.approx(totals[50])
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        "42",
+        '"household"',
+        "[1, 2]",
+        json.dumps({**HOUSEHOLD, "accounts": ["ISA"]}),
+        json.dumps({**HOUSEHOLD, "accounts": {"name": "ISA"}}),
+        "{not json",
+    ],
+)
+def test_unreadable_records_become_errors(record):
+    (row,), totals = project_chunk([record])
+    assert not row["valid"]
+    assert row["error"]
+    assert totals is None
+
+
+def test_invalid_rows_do_not_stop_the_chunk():
+    rows, _ = project_chunk(["42", json.dumps(HOUSEHOLD)])
+    assert [row["valid"] for row in rows] == [False, True]
+
+
+@pytest.mark.parametrize("field", ["user_annual_income", "user_annual_expenses", "inflation_rate"])
+def test_missing_required_fields_are_errors(field):
+    record = {key: value for key, value in HOUSEHOLD.items() if key != field}
+    (row,), _ = project_chunk([json.dumps(record)])
+    assert not row["valid"]
+    assert row["error"] == f"Missing fields: {field}"
+
+
+def test_fractional_ages_are_errors():
+    (row,), _ = project_chunk([json.dumps({**HOUSEHOLD, "current_age": 45.7})])
+    assert not row["valid"]
+    assert "current_age must be a whole number" in row["error"]
+
+
+def test_csv_style_values_are_accepted():
+    record = {key: str(value) for key, value in HOUSEHOLD.items() if key != "accounts"}
+    (row,), _ = project_chunk([{**record, "current_age": "40.0", "accounts": "[]"}])
+    assert row["valid"]
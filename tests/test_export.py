@@ -0,0 +1,32 @@
+"""Tests for the columnar export."""
+
+import io
+
+import numpy as np
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from export import EXPORT_SCHEMA, ProjectionExporter, export_results
+
+
+def test_exports_projection_with_year_offsets():
+    data = export_results("h1", 40, [100.0, 110.0], {"ISA": [60.0, 70.0], "Cash": [40.0, 40.0]})
+    table = pq.read_table(io.BytesIO(data))
+
+    assert table.schema == EXPORT_SCHEMA
+    rows = table.to_pylist()
+    assert rows[:2] == [
+        {"household_id": "h1", "year_offset": 0, "age": 40, "category": "total", "value": 100.0},
+        {"household_id": "h1", "year_offset": 1, "age": 41, "category": "total", "value": 110.0},
+    ]
+    assert len(rows) == 6
+
+
+def test_totals_stop_at_each_horizon_in_small_row_groups():
+    sink = io.BytesIO()
+    with ProjectionExporter(sink, "arrow", row_group_size=2) as exporter:
+        exporter.write_totals(["a", "b"], np.array([30, 50]), np.array([2, 1]), np.ones((2, 3)))
+    table = ipc.open_file(io.BytesIO(sink.getvalue())).read_all()
+
+    assert table.column("household_id").to_pylist() == ["a", "a", "a", "b", "b"]
+    assert table.column("age").to_pylist() == [30, 31, 32, 50, 51]
@@ -0,0 +1,45 @@
+"""Tests for the goal-seek solvers."""
+
+from goal_seek import GoalSeeker
+from projection import calculate_projection
+
+BREAKDOWN = {
+    "savings": {"value": 50_000.0, "growth": 0.04, "is_liquid": True},
+    "home": {"value": 200_000.0, "growth": 0.02, "is_liquid": False},
+}
+PLAN = {
+    "annual_income": 60_000.0,
+    "annual_expenses": 35_000.0,
+    "inflation_rate": 0.02,
+    "current_age": 30,
+}
+LIFE_EXPECTANCY = 90
+
+
+def _lasts(retirement_age: int) -> bool:
+    """Whether the plan keeps money in the bank after retiring at ``retirement_age``."""
+    totals, _ = calculate_projection(
+        BREAKDOWN,
+        years_to_project=LIFE_EXPECTANCY - PLAN["current_age"] + 1,
+        retirement_age=retirement_age,
+        **PLAN,
+    )
+    return all(total > 0 for total in totals[retirement_age - PLAN["current_age"] + 1:])
+
+
+def test_earliest_retirement_age_is_the_modelled_retirement_age():
+    seeker = GoalSeeker(BREAKDOWN, retirement_age=65, life_expectancy=LIFE_EXPECTANCY, **PLAN)
+    age = seeker.earliest_retirement_age().value
+
+    assert age is not None
+    assert _lasts(age)
+    assert not _lasts(age - 1)
+
+
+def test_minimum_savings_meets_target():
+    seeker = GoalSeeker(BREAKDOWN, retirement_age=55, life_expectancy=LIFE_EXPECTANCY, **PLAN)
+    savings = seeker.minimum_annual_savings().value
+
+    assert savings is not None
+    assert seeker.meets_target(annual_income=PLAN["annual_expenses"] + savings)
+    assert not seeker.meets_target(annual_income=PLAN["annual_expenses"] + savings - 200)
@@ -0,0 +1,24 @@
+"""Tests for incremental re-projection."""
+
+from incremental_projection import IncrementalProjector
+from projection import calculate_projection
+
+BREAKDOWN = {
+    "ISA": {"value": 100_000.0, "growth": 0.05, "is_liquid": True},
+    "Home": {"value": 200_000.0, "growth": 0.02, "is_liquid": False},
+}
+
+
+def test_resumed_runs_match_full_projections():
+    projector = IncrementalProjector()
+    for retirement_age, years in [(65, 60), (60, 60), (70, 60), (70, 40), (55, 70)]:
+        args = (BREAKDOWN, 50_000, 40_000, 0.02, years, retirement_age, 30)
+        assert projector.project(*args) == calculate_projection(*args)
+    assert projector.years_reused > 0
+
+
+def test_changed_inputs_run_in_full():
+    projector = IncrementalProjector()
+    projector.project(BREAKDOWN, 50_000, 40_000, 0.02, 60, 65, 30)
+    projector.project(BREAKDOWN, 55_000, 40_000, 0.02, 60, 65, 30)
+    assert projector.years_reused == 0
@@ -0,0 +1,30 @@
+"""Tests for the shared data models."""
+
+from models import NetWorthBreakdown, combine_net_worth_breakdowns
+
+
+def test_combines_user_and_partner_breakdowns():
+    combined = combine_net_worth_breakdowns(
+        {
+            "user_net_worth_breakdown": {
+                "cash": {"value": 10_000, "growth": 0.01, "is_liquid": True},
+                "property": {"value": 200_000, "growth": 0.03, "is_liquid": False},
+            },
+            "partner_net_worth_breakdown": {
+                "pension": {"value": 50_000, "growth": 0.05, "is_liquid": False},
+                "cash": {"value": 5_000, "growth": 0.02, "is_liquid": True},
+            },
+        }
+    )
+    assert combined.to_dict() == {
+        "cash": {"value": 15_000, "growth": 0.02, "is_liquid": True},
+        "property": {"value": 200_000, "growth": 0.03, "is_liquid": False},
+        "pension": {"value": 50_000, "growth": 0.05, "is_liquid": False},
+    }
+
+
+def test_breakdown_round_trips_and_is_read_only():
+    data = {"cash": {"value": 1.0, "growth": 0.0, "is_liquid": True}}
+    breakdown = NetWorthBreakdown.from_dict(data)
+    assert breakdown.to_dict() == data
+    assert not breakdown.values.flags.writeable
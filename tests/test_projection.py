@@ -0,0 +1,163 @@
+"""Tests for the vectorized projection engine."""
+
+import copy
+import random
+
+import numpy as np
+import pytest
+
+import projection
+from models import NetWorthBreakdown
+from projection import (
+    calculate_monthly_projection,
+    calculate_projection,
+    calculate_projections,
+    monthly_to_yearly,
+    working_years,
+)
+
+
+def _reference_projection(
+    net_worth_breakdown: dict,
+    annual_income: float,
+    annual_expenses: float,
+    inflation_rate: float,
+    years_to_project: int,
+    retirement_age: int,
+    current_age: int,
+) -> tuple[list[float], dict[str, list[float]]]:
+    """The original year-by-year loop, with ages advancing once per year."""
+    breakdown = copy.deepcopy(net_worth_breakdown)
+    projection = []
+    category_projections = {category: [] for category in breakdown}
+
+    for year in range(years_to_project):
+        projection.append(sum(data["value"] for data in breakdown.values()))
+        for category, data in breakdown.items():
+            category_projections[category].append(data["value"])
+
+        for data in breakdown.values():
+            data["value"] *= 1 + data["growth"]
+
+        liquid = [data for data in breakdown.values() if data.get("is_liquid", True)]
+        illiquid = [data for data in breakdown.values() if not data.get("is_liquid", True)]
+        total_liquid = sum(data["value"] for data in liquid)
+        if current_age + year < retirement_age:
+            net_change = annual_income - annual_expenses
+            if net_change > 0:
+                if total_liquid > 0:
+                    for data in liquid:
+                        data["value"] += data["value"] / total_liquid * net_change
+                elif liquid:
+                    liquid[0]["value"] += net_change
+            elif net_change < 0 and total_liquid > 0:
+                for data in liquid:
+                    data["value"] += data["value"] / total_liquid * net_change
+                    data["value"] = max(data["value"], 0)
+        elif total_liquid >= annual_expenses:
+            for data in liquid:
+                data["value"] -= data["value"] / total_liquid * annual_expenses
+        else:
+            remaining = annual_expenses - total_liquid
+            for data in liquid:
+                data["value"] = 0
+            for data in sorted(illiquid, key=lambda data: data["value"]):
+                if remaining <= 0:
+                    break
+                sold = min(data["value"], remaining)
+                data["value"] -= sold
+                remaining -= sold
+
+        annual_expenses *= 1 + inflation_rate
+
+    return projection, category_projections
+
+
+def _random_plan(rng: random.Random) -> dict:
+    breakdown = {
+        f"category_{i}": {
+            "value": rng.choice([0.0, rng.uniform(0, 500_000)]),
+            "growth": rng.uniform(-0.05, 0.1),
+            "is_liquid": rng.random() < 0.7,
+        }
+        for i in range(rng.randint(1, 6))
+    }
+    current_age = rng.randint(20, 70)
+    return {
+        "net_worth_breakdown": breakdown,
+        "annual_income": rng.uniform(0, 150_000),
+        "annual_expenses": rng.uniform(0, 120_000),
+        "inflation_rate": rng.uniform(0, 0.06),
+        "years_to_project": rng.randint(0, 70),
+        "retirement_age": current_age + rng.randint(-5, 45),
+        "current_age": current_age,
+    }
+
+
+@pytest.mark.parametrize("engine", [False, True], ids=["scalar", "engine"])
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_reference_loop(seed, engine, monkeypatch):
+    if engine:
+        # Every breakdown is wider than the limit, so the NumPy engine runs
+        monkeypatch.setattr(projection, "SCALAR_CATEGORY_LIMIT", 0)
+    plan = _random_plan(random.Random(seed))
+    expected_total, expected_categories = _reference_projection(**plan)
+
+    total, categories = calculate_projection(**plan)
+
+    np.testing.assert_allclose(total, expected_total, rtol=1e-9, atol=1e-6)
+    assert categories.keys() == expected_categories.keys()
+    for name, values in expected_categories.items():
+        np.testing.assert_allclose(categories[name], values, rtol=1e-9, atol=1e-6)
+
+
+def test_does_not_modify_breakdown():
+    plan = _random_plan(random.Random(0))
+    before = copy.deepcopy(plan["net_worth_breakdown"])
+    calculate_projection(**plan)
+    assert plan["net_worth_breakdown"] == before
+
+
+def test_accepts_net_worth_breakdown():
+    plan = _random_plan(random.Random(1))
+    expected = calculate_projection(**plan)
+    plan["net_worth_breakdown"] = NetWorthBreakdown.from_dict(plan["net_worth_breakdown"])
+    assert calculate_projection(**plan) == expected
+
+
+def test_batched_plans_match_single_runs():
+    rng = random.Random(2)
+    plans = [_random_plan(rng) for _ in range(20)]
+    results = calculate_projections(
+        [plan["net_worth_breakdown"] for plan in plans],
+        np.array([plan["annual_income"] for plan in plans]),
+        np.array([plan["annual_expenses"] for plan in plans]),
+        np.array([plan["inflation_rate"] for plan in plans]),
+        np.array([plan["years_to_project"] for plan in plans]),
+        np.array([plan["retirement_age"] for plan in plans]),
+        np.array([plan["current_age"] for plan in plans]),
+    )
+    for plan, (total, categories) in zip(plans, results, strict=True):
+        expected_total, expected_categories = calculate_projection(**plan)
+        np.testing.assert_allclose(total, expected_total)
+        for name, values in expected_categories.items():
+            np.testing.assert_allclose(categories[name], values)
+
+
+def test_monthly_projection_keeps_yearly_retirement():
+    plan = _random_plan(random.Random(3))
+    plan["years_to_project"] = 40
+    total, _ = calculate_projection(**plan)
+    monthly_total, monthly_categories = calculate_monthly_projection(**plan)
+    yearly_total, _ = monthly_to_yearly(monthly_total, monthly_categories)
+    assert len(monthly_total) == 40 * 12
+    assert len(yearly_total) == len(total)
+    assert yearly_total[0] == pytest.approx(total[0])
+
+
+@pytest.mark.parametrize(
+    ("current_age", "retirement_age", "years", "expected"),
+    [(30, 65, 60, 35), (30, 65, 20, 20), (70, 65, 20, 0), (40, 40, 10, 0)],
+)
+def test_working_years(current_age, retirement_age, years, expected):
+    assert working_years(current_age, retirement_age, years) == expected
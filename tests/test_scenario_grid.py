@@ -0,0 +1,26 @@
+"""Tests for the scenario grid."""
+
+import pytest
+
+from projection import calculate_projection
+from scenario_grid import evaluate_grid
+
+BREAKDOWN = {
+    "cash": {"value": 100_000.0, "growth": 0.05, "is_liquid": True},
+    "property": {"value": 300_000.0, "growth": 0.02, "is_liquid": False},
+}
+
+
+@pytest.mark.parametrize("retirement_age", [25, 40, 60, 65, 95])
+def test_grid_matches_single_projection(retirement_age):
+    grid = evaluate_grid(
+        BREAKDOWN, 50_000, 40_000, 0.02, 65, 30, 90, {"retirement_age": [retirement_age]}
+    )
+    row = grid.iloc[0]
+    totals, _ = calculate_projection(BREAKDOWN, 50_000, 40_000, 0.02, 61, retirement_age, 30)
+
+    index = min(max(retirement_age - 30, 0), 60)
+    assert row["retirement_net_worth"] == pytest.approx(totals[index])
+    assert row["final_net_worth"] == pytest.approx(totals[60])
+    retired = totals[index + 1:]
+    assert row["runs_out"] == any(total <= 0 for total in retired)
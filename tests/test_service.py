@@ -0,0 +1,96 @@
+"""Tests for request parsing in the projection service."""
+
+import asyncio
+import json
+
+import pytest
+
+from service import _HTTPError, _monte_carlo, _option, _parse_plan, _read_request
+
+INPUTS = {
+    "user": {
+        "current_age": 40,
+        "retirement_age": 65,
+        "life_expectancy": 90,
+        "annual_income": 60_000,
+        "annual_expenses": 30_000,
+    },
+    "partner": None,
+    "inflation_rate": 0.02,
+}
+
+
+def _body(breakdown: dict) -> bytes:
+    return json.dumps({"inputs": INPUTS, "net_worth_breakdown": breakdown}).encode()
+
+
+def test_parses_valid_plan():
+    plan = _parse_plan(_body({"ISA": {"value": 50_000, "growth": 0.05, "is_liquid": True}}))
+    assert plan.breakdown.names == ("ISA",)
+    assert plan.years_to_project == 51
+
+
+@pytest.mark.parametrize(
+    ("category", "message"),
+    [
+        ({"value": -1, "growth": 0.05}, "value cannot be negative"),
+        ({"value": "nan", "growth": 0.05}, "value cannot be negative"),
+        ({"value": 1_000, "growth": 1.5}, "growth rate should be between"),
+        ({"value": 1_000, "growth": -0.6}, "growth rate should be between"),
+    ],
+)
+def test_rejects_invalid_categories(category, message):
+    with pytest.raises(_HTTPError) as error:
+        _parse_plan(_body({"ISA": category}))
+    assert error.value.status == 400
+    assert message in str(error.value)
+
+
+def test_rejects_non_object_body():
+    with pytest.raises(_HTTPError) as error:
+        _parse_plan(b"42")
+    assert error.value.status == 400
+
+
+def test_monte_carlo_bands_match_ages():
+    plan = _parse_plan(_body({"ISA": {"value": 50_000, "growth": 0.05, "is_liquid": True}}))
+    result = _monte_carlo(plan.monte_carlo_args(), 0.1, 100, 0)
+    ages = range(INPUTS["user"]["current_age"], INPUTS["user"]["life_expectancy"] + 1)
+    for band in result["percentiles"].values():
+        assert len(band) == len(ages)
+
+
+def _read(raw: bytes):
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await _read_request(reader)
+
+    return asyncio.run(read())
+
+
+def test_reads_request():
+    method, path, body, keep_alive = _read(
+        b"POST /projection HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}"
+    )
+    assert (method, path, body, keep_alive) == ("POST", "/projection", b"{}", True)
+
+
+@pytest.mark.parametrize("length", [b"-1", b"abc"])
+def test_rejects_invalid_content_length(length):
+    with pytest.raises(_HTTPError) as error:
+        _read(b"POST /projection HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+    assert error.value.status == 400
+
+
+@pytest.mark.parametrize(("value", "expected"), [(None, 0.1), (0.2, 0.2), ("0.3", 0.3)])
+def test_null_options_take_the_default(value, expected):
+    assert _option({"volatility": value}, "volatility", float, 0.1) == expected
+    assert _option({}, "volatility", float, 0.1) == 0.1
+
+
+def test_rejects_unconvertible_options():
+    with pytest.raises(_HTTPError) as error:
+        _option({"n_paths": "many"}, "n_paths", int, 10_000)
+    assert error.value.status == 400
@@ -0,0 +1,76 @@
+"""Tests for the compiled UK tax tables and after-tax cash flows."""
+
+import numpy as np
+import pytest
+
+from uk_tax import BandTable, Earner, TaxProfile, compile_tax_tables, tax_cash_flows
+
+
+@pytest.mark.parametrize(
+    ("income", "expected"),
+    [
+        (0, 0),
+        (12_570, 0),
+        (50_000, 7_486),
+        (50_270, 7_540),
+        (100_000, 27_432),
+        (110_000, 33_432),
+        (125_140, 42_516),
+        (150_000, 53_703),
+    ],
+)
+def test_income_tax(income, expected):
+    assert compile_tax_tables().income_tax(income) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    ("income", "expected"),
+    [(10_000, 0), (50_000, 2_994.40), (60_000, 3_210.60)],
+)
+def test_national_insurance(income, expected):
+    assert compile_tax_tables().national_insurance(income) == pytest.approx(expected)
+
+
+def test_employment_table_is_tax_plus_ni():
+    tables = compile_tax_tables()
+    incomes = np.linspace(0, 300_000, 1_001)
+    np.testing.assert_allclose(
+        tables.employment(incomes), tables.income_tax(incomes) + tables.national_insurance(incomes)
+    )
+
+
+def test_thresholds_scale_with_index():
+    table = BandTable.from_bands([0.0, 10_000.0], [0.0, 0.2])
+    assert table(20_000, 2.0) == pytest.approx(0.0)
+    assert table(30_000, 2.0) == pytest.approx(2_000)
+    assert table(-5_000) == pytest.approx(0.0)
+
+
+def test_thresholds_stay_frozen_then_rise():
+    index = compile_tax_tables().threshold_index(7, 0.02)
+    np.testing.assert_allclose(index, [1, 1, 1, 1, 1, 1.02, 1.02**2])
+
+
+def test_cash_flows_pay_take_home_and_state_pension():
+    profile = TaxProfile(earners=(Earner(50_000, 65),))
+    flows = tax_cash_flows(profile, ["ISA"], 0.0, 4)
+
+    # Working until state pension age at 67, then salary plus pension with income tax only
+    assert flows.income[0] == pytest.approx(50_000 - 7_486 - 2_994.40)
+    pension = compile_tax_tables().rules.state_pension
+    taxed = compile_tax_tables().income_tax(50_000 + pension)
+    assert flows.income[2] == pytest.approx(50_000 + pension - taxed)
+    assert flows.retirement_income[0] == 0
+    assert flows.retirement_income[2] == pytest.approx(pension)
+
+
+def test_salary_sacrifice_goes_to_the_pension_category():
+    profile = TaxProfile(
+        earners=(Earner(60_000, 40),), pension_contribution_rate=0.1, pension_category="Pension"
+    )
+    flows = tax_cash_flows(profile, ["ISA", "Pension"], 0.02, 24, steps_per_year=12)
+
+    np.testing.assert_allclose(flows.contributions, [0, 500])
+    tables = compile_tax_tables()
+    assert flows.income[0] * 12 == pytest.approx(54_000 - tables.employment(54_000))
+    assert len(flows.income) == 24
@@ -0,0 +1,136 @@
+"""Tests for the column-wise validation rules."""
+
+import random
+
+import pytest
+
+from account import Account, HoldingsType
+from validation import (
+    validate_account_data,
+    validate_age_inputs,
+    validate_financial_inputs,
+    validate_households,
+)
+
+
+def _first_age_error(age_inputs: dict) -> str | None:
+    """The one-error-at-a-time age checks the rules replaced."""
+    people = [("", "Current age", "Retirement age", "Life expectancy")]
+    if age_inputs.get("has_partner", False):
+        people.append(
+            (
+                "partner_",
+                "Partner's current age",
+                "Partner's retirement age",
+                "Partner's life expectancy",
+            )
+        )
+    for prefix, current, retirement, life in people:
+        current_age = age_inputs.get(f"{prefix}current_age", 0)
+        retirement_age = age_inputs.get(f"{prefix}retirement_age", 0)
+        life_expectancy = age_inputs.get(f"{prefix}life_expectancy", 0)
+        if current_age <= 0:
+            return f"{current} must be positive"
+        if retirement_age <= current_age:
+            return f"{retirement} must be greater than current age"
+        if life_expectancy <= retirement_age:
+            return f"{life} must be greater than retirement age"
+        if current_age > 100:
+            return f"{current} seems unrealistic (>100)"
+        if life_expectancy > 120:
+            return f"{life} seems unrealistic (>120)"
+    return None
+
+
+def _random_household(rng: random.Random) -> dict:
+    def age() -> int:
+        return rng.randint(-5, 130)
+
+    def amount() -> float:
+        return rng.uniform(-10_000, 200_000)
+
+    return {
+        "current_age": age(),
+        "retirement_age": age(),
+        "life_expectancy": age(),
+        "partner_current_age": age(),
+        "partner_retirement_age": age(),
+        "partner_life_expectancy": age(),
+        "has_partner": rng.random() < 0.5,
+        "user_annual_income": amount(),
+        "user_annual_expenses": amount(),
+        "partner_annual_income": amount(),
+        "partner_annual_expenses": amount(),
+        "inflation_rate": rng.uniform(-0.2, 0.3),
+    }
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_first_age_issue_matches_sequential_checks(seed):
+    household = _random_household(random.Random(seed))
+    assert validate_age_inputs(household) == _first_age_error(household)
+
+
+def test_reports_every_issue_for_every_row():
+    valid = {
+        "current_age": 40,
+        "retirement_age": 65,
+        "life_expectancy": 90,
+        "user_annual_income": 50_000,
+        "user_annual_expenses": 30_000,
+        "inflation_rate": 0.02,
+    }
+    invalid = {**valid, "current_age": 70, "user_annual_income": -1, "inflation_rate": 0.5}
+
+    issues = validate_households([valid, invalid, valid])
+
+    assert [(issue.row, issue.field) for issue in issues] == [
+        (1, "retirement_age"),
+        (1, "user_annual_income"),
+        (1, "inflation_rate"),
+        (1, "user_annual_expenses"),
+    ]
+
+
+def test_financial_inputs():
+    assert (
+        validate_financial_inputs({"user_annual_income": 50_000, "user_annual_expenses": 20_000})
+        is None
+    )
+    assert (
+        validate_financial_inputs({"user_annual_expenses": -1})
+        == "Annual expenses cannot be negative"
+    )
+    assert (
+        validate_financial_inputs({"user_annual_income": 10_000, "user_annual_expenses": 30_000})
+        == "Annual expenses seem very high compared to income"
+    )
+
+
+def _account(name: str, value: float, growth: float) -> Account:
+    account = Account(name, HoldingsType.CASH, growth)
+    account.set_value(value)
+    return account
+
+
+def test_account_issues_are_reported_against_their_household():
+    accounts = [
+        [_account("ISA", 1_000, 0.05)],
+        [_account("Savings", -1, 0.05), _account(" ", 10, 2.0)],
+    ]
+    households = [{"current_age": 40, "retirement_age": 65, "life_expectancy": 90}] * 2
+
+    issues = validate_households(households, accounts)
+
+    assert [(issue.row, issue.field, issue.message) for issue in issues] == [
+        (1, "accounts[0].value", "Account 'Savings' value cannot be negative"),
+        (1, "accounts[1].name", "Account 2 must have a name"),
+        (1, "accounts[1].growth", "Account ' ' growth rate should be between -50% and 100%"),
+    ]
+
+
+def test_first_account_issue():
+    assert validate_account_data([]) is None
+    assert validate_account_data([_account("ISA", float("nan"), 0.05)]) == (
+        "Account 'ISA' value cannot be negative"
+    )
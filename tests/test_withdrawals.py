@@ -0,0 +1,25 @@
+"""Tests for withdrawal strategies and their comparison."""
+
+import pytest
+
+from withdrawal_comparison import compare_withdrawals
+from withdrawals import STRATEGIES, FixedReal, PercentOfPortfolio
+
+BREAKDOWN = {"ISA": {"value": 1_000_000.0, "growth": 0.04, "is_liquid": True}}
+
+
+def test_labels():
+    assert FixedReal().label == "Fixed real"
+    assert PercentOfPortfolio(0.035).label == "4% of portfolio"
+    assert all(name == strategy.label for name, strategy in STRATEGIES.items())
+
+
+@pytest.mark.parametrize("historical", [False, True])
+def test_compares_every_strategy(historical):
+    outcomes = compare_withdrawals(
+        STRATEGIES.values(), BREAKDOWN, 0, 25_000, 0.02, 30, 60, 60, historical, n_paths=200
+    )
+    assert [outcome.label for outcome in outcomes] == list(STRATEGIES)
+    fixed = outcomes[0]
+    assert fixed.median_spending == pytest.approx(1.0)
+    assert all(0 <= outcome.success_rate <= 1 for outcome in outcomes)
@@ -1,111 +1,294 @@
+import itertools
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 import streamlit as st
 
+from instrumentation import timed
 
-def validate_age_inputs(age_inputs: dict[str, Any]) -> str | None:
-    """Validate age-related inputs and return error message if invalid."""
-    current_age = age_inputs.get("current_age", 0)
-    retirement_age = age_inputs.get("retirement_age", 0)
-    life_expectancy = age_inputs.get("life_expectancy", 0)
-
-    if current_age <= 0:
-        return "Current age must be positive"
-    if retirement_age <= current_age:
-        return "Retirement age must be greater than current age"
-    if life_expectancy <= retirement_age:
-        return "Life expectancy must be greater than retirement age"
-    if current_age > 100:
-        return "Current age seems unrealistic (>100)"
-    if life_expectancy > 120:
-        return "Life expectancy seems unrealistic (>120)"
-
-    # Partner validation if exists
-    if age_inputs.get("has_partner", False):
-        partner_current_age = age_inputs.get("partner_current_age", 0)
-        partner_retirement_age = age_inputs.get("partner_retirement_age", 0)
-        partner_life_expectancy = age_inputs.get("partner_life_expectancy", 0)
-
-        if partner_current_age <= 0:
-            return "Partner's current age must be positive"
-        if partner_retirement_age <= partner_current_age:
-            return "Partner's retirement age must be greater than current age"
-        if partner_life_expectancy <= partner_retirement_age:
-            return "Partner's life expectancy must be greater than retirement age"
-        if partner_current_age > 100:
-            return "Partner's current age seems unrealistic (>100)"
-        if partner_life_expectancy > 120:
-            return "Partner's life expectancy seems unrealistic (>120)"
-
-    return None
+Columns = Mapping[str, np.ndarray]
 
+AGE_FIELDS = (
+    "current_age",
+    "retirement_age",
+    "life_expectancy",
+    "partner_current_age",
+    "partner_retirement_age",
+    "partner_life_expectancy",
+)
+FINANCIAL_FIELDS = (
+    "user_annual_income",
+    "user_annual_expenses",
+    "partner_annual_income",
+    "partner_annual_expenses",
+    "inflation_rate",
+)
 
-def validate_financial_inputs(user_inputs: dict[str, Any]) -> str | None:
-    """Validate financial inputs and return error message if invalid."""
-    user_income = user_inputs.get("user_annual_income", 0)
-    user_expenses = user_inputs.get("user_annual_expenses", 0)
-    partner_income = user_inputs.get("partner_annual_income", 0)
-    partner_expenses = user_inputs.get("partner_annual_expenses", 0)
-    inflation_rate = user_inputs.get("inflation_rate", 0)
 
-    if user_income < 0:
-        return "Annual income cannot be negative"
-    if user_expenses < 0:
-        return "Annual expenses cannot be negative"
-    if partner_income < 0:
-        return "Partner's annual income cannot be negative"
-    if partner_expenses < 0:
-        return "Partner's annual expenses cannot be negative"
-    if inflation_rate < -0.1 or inflation_rate > 0.2:
-        return "Inflation rate should be between -10% and 20%"
+@dataclass(frozen=True)
+class Rule:
+    """A check over whole columns, true for every row that breaks it.
+
+    ``field`` and ``message`` may name columns in braces, filled in from the
+    offending row, e.g. ``"Account '{account_name}' value cannot be negative"``.
+    """
+    field: str
+    message: str
+    invalid: Callable[[Columns], np.ndarray]
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """One rule broken by one row."""
+    row: int
+    field: str
+    message: str
+
+
+def _partner(check: Callable[[Columns], np.ndarray]) -> Callable[[Columns], np.ndarray]:
+    """Apply a check only to rows with a partner."""
+    return lambda columns: columns["has_partner"] & check(columns)
+
+
+# Rules run in this order, so the first issue for a row matches what the
+# one-error-at-a-time checks have always reported
+AGE_RULES = (
+    Rule("current_age", "Current age must be positive", lambda c: c["current_age"] <= 0),
+    Rule(
+        "retirement_age",
+        "Retirement age must be greater than current age",
+        lambda c: c["retirement_age"] <= c["current_age"],
+    ),
+    Rule(
+        "life_expectancy",
+        "Life expectancy must be greater than retirement age",
+        lambda c: c["life_expectancy"] <= c["retirement_age"],
+    ),
+    Rule("current_age", "Current age seems unrealistic (>100)", lambda c: c["current_age"] > 100),
+    Rule("life_expectancy", "Life expectancy seems unrealistic (>120)", lambda c: c["life_expectancy"] > 120),
+    Rule(
+        "partner_current_age",
+        "Partner's current age must be positive",
+        _partner(lambda c: c["partner_current_age"] <= 0),
+    ),
+    Rule(
+        "partner_retirement_age",
+        "Partner's retirement age must be greater than current age",
+        _partner(lambda c: c["partner_retirement_age"] <= c["partner_current_age"]),
+    ),
+    Rule(
+        "partner_life_expectancy",
+        "Partner's life expectancy must be greater than retirement age",
+        _partner(lambda c: c["partner_life_expectancy"] <= c["partner_retirement_age"]),
+    ),
+    Rule(
+        "partner_current_age",
+        "Partner's current age seems unrealistic (>100)",
+        _partner(lambda c: c["partner_current_age"] > 100),
+    ),
+    Rule(
+        "partner_life_expectancy",
+        "Partner's life expectancy seems unrealistic (>120)",
+        _partner(lambda c: c["partner_life_expectancy"] > 120),
+    ),
+)
+
+FINANCIAL_RULES = (
+    Rule("user_annual_income", "Annual income cannot be negative", lambda c: c["user_annual_income"] < 0),
+    Rule("user_annual_expenses", "Annual expenses cannot be negative", lambda c: c["user_annual_expenses"] < 0),
+    Rule(
+        "partner_annual_income",
+        "Partner's annual income cannot be negative",
+        lambda c: c["partner_annual_income"] < 0,
+    ),
+    Rule(
+        "partner_annual_expenses",
+        "Partner's annual expenses cannot be negative",
+        lambda c: c["partner_annual_expenses"] < 0,
+    ),
+    Rule(
+        "inflation_rate",
+        "Inflation rate should be between -10% and 20%",
+        lambda c: (c["inflation_rate"] < -0.1) | (c["inflation_rate"] > 0.2),
+    ),
+    Rule(
+        "user_annual_expenses",
+        "Annual expenses seem very high compared to income",
+        lambda c: c["user_annual_expenses"] + c["partner_annual_expenses"]
+        > (c["user_annual_income"] + c["partner_annual_income"]) * 2,
+    ),
+)
+
+# Written so a missing (NaN) value or growth rate fails, as a missing attribute always has
+ACCOUNT_RULES = (
+    Rule(
+        "accounts[{account_index}].name",
+        "Account {account_number} must have a name",
+        lambda c: np.char.str_len(np.char.strip(c["account_name"])) == 0,
+    ),
+    Rule(
+        "accounts[{account_index}].value",
+        "Account '{account_name}' value cannot be negative",
+        lambda c: ~(c["account_value"] >= 0),
+    ),
+    Rule(
+        "accounts[{account_index}].growth",
+        "Account '{account_name}' growth rate should be between -50% and 100%",
+        lambda c: ~((c["account_growth"] >= -0.5) & (c["account_growth"] <= 1.0)),
+    ),
+)
+
+
+def household_columns(records: Sequence[Mapping[str, Any]]) -> dict[str, np.ndarray]:
+    """Columns for ``AGE_RULES`` and ``FINANCIAL_RULES`` from session-state style dicts.
+
+    Missing fields count as zero and ``has_partner`` as false, as in the
+    session state checks.
+    """
+    n_rows = len(records)
+    columns = {
+        field: np.fromiter((record.get(field, 0) for record in records), float, count=n_rows)
+        for field in (*AGE_FIELDS, *FINANCIAL_FIELDS)
+    }
+    columns["has_partner"] = np.fromiter(
+        (bool(record.get("has_partner", False)) for record in records), bool, count=n_rows
+    )
+    return columns
+
+
+def _growth_rate(account: Any) -> float:
+    return getattr(account, "growth_rate", getattr(account, "growth", np.nan))
+
+
+def account_columns(accounts_by_row: Sequence[Sequence[Any]]) -> dict[str, np.ndarray]:
+    """Columns for ``ACCOUNT_RULES``, one row per account, from lists of ``Account`` objects.
+
+    Breakdown ``Category`` objects are accepted too, their ``growth`` read as
+    the growth rate. ``row`` holds the index of the list each account came
+    from, so issues are reported against that row.
+    """
+    counts = np.fromiter(map(len, accounts_by_row), int, count=len(accounts_by_row))
+    flat = list(itertools.chain.from_iterable(accounts_by_row))
+    rows = np.repeat(np.arange(len(counts)), counts)
+    index = np.arange(len(flat)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return {
+        "row": rows,
+        "account_index": index,
+        "account_number": index + 1,
+        "account_name": np.array([str(getattr(account, "name", "")) for account in flat], dtype=str),
+        "account_value": np.fromiter(
+            (getattr(account, "value", np.nan) for account in flat), float, count=len(flat)
+        ),
+        "account_growth": np.fromiter(
+            (_growth_rate(account) for account in flat), float, count=len(flat)
+        ),
+    }
+
 
-    total_income = user_income + partner_income
-    total_expenses = user_expenses + partner_expenses
+class _RowView(Mapping[str, Any]):
+    """One row of a set of columns, for filling in rule templates."""
 
-    if total_expenses > total_income * 2:
-        return "Annual expenses seem very high compared to income"
+    def __init__(self, columns: Columns, row: int) -> None:
+        self.columns = columns
+        self.row = row
 
-    return None
+    def __getitem__(self, key: str) -> Any:
+        return self.columns[key][self.row].item()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+
+def validate_columns(columns: Columns, rules: Sequence[Rule]) -> list[ValidationIssue]:
+    """Every rule broken by every row, ordered by row and then by rule.
+
+    Each rule runs once over the whole columns. When there is a ``row``
+    column, issues are reported against its values instead of positions.
+    """
+    if not rules:
+        return []
+    n_rows = len(next(iter(columns.values()))) if columns else 0
+    violations = np.empty((n_rows, len(rules)), dtype=bool)
+    for i, rule in enumerate(rules):
+        violations[:, i] = rule.invalid(columns)
+
+    row_labels = columns.get("row")
+    issues = []
+    for row, rule_index in zip(*np.nonzero(violations), strict=True):
+        rule = rules[rule_index]
+        values = _RowView(columns, row)
+        issues.append(
+            ValidationIssue(
+                row=int(row_labels[row]) if row_labels is not None else int(row),
+                field=rule.field.format_map(values),
+                message=rule.message.format_map(values),
+            )
+        )
+    return issues
+
+
+def validate_households(
+    records: Sequence[Mapping[str, Any]],
+    accounts: Sequence[Sequence[Any]] | None = None,
+) -> list[ValidationIssue]:
+    """Every age, financial and account issue across many households.
+
+    ``records`` are session-state style dicts holding both the age and the
+    financial fields; ``accounts`` optionally gives each household's list of
+    ``Account`` or ``Category`` objects. Issues are grouped by row, age issues first.
+    """
+    issues = validate_columns(household_columns(records), (*AGE_RULES, *FINANCIAL_RULES))
+    if accounts is not None:
+        issues += validate_columns(account_columns(accounts), ACCOUNT_RULES)
+        issues.sort(key=lambda issue: issue.row)
+    return issues
+
+
+def _first_message(columns: Columns, rules: Sequence[Rule]) -> str | None:
+    issues = validate_columns(columns, rules)
+    return issues[0].message if issues else None
+
+
+def validate_age_inputs(age_inputs: dict[str, Any]) -> str | None:
+    """Validate age-related inputs and return error message if invalid."""
+    return _first_message(household_columns([age_inputs]), AGE_RULES)
+
+
+def validate_financial_inputs(user_inputs: dict[str, Any]) -> str | None:
+    """Validate financial inputs and return error message if invalid."""
+    return _first_message(household_columns([user_inputs]), FINANCIAL_RULES)
 
 
 def validate_account_data(accounts: list) -> str | None:
     """Validate account data and return error message if invalid."""
     if not accounts:
         return None
-
-    for i, account in enumerate(accounts):
-        if not hasattr(account, 'name') or not account.name.strip():
-            return f"Account {i+1} must have a name"
-        if not hasattr(account, 'value') or account.value < 0:
-            return f"Account '{account.name}' value cannot be negative"
-        if not hasattr(account, 'growth_rate') or account.growth_rate < -0.5 or account.growth_rate > 1.0:
-            return f"Account '{account.name}' growth rate should be between -50% and 100%"
-
-    return None
+    return _first_message(account_columns([accounts]), ACCOUNT_RULES)
 
 
+@timed()
 def display_validation_errors() -> bool:
-    """Check all validations and display errors. Returns True if all valid."""
-    errors = []
-
-    # Validate age inputs
-    age_error = validate_age_inputs(st.session_state.age_inputs)
-    if age_error:
-        errors.append(f"Age Error: {age_error}")
-
-    # Validate financial inputs
-    financial_error = validate_financial_inputs(st.session_state.user_inputs)
-    if financial_error:
-        errors.append(f"Financial Error: {financial_error}")
-
-    # Validate account data
-    user_account_error = validate_account_data(st.session_state.get("user_accounts", []))
-    if user_account_error:
-        errors.append(f"User Account Error: {user_account_error}")
-
-    partner_account_error = validate_account_data(st.session_state.get("partner_accounts", []))
-    if partner_account_error:
-        errors.append(f"Partner Account Error: {partner_account_error}")
+    """Check all validations and display every error. Returns True if all valid."""
+    checks = [
+        ("Age Error", household_columns([st.session_state.age_inputs]), AGE_RULES),
+        ("Financial Error", household_columns([st.session_state.user_inputs]), FINANCIAL_RULES),
+        ("User Account Error", account_columns([st.session_state.get("user_accounts", [])]), ACCOUNT_RULES),
+        (
+            "Partner Account Error",
+            account_columns([st.session_state.get("partner_accounts", [])]),
+            ACCOUNT_RULES,
+        ),
+    ]
+    errors = [
+        f"{label}: {issue.message}"
+        for label, columns, rules in checks
+        for issue in validate_columns(columns, rules)
+    ]
 
     # Display errors
     if errors:
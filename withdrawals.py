@@ -0,0 +1,201 @@
+"""Retirement withdrawal strategies as vectorized policies over many paths.
+
+A strategy describes how much to spend each year of retirement. The engine
+asks a ``WithdrawalPolicy`` built from it for one step's spending on every
+path at once, given each path's portfolio after growth and its planned,
+inflation-adjusted expenses, so Monte Carlo paths and backtest windows are
+all handled by the same array operations.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+class WithdrawalStrategy:
+    """Base class for strategies; the default spends the planned expenses."""
+
+    @property
+    def label(self) -> str:
+        """Name shown in the strategy picker and comparison table."""
+        return "Fixed real"
+
+    def initial_state(self, n_paths: int) -> dict[str, np.ndarray]:
+        """Per-path arrays the strategy keeps between steps."""
+        return {}
+
+    def spend(
+        self,
+        state: dict[str, np.ndarray],
+        step: int,
+        steps_per_year: int,
+        portfolio: np.ndarray,
+        expenses: np.ndarray,
+        retired: np.ndarray,
+    ) -> np.ndarray:
+        """Spending for one step on every path; only retired paths' values are used."""
+        return expenses
+
+    def first_year_spending(self, portfolio: float, expenses: float) -> float:
+        """Annual spending in the first year of retirement."""
+        return expenses
+
+
+@dataclass(frozen=True)
+class FixedReal(WithdrawalStrategy):
+    """Spend the planned expenses, rising with inflation, whatever markets do."""
+
+
+@dataclass(frozen=True)
+class PercentOfPortfolio(WithdrawalStrategy):
+    """Spend a fixed share of the portfolio every year."""
+    rate: float = 0.04
+
+    @property
+    def label(self) -> str:
+        return f"{self.rate:.0%} of portfolio"
+
+    def spend(
+        self,
+        state: dict[str, np.ndarray],
+        step: int,
+        steps_per_year: int,
+        portfolio: np.ndarray,
+        expenses: np.ndarray,
+        retired: np.ndarray,
+    ) -> np.ndarray:
+        return self.rate * np.maximum(portfolio, 0.0) / steps_per_year
+
+    def first_year_spending(self, portfolio: float, expenses: float) -> float:
+        return self.rate * max(portfolio, 0.0)
+
+
+@dataclass(frozen=True)
+class GuytonKlinger(WithdrawalStrategy):
+    """Start at the planned expenses and adjust them at guardrails.
+
+    Spending rises with inflation. At the start of each year after the
+    first, if spending has grown to more than ``1 + guardrail`` times the
+    initial withdrawal rate it is cut by ``adjustment``; if it has fallen
+    below ``1 - guardrail`` times that rate it is raised by ``adjustment``.
+    The original rule that skips inflation rises after a losing year is not
+    modelled.
+    """
+    guardrail: float = 0.2
+    adjustment: float = 0.1
+    label = "Guyton-Klinger guardrails"
+
+    def initial_state(self, n_paths: int) -> dict[str, np.ndarray]:
+        return {"scale": np.ones(n_paths), "initial_rate": np.full(n_paths, np.nan)}
+
+    def spend(
+        self,
+        state: dict[str, np.ndarray],
+        step: int,
+        steps_per_year: int,
+        portfolio: np.ndarray,
+        expenses: np.ndarray,
+        retired: np.ndarray,
+    ) -> np.ndarray:
+        scale, initial_rate = state["scale"], state["initial_rate"]
+        rate = np.divide(
+            scale * expenses * steps_per_year,
+            portfolio,
+            out=np.full(len(portfolio), np.inf),
+            where=portfolio > 0,
+        )
+        if step % steps_per_year == 0:
+            reviewed = retired & ~np.isnan(initial_rate)
+            scale[reviewed & (rate > initial_rate * (1 + self.guardrail))] *= 1 - self.adjustment
+            scale[reviewed & (rate < initial_rate * (1 - self.guardrail))] *= 1 + self.adjustment
+        # A path's initial rate is the one it retires on
+        starting = retired & np.isnan(initial_rate)
+        initial_rate[starting] = rate[starting]
+        return scale * expenses
+
+
+@dataclass(frozen=True)
+class FloorAndCeiling(WithdrawalStrategy):
+    """Spend a share of the portfolio, kept between a floor and a ceiling.
+
+    The floor and ceiling are fractions of the planned, inflation-adjusted
+    expenses.
+    """
+    rate: float = 0.04
+    floor: float = 0.9
+    ceiling: float = 1.2
+    label = "Floor and ceiling"
+
+    def spend(
+        self,
+        state: dict[str, np.ndarray],
+        step: int,
+        steps_per_year: int,
+        portfolio: np.ndarray,
+        expenses: np.ndarray,
+        retired: np.ndarray,
+    ) -> np.ndarray:
+        share = self.rate * np.maximum(portfolio, 0.0) / steps_per_year
+        return np.clip(share, self.floor * expenses, self.ceiling * expenses)
+
+    def first_year_spending(self, portfolio: float, expenses: float) -> float:
+        share = self.rate * max(portfolio, 0.0)
+        return float(np.clip(share, self.floor * expenses, self.ceiling * expenses))
+
+
+STRATEGIES: dict[str, WithdrawalStrategy] = {
+    strategy.label: strategy
+    for strategy in (FixedReal(), PercentOfPortfolio(), GuytonKlinger(), FloorAndCeiling())
+}
+
+
+class WithdrawalPolicy:
+    """One run of a strategy across ``n_paths`` paths.
+
+    Called by ``iter_projection`` with each step's portfolios and planned
+    expenses, it returns the spending for every path and logs what retired
+    paths could actually spend, as a fraction of their planned expenses.
+    """
+
+    def __init__(self, strategy: WithdrawalStrategy, n_paths: int, steps_per_year: int = 1) -> None:
+        self.strategy = strategy
+        self.n_paths = n_paths
+        self.steps_per_year = steps_per_year
+        self.state = strategy.initial_state(n_paths)
+        self._spending: list[np.ndarray] = []
+
+    def __call__(
+        self, step: int, portfolio: np.ndarray, expenses: np.ndarray, retired: np.ndarray
+    ) -> np.ndarray:
+        spending = np.broadcast_to(
+            self.strategy.spend(
+                self.state, step, self.steps_per_year, portfolio, expenses, retired
+            ),
+            portfolio.shape,
+        )
+        spent = np.divide(
+            np.minimum(spending, np.maximum(portfolio, 0.0)),
+            expenses,
+            out=np.ones(len(portfolio)),
+            where=expenses > 0,
+        )
+        self._spending.append(np.where(retired, spent, np.nan))
+        return spending
+
+    def spending_ratios(self) -> np.ndarray:
+        """``(paths, steps)`` share of planned expenses spent, NaN while a path still works.
+
+        Only steps in which some path had retired are logged.
+        """
+        if not self._spending:
+            return np.empty((self.n_paths, 0))
+        return np.stack(self._spending, axis=1)
+
+
+def build_policy(
+    strategy: WithdrawalStrategy | None, n_paths: int, steps_per_year: int = 1
+) -> WithdrawalPolicy | None:
+    """Policy for ``iter_projection``, or None to spend the planned expenses unchanged."""
+    if strategy is None:
+        return None
+    return WithdrawalPolicy(strategy, n_paths, steps_per_year)